@@ -0,0 +1,36 @@
+"""
+Shared fixtures for the test suite.
+"""
+import pytest
+from edx_django_utils.cache import TieredCache
+from learninghub.apps.api_client.base_oauth import clear_oauth_clients
+from learninghub.apps.api_client.circuit_breaker import reset_circuit_breakers
+from learninghub.apps.api_client.metrics import reset_histograms
+from learninghub.apps.core.utils import clear_course_key_cache
+
+
+@pytest.fixture(autouse=True)
+def shared_oauth_clients():
+    """
+    Make sure each test builds its own API client session, so that a mocked
+    `OAuthAPIClient` does not leak from one test to another.
+    """
+    clear_oauth_clients()
+    reset_circuit_breakers()
+    reset_histograms()
+    yield
+    clear_oauth_clients()
+    reset_circuit_breakers()
+    reset_histograms()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """
+    Make sure cached data does not leak from one test to another.
+    """
+    TieredCache.dangerous_clear_all_tiers()
+    clear_course_key_cache()
+    yield
+    TieredCache.dangerous_clear_all_tiers()
+    clear_course_key_cache()
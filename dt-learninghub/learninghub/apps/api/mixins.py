@@ -0,0 +1,69 @@
+"""
+Mixins shared by the API viewsets.
+"""
+from typing import Optional
+
+from edx_django_utils.cache import RequestCache
+from learninghub.apps.classrooms.models import Classroom
+from rest_framework.response import Response
+
+CLASSROOM_REQUEST_CACHE_NAMESPACE = "learninghub.api.classroom"
+
+
+class ClassroomContextMixin:
+    """
+    Resolve the classroom specified by `classroom_uuid` in the request.
+
+    The classroom is loaded at most once per request and stored in the request cache,
+    so permission checks, querysets and actions can all read it without querying the
+    database again.
+    """
+
+    @property
+    def requested_classroom_uuid(self) -> Optional[str]:
+        return self.kwargs.get("classroom_uuid")
+
+    @property
+    def requested_classroom(self) -> Optional[Classroom]:
+        """
+        Return the classroom specified in the request or None if it does not exist.
+        """
+        classroom_uuid = self.requested_classroom_uuid
+
+        if not classroom_uuid:
+            return None
+
+        request_cache = RequestCache(CLASSROOM_REQUEST_CACHE_NAMESPACE)
+        cached_response = request_cache.get_cached_response(str(classroom_uuid))
+        if cached_response.is_found:
+            return cached_response.value
+
+        classroom = Classroom.objects.filter(uuid=classroom_uuid).first()
+        request_cache.set(str(classroom_uuid), classroom)
+
+        return classroom
+
+
+class ValuesListMixin:
+    """
+    List objects from `values()` rows instead of model instances.
+
+    The serializer class declares `values_fields`, the fields read from the database,
+    and `represent_values`, which builds the representation of a row. Listing does
+    not instantiate models or serializers, nor query related objects.
+    """
+
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.get_serializer_class()
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            *serializer_class.values_fields
+        )
+
+        page = self.paginate_queryset(queryset)
+        rows = queryset if page is None else page
+        data = [serializer_class.represent_values(row) for row in rows]
+
+        if page is None:
+            return Response(data)
+
+        return self.get_paginated_response(data)
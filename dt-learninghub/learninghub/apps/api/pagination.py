@@ -0,0 +1,25 @@
+"""
+Pagination classes for REST API endpoints
+"""
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedCursorPagination(CursorPagination):
+    """
+    Paginate with a cursor on the creation date, ties are broken by primary key.
+
+    Unlike page numbers, a cursor does not count the rows nor skip the previous
+    pages, so every page costs the same whatever its depth.
+    """
+
+    ordering = ("created", "pk")
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+
+class NewestFirstCursorPagination(CreatedCursorPagination):
+    """
+    Paginate from the most recently created object.
+    """
+
+    ordering = ("-created", "-pk")
@@ -1,12 +1,16 @@
 """
 Serializers for REST API endpoints
 """
+from typing import Any, Dict
 
 from learninghub.apps.classrooms.models import (
     Classroom,
     ClassroomEnrollment,
     CourseAssignment,
+    CourseAssignmentJob,
 )
+from learninghub.apps.core.utils import parse_course_key
+from opaque_keys import InvalidKeyError
 from rest_framework import serializers
 
 
@@ -15,8 +19,16 @@ class ClassroomSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Classroom
-        fields = ["uuid", "name", "active", "school"]
-        read_only_fields = ["uuid"]
+        fields = [
+            "uuid",
+            "name",
+            "active",
+            "school",
+            "learner_count",
+            "staff_count",
+            "assignment_count",
+        ]
+        read_only_fields = ["uuid", "learner_count", "staff_count", "assignment_count"]
 
 
 class ClassroomEnrollmentSerializer(serializers.ModelSerializer):
@@ -27,20 +39,31 @@ class ClassroomEnrollmentSerializer(serializers.ModelSerializer):
         fields = ["pk", "classroom_instance", "user_email", "staff"]
         lookup_field = "user_email"
 
+    # Fields read by `represent_values` and the pagination cursor
+    values_fields = ["pk", "created", "classroom_instance_id", "user_email"]
+
     def to_representation(self, instance):
         """
         Return a formatted representation of the
         classroom enrollment
         """
+        return self.represent_values(
+            {
+                "pk": instance.pk,
+                "classroom_instance_id": instance.classroom_instance_id,
+                "user_email": instance.user_email,
+            }
+        )
 
-        ret = {
-            "pk": instance.pk,
-            "classroom_uuid": str(instance.classroom_instance.uuid),
-            "user_id": instance.user_email,
+    @staticmethod
+    def represent_values(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the representation of a classroom enrollment `values()` row"""
+        return {
+            "pk": row["pk"],
+            "classroom_uuid": str(row["classroom_instance_id"]),
+            "user_id": row["user_email"],
         }
 
-        return ret
-
 
 class CourseAssignmentSerializer(serializers.ModelSerializer):
     """Serialises the CourseAssignment object"""
@@ -48,3 +71,47 @@ class CourseAssignmentSerializer(serializers.ModelSerializer):
     class Meta:
         model = CourseAssignment
         fields = ["course_id", "classroom_instance"]
+
+    # Fields read by `represent_values` and the pagination cursor
+    values_fields = ["pk", "created", "course_id", "classroom_instance"]
+
+    @staticmethod
+    def represent_values(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the representation of a course assignment `values()` row"""
+        return {
+            "course_id": row["course_id"],
+            "classroom_instance": row["classroom_instance"],
+        }
+
+
+class CourseAssignmentJobSerializer(serializers.ModelSerializer):
+    """Serializes the CourseAssignmentJob object"""
+
+    course_run_id = serializers.CharField(
+        source="course_assignment.course_id", read_only=True, default=None
+    )
+
+    class Meta:
+        model = CourseAssignmentJob
+        fields = [
+            "uuid",
+            "classroom_instance",
+            "course_id",
+            "status",
+            "course_run_id",
+            "error",
+            "created",
+            "modified",
+        ]
+        read_only_fields = ["uuid", "status", "error", "created", "modified"]
+
+    def validate_course_id(self, value: str) -> str:
+        """Reject the course keys that cannot be parsed before the job is queued"""
+        try:
+            parse_course_key(value)
+        except InvalidKeyError as exc:
+            raise serializers.ValidationError(
+                f"{value} is not a valid course key."
+            ) from exc
+
+        return value
@@ -0,0 +1,106 @@
+"""
+Check that the queries of the main API endpoints use indexes
+"""
+import re
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from learninghub.apps.api.v1.tests.test_views import init_jwt_cookie
+from learninghub.apps.classrooms import constants
+from learninghub.apps.classrooms.models import CourseAssignment
+from rest_framework import status
+from rest_framework.test import APITestCase
+from test_utils.factories import (
+    USER_PASSWORD,
+    ClassroomEnrollmentFactory,
+    ClassroomFactory,
+    UserFactory,
+)
+
+# A step of a SQLite query plan reading a whole table, tables may be aliased
+FULL_SCAN_PATTERN = re.compile(r"\bSCAN (TABLE )?(?!CONSTANT ROW)\w+$", re.MULTILINE)
+
+
+class QueryPlanTests(APITestCase):
+    """
+    Run EXPLAIN on the queries of the main endpoints and fail on full table scans.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.teacher = UserFactory()
+        self.classroom = ClassroomFactory.create()
+
+        ClassroomEnrollmentFactory.create(
+            classroom_instance=self.classroom,
+            user_email=self.teacher.email,
+            lms_user_id=self.teacher.id,
+            staff=True,
+        )
+        CourseAssignment.objects.bulk_create(
+            [
+                CourseAssignment(
+                    classroom_instance=self.classroom,
+                    course_id="course-v1:DiceyTech+BOX001+1T2021",
+                )
+            ]
+        )
+
+        self.client.login(username=self.teacher, password=USER_PASSWORD)
+        init_jwt_cookie(
+            self.client,
+            self.teacher,
+            [(constants.SYSTEM_ENTERPRISE_ADMIN_ROLE, str(self.classroom.school))],
+        )
+
+    def _assert_no_full_scan(self, url):
+        """Request the url and check the plan of every classrooms query"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        classroom_queries = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith("SELECT") and "classrooms_" in query["sql"]
+        ]
+        self.assertTrue(classroom_queries)
+
+        with connection.cursor() as cursor:
+            for sql in classroom_queries:
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                plan = "\n".join(row[-1] for row in cursor.fetchall())
+
+                self.assertIsNone(
+                    FULL_SCAN_PATTERN.search(plan), f"Full scan in {sql}:\n{plan}"
+                )
+
+    def test_classroom_list(self):
+        self._assert_no_full_scan(reverse("api:v1:classrooms-list"))
+
+    def test_classroom_detail(self):
+        self._assert_no_full_scan(
+            reverse(
+                "api:v1:classrooms-detail",
+                kwargs={"classroom_uuid": self.classroom.uuid},
+            )
+        )
+
+    def test_enrollment_list(self):
+        self._assert_no_full_scan(
+            reverse(
+                "api:v1:enrollments-list",
+                kwargs={"classroom_uuid": self.classroom.uuid},
+            )
+        )
+
+    def test_assignment_list(self):
+        self._assert_no_full_scan(
+            reverse(
+                "api:v1:assignments-list",
+                kwargs={"classroom_uuid": self.classroom.uuid},
+            )
+        )
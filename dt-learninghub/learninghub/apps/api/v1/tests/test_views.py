@@ -9,6 +9,9 @@ from unittest import mock
 from uuid import uuid4
 
 import ddt
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from edx_rest_framework_extensions.auth.jwt.cookies import jwt_cookie_name
 from edx_rest_framework_extensions.auth.jwt.tests.utils import (
@@ -16,6 +19,11 @@ from edx_rest_framework_extensions.auth.jwt.tests.utils import (
     generate_unversioned_payload,
 )
 from learninghub.apps.classrooms import constants
+from learninghub.apps.classrooms.models import (
+    Classroom,
+    ClassroomEnrollment,
+    CourseAssignmentJob,
+)
 from rest_framework import status
 from rest_framework.test import APITestCase
 from test_utils.factories import (
@@ -150,7 +158,33 @@ class ClassroomsViewSetTests(APITestCase):
         response = self.client.get(self.classroom_list_url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_classroom_list_query_count_is_constant(self):
+        """Test that listing classrooms does not issue a query per enrollment"""
+
+        init_jwt_cookie(
+            self.client,
+            self.teacher_1,
+            [(constants.SYSTEM_ENTERPRISE_ADMIN_ROLE, str(self.classroom_1.school))],
+        )
+
+        with CaptureQueriesContext(connection) as initial_queries:
+            response = self.client.get(self.classroom_list_url)
+        self.assertEqual(len(response.data["results"]), 2)
+
+        for _ in range(10):
+            ClassroomEnrollmentFactory.create(
+                classroom_instance=ClassroomFactory.create(school=FAKE_UUIDS[0]),
+                user_email=self.teacher_1.email,
+                lms_user_id=self.teacher_1.id,
+            )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.classroom_list_url)
+
+        self.assertEqual(len(response.data["results"]), 12)
+        self.assertEqual(len(queries), len(initial_queries))
 
     def test_access_classroom_detail(self):
         """Test that teachers can get details from their classrooms"""
@@ -166,6 +200,45 @@ class ClassroomsViewSetTests(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_classroom_detail_loads_classroom_once(self):
+        """Test that the requested classroom is only looked up once per request"""
+
+        init_jwt_cookie(
+            self.client,
+            self.teacher_1,
+            [(constants.SYSTEM_ENTERPRISE_ADMIN_ROLE, str(self.classroom_1.school))],
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.classroom_detail_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        classroom_queries = [
+            query
+            for query in queries.captured_queries
+            if 'FROM "classrooms_classroom" ' in query["sql"]
+        ]
+        # One query to resolve the classroom context, one to fetch the object
+        self.assertEqual(len(classroom_queries), 2)
+
+    def test_unknown_classroom_detail_403(self):
+        """Test that requesting a classroom that does not exist is denied"""
+
+        init_jwt_cookie(
+            self.client,
+            self.teacher_1,
+            [(constants.SYSTEM_ENTERPRISE_ADMIN_ROLE, str(self.classroom_1.school))],
+        )
+
+        url = reverse(
+            "api:v1:classrooms-detail",
+            kwargs={"classroom_uuid": uuid4()},
+        )
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
     @mock.patch("learninghub.apps.classrooms.models.get_lms_user_id")
     def test_create_classroom(self, mock_get_lms_user_id):
         """
@@ -198,6 +271,35 @@ class ClassroomsViewSetTests(APITestCase):
 
         self.assertIsNotNone(response.get("uuid"))
         self.assertIsNotNone(response.get("classroom_uuid"))
+        # The teacher is counted
+        self.assertEqual(response.get("staff_count"), 1)
+
+    def test_update_classroom_keeps_counters(self):
+        """Test PUT does not overwrite the counters updated during the request"""
+        init_jwt_cookie(
+            self.client,
+            self.teacher_1,
+            [(constants.SYSTEM_ENTERPRISE_ADMIN_ROLE, str(self.classroom_1.school))],
+        )
+        self.classroom_1.refresh_from_db()
+        learner_count = self.classroom_1.learner_count
+        original_save = Classroom.save
+
+        def save(classroom, *args, **kwargs):
+            # A learner is enrolled after the classroom was loaded by the request
+            Classroom.update_counters(classroom.pk, learners=1)
+            original_save(classroom, *args, **kwargs)
+
+        with mock.patch.object(Classroom, "save", save):
+            response = self.client.put(
+                self.classroom_detail_url,
+                {"name": "Renamed", "school": self.classroom_1.school, "active": True},
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["learner_count"], learner_count + 1)
+        self.classroom_1.refresh_from_db()
+        self.assertEqual(self.classroom_1.learner_count, learner_count + 1)
 
     @ddt.data(
         {
@@ -274,8 +376,8 @@ class ClassroomsViewSetTests(APITestCase):
         response = self.client.patch(self.classroom_detail_url)
         self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
 
-    @mock.patch("learninghub.apps.classrooms.models.get_lms_user_id")
-    def test_enroll_users_in_classroom(self, mock_get_lms_user_id):
+    @mock.patch("learninghub.apps.classrooms.enrollments.get_lms_user_ids")
+    def test_enroll_users_in_classroom(self, mock_get_lms_user_ids):
         """Test to enroll one or multiple users in a classroom"""
 
         # init a JWT cookie (so the user is authenticated) with admin role
@@ -287,18 +389,23 @@ class ClassroomsViewSetTests(APITestCase):
 
         student_1 = UserFactory()
         student_2 = UserFactory()
-        identifiers = student_1.email + "\n" + student_2.email
+        identifiers = student_1.email + "\n" + student_2.email + "," + student_1.email
 
         data = {"identifiers": identifiers}
 
-        mock_get_lms_user_id.side_effect = [student_1.id, student_2.id]
+        mock_get_lms_user_ids.return_value = {
+            student_1.email: student_1.id,
+            student_2.email: student_2.id,
+        }
         response = self.client.post(self.classroom_enroll_url, data)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-
-        # after = self.client.get(self.classroom_enrollments_list_url).data
-
-        # self.assertGreater(len(after), len(before))
-        # self.assertIsNotNone(response.data.get("enrolled"))
+        self.assertEqual(
+            [result["status"] for result in response.data["results"]],
+            ["enrolled", "enrolled", "duplicate"],
+        )
+        mock_get_lms_user_ids.assert_called_once_with(
+            [student_1.email, student_2.email]
+        )
 
     @mock.patch("learninghub.apps.api.v1.views.get_course_list")
     def test_get_course_list(self, mock_get_course_list):
@@ -317,6 +424,140 @@ class ClassroomsViewSetTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 0)
 
+    def test_classroom_roster_csv(self):
+        """Test that the classroom roster is streamed as CSV"""
+        init_jwt_cookie(
+            self.client,
+            self.teacher_1,
+            [(constants.SYSTEM_ENTERPRISE_ADMIN_ROLE, str(self.classroom_1.school))],
+        )
+
+        url = reverse(
+            "api:v1:classrooms-roster",
+            kwargs={"classroom_uuid": str(self.classroom_1.uuid)},
+        )
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            lines[0],
+            "classroom_uuid,classroom_name,user_email,lms_user_id,staff,created",
+        )
+        self.assertEqual(len(lines), 2)
+        self.assertIn(self.teacher_1.email, lines[1])
+
+    def test_school_roster_ndjson(self):
+        """Test that the roster of a school is streamed as NDJSON"""
+        init_jwt_cookie(
+            self.client,
+            self.teacher_1,
+            [(constants.SYSTEM_ENTERPRISE_ADMIN_ROLE, str(self.classroom_1.school))],
+        )
+
+        response = self.client.get(
+            reverse("api:v1:classrooms-school-roster"),
+            {"school": self.classroom_1.school, "file_format": "ndjson"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).decode().splitlines()
+        ]
+        # All the enrollments of the school, whoever the teacher is
+        self.assertEqual(
+            {row["user_email"] for row in rows},
+            {self.teacher_1.email, self.teacher_2.email},
+        )
+        self.assertEqual(len(rows), 3)
+
+    def test_school_roster_other_school_403(self):
+        """Test that teachers cannot download the roster of another school"""
+        init_jwt_cookie(
+            self.client,
+            self.teacher_1,
+            [(constants.SYSTEM_ENTERPRISE_ADMIN_ROLE, str(self.classroom_1.school))],
+        )
+
+        response = self.client.get(
+            reverse("api:v1:classrooms-school-roster"),
+            {"school": self.classroom_4.school},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @mock.patch("learninghub.apps.classrooms.enrollments.get_lms_user_ids")
+    def test_import_roster(self, mock_get_lms_user_ids):
+        """Test that the outcome of each row of the uploaded roster is streamed"""
+        mock_get_lms_user_ids.side_effect = lambda emails: {
+            email: None for email in emails
+        }
+        init_jwt_cookie(
+            self.client,
+            self.teacher_1,
+            [(constants.SYSTEM_ENTERPRISE_ADMIN_ROLE, str(self.classroom_1.school))],
+        )
+
+        url = reverse(
+            "api:v1:classrooms-import-roster",
+            kwargs={"classroom_uuid": str(self.classroom_1.uuid)},
+        )
+        roster = SimpleUploadedFile(
+            "roster.csv",
+            f"Email\nstudent1@school.sch\n{self.teacher_1.email}\nnot-an-email\n".encode(),
+        )
+        response = self.client.post(url, {"file": roster}, format="multipart")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        outcomes = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).decode().splitlines()
+        ]
+        self.assertEqual(
+            [(outcome["row"], outcome["status"]) for outcome in outcomes],
+            [(1, "enrolled"), (2, "already_enrolled"), (3, "invalid")],
+        )
+
+    def test_import_school_roster_missing_column(self):
+        """Test that a school roster without a classroom column is rejected"""
+        init_jwt_cookie(
+            self.client,
+            self.teacher_1,
+            [(constants.SYSTEM_ENTERPRISE_ADMIN_ROLE, str(self.classroom_1.school))],
+        )
+
+        roster = SimpleUploadedFile("roster.csv", b"email\nstudent1@school.sch\n")
+        response = self.client.post(
+            reverse("api:v1:classrooms-import-school-roster"),
+            {"file": roster, "school": str(self.classroom_1.school)},
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("classroom", str(response.data["file"]))
+
+    def test_roster_invalid_format(self):
+        """Test that an unknown roster format is rejected"""
+        init_jwt_cookie(
+            self.client,
+            self.teacher_1,
+            [(constants.SYSTEM_ENTERPRISE_ADMIN_ROLE, str(self.classroom_1.school))],
+        )
+
+        url = reverse(
+            "api:v1:classrooms-roster",
+            kwargs={"classroom_uuid": str(self.classroom_1.uuid)},
+        )
+        response = self.client.get(url, {"file_format": "xlsx"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
 
 @ddt.ddt
 class ClassroomEnrollmentViewSetTests(APITestCase):
@@ -375,7 +616,44 @@ class ClassroomEnrollmentViewSetTests(APITestCase):
         response = self.client.get(self.enrollments_list_url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data.get("count"), 2)
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_list_enrollments_query_count(self):
+        """
+        Test that every page of enrollments costs one query whatever its depth
+        """
+        ClassroomEnrollment.objects.bulk_create(
+            [
+                ClassroomEnrollment(
+                    classroom_instance=self.classroom_1,
+                    user_email=f"student{index}@school.sch",
+                    lms_user_id=1000 + index,
+                )
+                for index in range(5000)
+            ]
+        )
+
+        listed_pks = []
+        url = self.enrollments_list_url
+
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+
+            classroom_queries = [
+                query["sql"]
+                for query in queries.captured_queries
+                if "classrooms_" in query["sql"]
+            ]
+            # No count, only the page is fetched
+            self.assertEqual(len(classroom_queries), 1)
+
+            listed_pks.extend(result["pk"] for result in response.data["results"])
+            url = response.data["next"]
+
+        self.assertEqual(len(listed_pks), 5002)
+        self.assertEqual(len(set(listed_pks)), 5002)
+        self.assertEqual(listed_pks[0], self.enrollment_1.pk)
 
     # TODO test with bad request_data
     @mock.patch("learninghub.apps.classrooms.models.get_lms_user_id")
@@ -396,7 +674,7 @@ class ClassroomEnrollmentViewSetTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
         response = self.client.get(self.enrollments_list_url)
-        self.assertEqual(response.data.get("count"), 3)
+        self.assertEqual(len(response.data["results"]), 3)
 
     @ddt.data(1, 2)
     def test_get_single_enrollment(self, pk):
@@ -425,7 +703,7 @@ class ClassroomEnrollmentViewSetTests(APITestCase):
         """Test DELETE"""
         response = self.client.get(self.enrollments_list_url)
 
-        self.assertEqual(response.data.get("count"), 2)
+        self.assertEqual(len(response.data["results"]), 2)
 
         url = reverse(
             "api:v1:enrollments-detail",
@@ -441,7 +719,7 @@ class ClassroomEnrollmentViewSetTests(APITestCase):
 
         response = self.client.get(self.enrollments_list_url)
 
-        self.assertEqual(response.data.get("count"), 2)
+        self.assertEqual(len(response.data["results"]), 2)
 
     def test_update_single_enrollment_returns_405(self):
         """Test UPDATE endpoint returns 405 because we don't support it"""
@@ -543,4 +821,70 @@ class CourseAssignmentViewsetTests(APITestCase):
         response = self.client.get(self.assignment_list_url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data.get("count"), 1)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(
+            response.data["results"],
+            [
+                {
+                    "course_id": self.expected_course_id,
+                    "classroom_instance": self.classroom.uuid,
+                }
+            ],
+        )
+
+    def test_create_assignment_returns_job(self):
+        """Test POST queues the course assignment and returns the job"""
+
+        response = self.client.post(
+            self.assignment_list_url,
+            data=json.dumps({"course_id": self.course_ids[1]}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data.get("status"), "pending")
+        self.assertEqual(response.data.get("course_id"), self.course_ids[1])
+        self.assertIsNone(response.data.get("course_run_id"))
+
+        # The course run is not created during the request
+        response = self.client.get(self.assignment_list_url)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_get_assignment_job_status(self):
+        """Test the job status can be followed from the location returned"""
+
+        response = self.client.post(
+            self.assignment_list_url,
+            data=json.dumps({"course_id": self.course_ids[1]}),
+            content_type="application/json",
+        )
+
+        job_response = self.client.get(response["Location"])
+
+        self.assertEqual(job_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(job_response.data.get("uuid"), response.data.get("uuid"))
+        self.assertEqual(job_response.data.get("status"), "pending")
+
+    def test_create_assignment_invalid_course_400(self):
+        """Test POST with a course key that cannot be parsed is rejected"""
+
+        response = self.client.post(
+            self.assignment_list_url,
+            data=json.dumps({"course_id": "not-a-course-key"}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("course_id", response.data)
+        self.assertFalse(CourseAssignmentJob.objects.exists())
+
+    def test_create_assignment_without_course_400(self):
+        """Test POST without a course is rejected"""
+
+        response = self.client.post(
+            self.assignment_list_url,
+            data=json.dumps({}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
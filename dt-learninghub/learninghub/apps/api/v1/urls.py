@@ -6,6 +6,7 @@ nested routes backed by the `ClassroomsViewSet`.  That is:
 
 /api/v1/classrooms/{classrooms_uuid}/enrollments/
 /api/v1/classrooms/{classrooms_uuid}/enrollments/{enrollments_uuid}/
+/api/v1/classrooms/{classrooms_uuid}/assignment-jobs/{job_uuid}/
 """
 from learninghub.apps.api.v1 import views
 from rest_framework_nested import routers
@@ -72,6 +73,12 @@ classroom_router.register(
     basename="assignments",
 )
 
+classroom_router.register(
+    r"assignment-jobs",
+    views.CourseAssignmentJobViewSet,
+    basename="assignment-jobs",
+)
+
 urlpatterns = []
 
 urlpatterns += router.urls
@@ -2,29 +2,50 @@
 Views for classroom end points.
 """
 
+import csv
+import json
 import logging
 import re
 from typing import List
 
-from django.shortcuts import get_object_or_404
+from django.http import Http404, StreamingHttpResponse
+from django.urls import reverse
 from edx_api_doc_tools import query_parameter, schema_for
 from edx_rbac.mixins import PermissionRequiredForListingMixin
 from edx_rest_framework_extensions.auth.jwt.authentication import JwtAuthentication
+from learninghub.apps.api.mixins import ClassroomContextMixin, ValuesListMixin
+from learninghub.apps.api.pagination import (
+    CreatedCursorPagination,
+    NewestFirstCursorPagination,
+)
 from learninghub.apps.api.serializers import (
     ClassroomEnrollmentSerializer,
     ClassroomSerializer,
+    CourseAssignmentJobSerializer,
     CourseAssignmentSerializer,
 )
 from learninghub.apps.classrooms import constants
 from learninghub.apps.classrooms.course_list import get_course_list
+from learninghub.apps.classrooms.enrollments import (
+    bulk_enroll_in_classroom,
+    import_roster,
+)
+from learninghub.apps.classrooms.jobs import enqueue_course_assignment
 from learninghub.apps.classrooms.models import (
     Classroom,
     ClassroomEnrollment,
     ClassroomRoleAssignment,
     CourseAssignment,
+    CourseAssignmentJob,
+)
+from learninghub.apps.classrooms.roster import (
+    ROSTER_WRITERS,
+    iter_roster,
+    open_roster_csv,
 )
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
 logger = logging.getLogger(__name__)
@@ -157,10 +178,63 @@ logger = logging.getLogger(__name__)
     #     ),
     # ],
     responses={
-        201: "Response body is currently empty.",
+        201: """
+        {
+            "results": [
+                {"identifier": "student_1@school.sch", "status": "enrolled"},
+                {"identifier": "student2@school.sch", "status": "already_enrolled"}
+            ]
+        }
+        """,
     },
 )
-class ClassroomsViewSet(PermissionRequiredForListingMixin, viewsets.ModelViewSet):
+@schema_for(
+    "roster",
+    """
+    Download the enrollments of the classroom.
+
+    The roster is streamed as CSV by default, or as newline delimited JSON with
+    `?file_format=ndjson`.
+    """,
+    parameters=[query_parameter("file_format", str, "csv or ndjson")],
+)
+@schema_for(
+    "school_roster",
+    """
+    Download the enrollments of all the classrooms of a school.
+
+    **Example Request**
+
+        GET api/v1/classrooms/roster/?school=<uuid>&file_format=ndjson
+    """,
+    parameters=[
+        query_parameter("school", str, "School uuid"),
+        query_parameter("file_format", str, "csv or ndjson"),
+    ],
+)
+@schema_for(
+    "import_roster",
+    """
+    Enroll the learners listed in a CSV file.
+
+    The file is uploaded as `file` and has an `email` column. The response streams
+    the outcome of each row as newline delimited JSON while the file is imported.
+
+        {"row": 1, "identifier": "student_1@school.sch", "classroom": "<uuid>", "status": "enrolled"}
+    """,
+)
+@schema_for(
+    "import_school_roster",
+    """
+    Enroll the learners listed in a CSV file in the classrooms of a school.
+
+    The file is uploaded as `file` with the `school` uuid. It has an `email` and a
+    `classroom` column, the latter holding the uuid of a classroom of the school.
+    """,
+)
+class ClassroomsViewSet(
+    ClassroomContextMixin, PermissionRequiredForListingMixin, viewsets.ModelViewSet
+):
     """
     Viewset for CRUD operations on Classroom models.
     """
@@ -173,6 +247,7 @@ class ClassroomsViewSet(PermissionRequiredForListingMixin, viewsets.ModelViewSet
 
     serializer_class = ClassroomSerializer
     enrollment_serializer_class = ClassroomEnrollmentSerializer
+    pagination_class = NewestFirstCursorPagination
     permission_required = constants.CLASSROOM_TEACHER_ACCESS_PERMISSION
 
     # fields that control permissions for 'list' actions
@@ -203,7 +278,9 @@ class ClassroomsViewSet(PermissionRequiredForListingMixin, viewsets.ModelViewSet
         For non-list actions, this is what's returned by `get_queryset()`.
         For list actions, some non-strict subset of this is what's returned by `get_queryset()`.
 
-        Returns all classrooms that the user is enrolled in.
+        Returns all classrooms that the user is enrolled in. The enrollments are
+        resolved as a subquery so the listing is a single query whatever the number
+        of classrooms the user has been enrolled in.
         """
 
         kwargs = {}
@@ -212,17 +289,13 @@ class ClassroomsViewSet(PermissionRequiredForListingMixin, viewsets.ModelViewSet
         if self.requested_classroom_uuid:
             kwargs.update({"uuid": self.requested_classroom_uuid})
 
-        enrollments = ClassroomEnrollment.objects.filter(
+        enrolled_classrooms = ClassroomEnrollment.objects.filter(
             user_email=self.request.user.email
-        )
+        ).values("classroom_instance")
 
-        classroom_ids = []
-        for enrollment in enrollments:
-            classroom_ids.append(enrollment.classroom_instance.uuid)
-
-        return Classroom.objects.filter(uuid__in=classroom_ids, active=True).order_by(
-            "-created"
-        )
+        return Classroom.objects.filter(
+            uuid__in=enrolled_classrooms, active=True, **kwargs
+        ).order_by("-created")
 
     @property
     def requested_school_uuid(self) -> str:
@@ -230,21 +303,18 @@ class ClassroomsViewSet(PermissionRequiredForListingMixin, viewsets.ModelViewSet
         Return school uuid
         """
         if self.requested_classroom_uuid:
-            school_uuid = Classroom.objects.get(
-                uuid=self.requested_classroom_uuid
-            ).school
+            classroom = self.requested_classroom
+            school_uuid = classroom.school if classroom else None
         else:
             school_uuid = self.request.data.get("school")
+            if not school_uuid:
+                school_uuid = self.request.query_params.get("school")
 
         if not school_uuid:
             return None
 
         return school_uuid
 
-    @property
-    def requested_classroom_uuid(self) -> str:
-        return self.kwargs.get("classroom_uuid")
-
     def create(self, request, *args, **kwargs):
         """
         Creating a classroom also triggers the creation of an enrollment for the teacher
@@ -264,9 +334,13 @@ class ClassroomsViewSet(PermissionRequiredForListingMixin, viewsets.ModelViewSet
         enrollment_serializer.is_valid(raise_exception=True)
         enrollment_serializer.save()
 
+        # The teacher enrollment updated the counters in the database
+        classroom = classroom_serializer.instance
+        classroom.refresh_from_db(fields=Classroom.COUNTER_FIELDS)
+
         return Response(
             {
-                **classroom_serializer.data,
+                **self.serializer_class(classroom).data,
                 "classroom_uuid": enrollment_serializer.data["classroom_uuid"],
             },
             status=status.HTTP_201_CREATED,
@@ -276,7 +350,9 @@ class ClassroomsViewSet(PermissionRequiredForListingMixin, viewsets.ModelViewSet
         """
         Update a classroom name or status.
         """
-        classroom = get_object_or_404(Classroom, uuid=kwargs.get("classroom_uuid"))
+        classroom = self.requested_classroom
+        if classroom is None:
+            raise Http404
 
         name = (
             request.data.get("name")
@@ -293,7 +369,13 @@ class ClassroomsViewSet(PermissionRequiredForListingMixin, viewsets.ModelViewSet
         serializer = self.serializer_class(instance=classroom, data=data)
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        return Response(serializer.data, status=status.HTTP_200_OK)
+
+        # The counters are not saved, show their current values
+        classroom.refresh_from_db(fields=Classroom.COUNTER_FIELDS)
+
+        return Response(
+            self.serializer_class(classroom).data, status=status.HTTP_200_OK
+        )
 
     def destroy(self, request, *args, **kwargs) -> Response:
         """
@@ -328,26 +410,16 @@ class ClassroomsViewSet(PermissionRequiredForListingMixin, viewsets.ModelViewSet
         """
         Create enrollment(s) for one or more users.
 
-        TODO: Response body is currently empty.
         TODO: Enroll additional staff
         """
 
-        identifiers_raw = request.data.get("identifiers")
+        identifiers_raw = request.data.get("identifiers", "")
         identifiers = self._split_input_list(identifiers_raw)
-        for identifier in identifiers:
-            # TODO validate the users are part of the same enterprise
-            enrollment_data = {
-                "classroom_instance": classroom_uuid,
-                "user_email": identifier,
-            }
 
-            enrollment_serializer = self.enrollment_serializer_class(
-                data=enrollment_data
-            )
-            enrollment_serializer.is_valid(raise_exception=True)
-            enrollment_serializer.save()
+        # TODO validate the users are part of the same enterprise
+        results = bulk_enroll_in_classroom(self.requested_classroom, identifiers)
 
-        return Response(status=status.HTTP_201_CREATED)
+        return Response(status=status.HTTP_201_CREATED, data={"results": results})
 
     @action(detail=True, methods=["get"])
     def courses(self, request, classroom_uuid: str) -> Response:
@@ -380,6 +452,83 @@ class ClassroomsViewSet(PermissionRequiredForListingMixin, viewsets.ModelViewSet
 
         return Response(status=status.HTTP_200_OK, data=course_list)
 
+    @action(detail=True, methods=["get"])
+    def roster(self, request, classroom_uuid: str) -> StreamingHttpResponse:
+        """
+        Download the enrollments of the classroom as CSV or NDJSON.
+        """
+        return self._stream_roster(classroom_uuid=classroom_uuid)
+
+    @action(detail=False, methods=["get"], url_path="roster")
+    def school_roster(self, request) -> StreamingHttpResponse:
+        """
+        Download the enrollments of all the classrooms of a school as CSV or NDJSON.
+        """
+        return self._stream_roster(school_uuid=self.requested_school_uuid)
+
+    @action(detail=True, methods=["post"], url_path="roster/import")
+    def import_roster(self, request, classroom_uuid: str) -> StreamingHttpResponse:
+        """
+        Enroll the learners listed in an uploaded CSV file.
+        """
+        return self._stream_roster_import(
+            required_columns=["email"], classroom=self.requested_classroom
+        )
+
+    @action(detail=False, methods=["post"], url_path="roster/import")
+    def import_school_roster(self, request) -> StreamingHttpResponse:
+        """
+        Enroll the learners listed in an uploaded CSV file in the classrooms of a school.
+        """
+        return self._stream_roster_import(
+            required_columns=["email", "classroom"],
+            school_uuid=self.requested_school_uuid,
+        )
+
+    def _stream_roster_import(
+        self, required_columns: List[str], **destination
+    ) -> StreamingHttpResponse:
+        """Stream the outcome of each row of the uploaded roster as it is imported"""
+        upload = self.request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": "A CSV file is required"})
+
+        try:
+            reader = open_roster_csv(upload)
+        except (UnicodeDecodeError, csv.Error) as exc:
+            raise ValidationError({"file": f"Not a valid CSV file: {exc}"})
+
+        missing_columns = set(required_columns) - set(reader.fieldnames or [])
+        if missing_columns:
+            raise ValidationError(
+                {"file": f"Missing column(s): {', '.join(sorted(missing_columns))}"}
+            )
+
+        outcomes = import_roster(reader, **destination)
+
+        return StreamingHttpResponse(
+            (json.dumps(outcome) + "\n" for outcome in outcomes),
+            content_type=constants.ROSTER_CONTENT_TYPES[constants.ROSTER_FORMAT_NDJSON],
+        )
+
+    def _stream_roster(self, **filters) -> StreamingHttpResponse:
+        """Stream the roster in the format requested with `file_format`"""
+        file_format = self.request.query_params.get(
+            "file_format", constants.ROSTER_FORMAT_CSV
+        )
+        if file_format not in ROSTER_WRITERS:
+            raise ValidationError(
+                {"file_format": f"Must be one of {', '.join(ROSTER_WRITERS)}"}
+            )
+
+        response = StreamingHttpResponse(
+            ROSTER_WRITERS[file_format](iter_roster(**filters)),
+            content_type=constants.ROSTER_CONTENT_TYPES[file_format],
+        )
+        response["Content-Disposition"] = f'attachment; filename="roster.{file_format}"'
+
+        return response
+
 
 @schema_for(
     "list",
@@ -407,7 +556,9 @@ class ClassroomsViewSet(PermissionRequiredForListingMixin, viewsets.ModelViewSet
         * user_id: ID of the user enrolled in the Classroom
     """,
 )
-class ClassroomEnrollmentViewSet(viewsets.ModelViewSet):
+class ClassroomEnrollmentViewSet(
+    ClassroomContextMixin, ValuesListMixin, viewsets.ModelViewSet
+):
     """
     Viewset for CRUD operations on ClassroomEnrollment models.
     """
@@ -420,24 +571,11 @@ class ClassroomEnrollmentViewSet(viewsets.ModelViewSet):
     # lookup_field = "user_id"
 
     serializer_class = ClassroomEnrollmentSerializer
-
-    def _get_classroom(self):
-        """
-        Helper that returns the classroom specified by `classroom_uuid` in the request.
-        """
-        classroom_uuid = self.kwargs.get("classroom_uuid")
-
-        if not classroom_uuid:
-            return None
-
-        try:
-            return Classroom.objects.get(uuid=classroom_uuid)
-        except Classroom.DoesNotExist:
-            return None
+    pagination_class = CreatedCursorPagination
 
     def get_queryset(self):
         queryset = ClassroomEnrollment.objects.filter(
-            classroom_instance=self._get_classroom()
+            classroom_instance_id=self.requested_classroom_uuid
         )
 
         return queryset
@@ -445,7 +583,7 @@ class ClassroomEnrollmentViewSet(viewsets.ModelViewSet):
     def create(self, request, *args, **kwargs):
         """Create a classroom enrollment"""
         enrollment_data = {
-            "classroom_instance": self._get_classroom().uuid,
+            "classroom_instance": self.requested_classroom.uuid,
             "user_email": self.request.data.get("user_id"),
         }
 
@@ -460,7 +598,7 @@ class ClassroomEnrollmentViewSet(viewsets.ModelViewSet):
 
     # def retrieve(self, request, *args, **kwargs):
     #     enrollment_data = {
-    #         "classroom_instance": self._get_classroom().uuid,
+    #         "classroom_instance": self.requested_classroom.uuid,
     #         "user_id": user_id,
     #     }
 
@@ -509,10 +647,35 @@ class ClassroomEnrollmentViewSet(viewsets.ModelViewSet):
 @schema_for(
     "create",
     """
-    Create a course assignment.
+    Queue the creation of a course assignment.
+
+    The course run is created by a worker. The response contains the job, whose
+    status can be followed with the `assignment-jobs` endpoint.
+
+    **Example Request**
+
+        POST api/v1/classrooms/<uuid>/assignments/ {
+            'course_id': 'course-v1:DiceyTech+EXP001+TEMPLATE',
+        }
     """,
+    responses={
+        202: """
+        {
+            "uuid": "1c4a6a49-9a44-4c36-a7b2-4b2b5c5e9c3e",
+            "classroom_instance": "ee27844d-fd85-46eb-ae6a-fff649094ab1",
+            "course_id": "course-v1:DiceyTech+EXP001+TEMPLATE",
+            "status": "pending",
+            "course_run_id": null,
+            "error": "",
+            "created": "2022-04-08T10:41:55.233173Z",
+            "modified": "2022-04-08T10:41:55.233173Z"
+        }
+        """,
+    },
 )
-class CourseAssignmentViewset(viewsets.ModelViewSet):
+class CourseAssignmentViewset(
+    ClassroomContextMixin, ValuesListMixin, viewsets.ModelViewSet
+):
     """Viewset for operations on course assignments"""
 
     authentication_classes = [JwtAuthentication]
@@ -522,27 +685,46 @@ class CourseAssignmentViewset(viewsets.ModelViewSet):
     lookup_url_kwarg = "course_id"
 
     serializer_class = CourseAssignmentSerializer
+    job_serializer_class = CourseAssignmentJobSerializer
+    pagination_class = CreatedCursorPagination
+
+    def get_queryset(self):
+        queryset = CourseAssignment.objects.filter(
+            classroom_instance_id=self.requested_classroom_uuid
+        )
+
+        return queryset
 
-    def _get_classroom(self):
+    def create(self, request, *args, **kwargs):
         """
-        Helper that returns the classroom specified by `classroom_uuid` in the request.
+        Queue the creation of a course assignment.
         """
-        classroom_uuid = self.kwargs.get("classroom_uuid")
+        classroom = self.requested_classroom
+        if classroom is None:
+            raise Http404
 
-        if not classroom_uuid:
-            return None
+        serializer = self.job_serializer_class(
+            data={
+                "classroom_instance": classroom.uuid,
+                "course_id": request.data.get("course_id"),
+            }
+        )
+        serializer.is_valid(raise_exception=True)
 
-        try:
-            return Classroom.objects.get(uuid=classroom_uuid)
-        except Classroom.DoesNotExist:
-            return None
+        job = enqueue_course_assignment(
+            classroom, serializer.validated_data["course_id"]
+        )
 
-    def get_queryset(self):
-        queryset = CourseAssignment.objects.filter(
-            classroom_instance=self._get_classroom()
+        job_url = reverse(
+            "api:v1:assignment-jobs-detail",
+            kwargs={"classroom_uuid": classroom.uuid, "job_uuid": job.uuid},
         )
 
-        return queryset
+        return Response(
+            data=self.job_serializer_class(job).data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": request.build_absolute_uri(job_url)},
+        )
 
     def update(self, request, *args, **kwargs):
         """
@@ -570,3 +752,37 @@ class CourseAssignmentViewset(viewsets.ModelViewSet):
 
         """
         return Response(status=status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+@schema_for(
+    "list",
+    """
+    Get the list of all course assignment jobs of this classroom.
+    """,
+)
+@schema_for(
+    "retrieve",
+    """
+    Fetch the status of a course assignment job by uuid.
+
+    The status is one of `pending`, `running`, `done` or `failed`. Once the job is
+    done, `course_run_id` holds the course run assigned to the classroom.
+    """,
+)
+class CourseAssignmentJobViewSet(ClassroomContextMixin, viewsets.ReadOnlyModelViewSet):
+    """Viewset to follow the progress of course assignment jobs"""
+
+    authentication_classes = [JwtAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    lookup_field = "uuid"
+    lookup_url_kwarg = "job_uuid"
+
+    serializer_class = CourseAssignmentJobSerializer
+
+    def get_queryset(self):
+        queryset = CourseAssignmentJob.objects.filter(
+            classroom_instance=self.requested_classroom
+        ).select_related("course_assignment")
+
+        return queryset
@@ -1,10 +1,191 @@
 import logging
+import threading
+import time
+from typing import Any, Dict, Iterator, Tuple
+from urllib.parse import urljoin
 
 from django.conf import settings
 from edx_rest_api_client.client import OAuthAPIClient
+from learninghub.apps.api_client.circuit_breaker import get_circuit_breaker
+from learninghub.apps.api_client.constants import (
+    ENTERPRISE_API_PATH,
+    UPSTREAM_DISCOVERY,
+    UPSTREAM_ENTERPRISE,
+    UPSTREAM_LMS,
+    UPSTREAM_STUDIO,
+)
+from learninghub.apps.api_client.metrics import record_call
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
 
 logger = logging.getLogger(__name__)
 
+# OAuth clients shared by the process, keyed by base URL and credentials
+_OAUTH_CLIENTS = {}
+_OAUTH_CLIENTS_LOCK = threading.Lock()
+
+
+def get_upstream_timeout(upstream: str) -> Tuple[float, float]:
+    """Return the (connect, read) timeouts of the requests made to an upstream"""
+    return settings.API_CLIENT_TIMEOUTS.get(
+        upstream,
+        (settings.API_CLIENT_CONNECT_TIMEOUT, settings.API_CLIENT_READ_TIMEOUT),
+    )
+
+
+def get_upstream_urls() -> Dict[str, str]:
+    """Return the base URL of each upstream service that is configured"""
+    upstream_urls = {
+        UPSTREAM_LMS: settings.LMS_BASE_URL,
+        UPSTREAM_ENTERPRISE: settings.LMS_BASE_URL
+        and urljoin(settings.LMS_BASE_URL, ENTERPRISE_API_PATH),
+        UPSTREAM_STUDIO: settings.CMS_BASE_URL,
+        UPSTREAM_DISCOVERY: settings.DISCOVERY_SERVICE_API_URL,
+    }
+
+    return {upstream: url for upstream, url in upstream_urls.items() if url}
+
+
+class UpstreamAdapter(HTTPAdapter):
+    """
+    HTTP adapter for the requests made to an upstream service.
+
+    Requests made without a timeout get the timeouts configured for the upstream,
+    and go through the circuit breaker of the upstream: connection errors, timeouts,
+    errors while reading the response and server errors are failures, any other
+    response is a success.
+
+    The duration, status, sizes and retries of each request are recorded, see
+    `metrics.record_call`.
+    """
+
+    def __init__(self, upstream: str, **kwargs) -> None:
+        self.upstream = upstream
+        super().__init__(**kwargs)
+
+    def send(self, request, timeout=None, **kwargs):  # pylint: disable=arguments-differ
+        breaker = get_circuit_breaker(self.upstream)
+        breaker.before_call()
+
+        if timeout is None:
+            timeout = get_upstream_timeout(self.upstream)
+
+        request_size = (
+            len(request.body or b"") if hasattr(request.body, "__len__") else 0
+        )
+        started = time.perf_counter()
+        failed = True
+
+        try:
+            response = super().send(request, timeout=timeout, **kwargs)
+
+            # The content is read right after unless the response is streamed, a
+            # read timeout or a broken body is a failure of the call
+            if kwargs.get("stream"):
+                response_size = int(response.headers.get("Content-Length") or 0)
+            else:
+                response_size = len(response.content or b"")
+
+            failed = response.status_code >= 500
+        except RequestException:
+            record_call(
+                self.upstream,
+                request.method,
+                request.url,
+                None,
+                time.perf_counter() - started,
+                request_size,
+                0,
+                0,
+            )
+            raise
+        finally:
+            # Whatever the exception, so that a half-open circuit is not left
+            # waiting for the end of its trial call
+            if failed:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+        duration = time.perf_counter() - started
+        retry_history = getattr(getattr(response.raw, "retries", None), "history", ())
+
+        record_call(
+            self.upstream,
+            request.method,
+            request.url,
+            response.status_code,
+            duration,
+            request_size,
+            response_size,
+            len(retry_history or ()),
+        )
+
+        return response
+
+
+def get_oauth_client(base_url: str, client_id: str, client_secret: str):
+    """
+    Return the OAuthAPIClient shared by the process for the given base URL and
+    credentials.
+
+    The client is created on first use and reused by every request handled by the
+    worker, so its connections are kept alive in a pool and its access token, cached
+    by the `TieredCache`, is only fetched again when it is about to expire.
+
+    Each upstream service gets its own `UpstreamAdapter`, mounted on its base URL,
+    so that its requests have a timeout and fail fast while it is unavailable.
+    Requests to other URLs are counted against the LMS, which issues the tokens.
+    """
+    key = (base_url, client_id, client_secret)
+
+    client = _OAUTH_CLIENTS.get(key)
+    if client is not None:
+        return client
+
+    with _OAUTH_CLIENTS_LOCK:
+        client = _OAUTH_CLIENTS.get(key)
+        if client is None:
+            logger.info(f"Create a shared OAuth client for {base_url}")
+
+            client = OAuthAPIClient(
+                base_url,
+                client_id,
+                client_secret,
+                timeout=get_upstream_timeout(UPSTREAM_LMS),
+            )
+
+            adapter = UpstreamAdapter(
+                UPSTREAM_LMS,
+                pool_connections=settings.API_CLIENT_POOL_CONNECTIONS,
+                pool_maxsize=settings.API_CLIENT_POOL_MAXSIZE,
+            )
+            client.mount("http://", adapter)
+            client.mount("https://", adapter)
+
+            for upstream, url in get_upstream_urls().items():
+                client.mount(
+                    url,
+                    UpstreamAdapter(
+                        upstream,
+                        pool_connections=settings.API_CLIENT_POOL_CONNECTIONS,
+                        pool_maxsize=settings.API_CLIENT_POOL_MAXSIZE,
+                    ),
+                )
+
+            _OAUTH_CLIENTS[key] = client
+
+    return client
+
+
+def clear_oauth_clients() -> None:
+    """Close and forget all the shared OAuth clients"""
+    with _OAUTH_CLIENTS_LOCK:
+        for client in _OAUTH_CLIENTS.values():
+            client.close()
+
+        _OAUTH_CLIENTS.clear()
+
 
 class BaseOAuthClient:
     """
@@ -12,12 +193,37 @@ class BaseOAuthClient:
     """
 
     def __init__(self) -> None:
-        self.client = OAuthAPIClient(
+        self.client = get_oauth_client(
             settings.SOCIAL_AUTH_EDX_OAUTH2_URL_ROOT.strip("/"),
             self.oauth2_client_id,
             self.oauth2_client_secret,
         )
 
+    def iter_results(
+        self, url: str, params: Dict[str, Any] = None, page_size: int = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the results of a paginated endpoint, page by page.
+
+        The `next` link of each page is followed until the last page, so only one
+        page is held in memory at a time. Raises an HTTPError if a page could not
+        be fetched.
+        """
+        params = dict(params or {})
+        if page_size:
+            params["page_size"] = page_size
+
+        while url:
+            response = self.client.get(url, params=params)
+            response.raise_for_status()
+
+            page = response.json()
+            yield from page.get("results", [])
+
+            # The next link already includes the query parameters
+            url = page.get("next")
+            params = None
+
     @property
     def oauth2_client_id(self):
         return settings.BACKEND_SERVICE_EDX_OAUTH2_KEY
@@ -0,0 +1,71 @@
+"""
+Caching helpers for the API clients.
+"""
+import logging
+import threading
+import time
+from typing import Any, Callable
+
+from django.core.cache import cache
+from edx_django_utils.cache import TieredCache
+
+logger = logging.getLogger(__name__)
+
+# How long a background refresh holds its lock, in seconds
+REFRESH_LOCK_TIMEOUT = 60
+
+
+def get_stale_while_revalidate(
+    cache_key: str, fetch: Callable[[], Any], timeout: int, stale_timeout: int
+) -> Any:
+    """
+    Return the value cached for `cache_key`, using `fetch` to get it when needed.
+
+    A value is fresh for `timeout` seconds. After that, and for up to `stale_timeout`
+    seconds after it was fetched, the stale value is returned right away while a
+    background thread fetches a new one. If the refresh fails the stale value keeps
+    being served until it expires.
+
+    Errors raised by `fetch` are propagated only when there is no value to serve.
+    """
+    cached_response = TieredCache.get_cached_response(cache_key)
+
+    if not cached_response.is_found:
+        return _refresh(cache_key, fetch, stale_timeout)
+
+    entry = cached_response.value
+    if time.time() - entry["fetched_at"] >= timeout:
+        _refresh_in_background(cache_key, fetch, stale_timeout)
+
+    return entry["value"]
+
+
+def _refresh(cache_key: str, fetch: Callable[[], Any], stale_timeout: int) -> Any:
+    """Fetch the value and cache it"""
+    value = fetch()
+
+    TieredCache.set_all_tiers(
+        cache_key, {"value": value, "fetched_at": time.time()}, stale_timeout
+    )
+
+    return value
+
+
+def _refresh_in_background(
+    cache_key: str, fetch: Callable[[], Any], stale_timeout: int
+) -> None:
+    """Refresh the value in a background thread unless a refresh is in progress"""
+    lock_key = f"{cache_key}:refreshing"
+
+    if not cache.add(lock_key, True, REFRESH_LOCK_TIMEOUT):
+        return
+
+    def refresh():
+        try:
+            _refresh(cache_key, fetch, stale_timeout)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning(f"Serving stale data for {cache_key}: {exc}")
+        finally:
+            cache.delete(lock_key)
+
+    threading.Thread(target=refresh, daemon=True).start()
@@ -0,0 +1,136 @@
+"""
+Circuit breakers protecting the workers from slow or unavailable upstream services.
+"""
+import logging
+import threading
+import time
+from typing import Dict, Tuple
+
+from django.conf import settings
+from edx_django_utils.monitoring import increment
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+logger = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RequestsConnectionError):
+    """
+    Raised instead of calling an upstream service whose circuit is open.
+
+    It is a `requests.exceptions.ConnectionError` so callers handle it like an
+    upstream that cannot be reached and fall back right away.
+    """
+
+
+class CircuitBreaker:
+    """
+    Stop calling an upstream service after `failure_threshold` consecutive failures.
+
+    Once open, calls fail fast with a `CircuitOpenError` for `reset_timeout` seconds.
+    The circuit is then half-open: a single trial call goes through, closing the
+    circuit if it succeeds and opening it again if it fails.
+
+    State transitions are logged and counted with the
+    `api_client.circuit_breaker.<upstream>.<state>` custom monitoring attribute.
+    The breaker also counts its transitions, which are exported with its current
+    state by `metrics.export_histograms`.
+    """
+
+    def __init__(self, upstream: str, failure_threshold: int, reset_timeout: float):
+        self.upstream = upstream
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_progress = False
+        # State -> number of transitions to the state
+        self.transitions: Dict[str, int] = {}
+
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """Raise a CircuitOpenError if the upstream must not be called"""
+        with self._lock:
+            if self.state == STATE_CLOSED:
+                return
+
+            if (
+                self.state == STATE_OPEN
+                and time.monotonic() - self.opened_at >= self.reset_timeout
+            ):
+                self._set_state(STATE_HALF_OPEN)
+
+            if self.state == STATE_HALF_OPEN and not self.trial_in_progress:
+                self.trial_in_progress = True
+                return
+
+        raise CircuitOpenError(f"Circuit of {self.upstream} is {self.state}")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.trial_in_progress = False
+
+            if self.state != STATE_CLOSED:
+                self._set_state(STATE_CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self.trial_in_progress = False
+
+            if self.state == STATE_HALF_OPEN or (
+                self.state == STATE_CLOSED and self.failures >= self.failure_threshold
+            ):
+                self.opened_at = time.monotonic()
+                self._set_state(STATE_OPEN)
+
+    def get_stats(self) -> Tuple[str, Dict[str, int]]:
+        """Return the current state and the number of transitions to each state"""
+        with self._lock:
+            return self.state, dict(self.transitions)
+
+    def _set_state(self, state: str) -> None:
+        logger.warning(f"Circuit of {self.upstream} is now {state}")
+
+        self.state = state
+        self.transitions[state] = self.transitions.get(state, 0) + 1
+        increment(f"api_client.circuit_breaker.{self.upstream}.{state}")
+
+
+# Circuit breakers shared by the process, keyed by upstream
+_CIRCUIT_BREAKERS: Dict[str, CircuitBreaker] = {}
+_CIRCUIT_BREAKERS_LOCK = threading.Lock()
+
+
+def get_circuit_breaker(upstream: str) -> CircuitBreaker:
+    """Return the circuit breaker shared by the process for an upstream"""
+    with _CIRCUIT_BREAKERS_LOCK:
+        breaker = _CIRCUIT_BREAKERS.get(upstream)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                upstream,
+                settings.API_CLIENT_CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                settings.API_CLIENT_CIRCUIT_BREAKER_RESET_TIMEOUT,
+            )
+            _CIRCUIT_BREAKERS[upstream] = breaker
+
+    return breaker
+
+
+def get_circuit_breakers() -> Dict[str, CircuitBreaker]:
+    """Return the circuit breakers of the process, keyed by upstream"""
+    with _CIRCUIT_BREAKERS_LOCK:
+        return dict(_CIRCUIT_BREAKERS)
+
+
+def reset_circuit_breakers() -> None:
+    """Forget the state of all the circuit breakers"""
+    with _CIRCUIT_BREAKERS_LOCK:
+        _CIRCUIT_BREAKERS.clear()
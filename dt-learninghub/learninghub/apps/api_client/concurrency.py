@@ -0,0 +1,68 @@
+"""
+Helpers to make concurrent calls with the API clients.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, TypeVar
+
+from django.conf import settings
+from edx_django_utils.cache import RequestCache
+from edx_django_utils.monitoring import CachedCustomMonitoringMiddleware, accumulate
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def fetch_concurrently(fetch: Callable[[T], R], items: Iterable[T]) -> List[R]:
+    """
+    Call `fetch` for each item and return the results in the order of the items.
+
+    The calls are made by a pool of at most `API_CLIENT_MAX_CONCURRENT_REQUESTS`
+    threads, which become greenlets when the worker monkey patches threading with
+    gevent. Items whose call failed are logged and left out of the results.
+
+    The custom monitoring attributes accumulated by each call are added to the
+    attributes of the calling thread, as the request cache is local to each thread.
+    """
+    items = list(items)
+    results = []
+
+    if not items:
+        return results
+
+    max_workers = min(settings.API_CLIENT_MAX_CONCURRENT_REQUESTS, len(items))
+    # Index of the item -> attributes accumulated by its call
+    attributes: Dict[int, Dict[str, Any]] = {}
+
+    def fetch_item(index: int) -> R:
+        attributes_cache = _get_attributes_cache()
+        try:
+            return fetch(items[index])
+        finally:
+            attributes[index] = dict(attributes_cache.data)
+            attributes_cache.clear()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(fetch_item, index) for index in range(len(items))]
+
+        for index, (item, future) in enumerate(zip(items, futures)):
+            try:
+                results.append(future.result())
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.error(f"Could not fetch {item} because of {exc}")
+
+            for name, value in attributes.pop(index, {}).items():
+                accumulate(name, value)
+
+    return results
+
+
+def _get_attributes_cache() -> RequestCache:
+    """Return the custom monitoring attributes accumulated by the current thread"""
+    # The only access to the attributes cache, which edx-django-utils (pinned to
+    # 4.6.0) does not expose publicly: check it when upgrading, test_concurrency
+    # fails if the attributes of the workers stop reaching the caller.
+    # pylint: disable=protected-access
+    return CachedCustomMonitoringMiddleware._get_attributes_cache()
@@ -5,11 +5,22 @@ from urllib.parse import urljoin
 
 from django.conf import settings
 
+# Upstream services called by the API clients
+UPSTREAM_LMS = "lms"
+UPSTREAM_STUDIO = "studio"
+UPSTREAM_DISCOVERY = "discovery"
+UPSTREAM_ENTERPRISE = "enterprise"
+ENTERPRISE_API_PATH = "/enterprise/api/"
+
 # LMS API Client Constants
 LMS_BULK_ENROLLMENT_ENDPOINT = urljoin(
     settings.LMS_BASE_URL, "/api/bulk_enroll/v1/bulk_enroll"
 )
 LMS_USER_ENDPOINT = urljoin(settings.LMS_BASE_URL, "/api/user/v1/accounts")
+LMS_USER_CACHE_KEY_TPL = "lms_user:{email}"
+LMS_USER_CACHE_TIMEOUT = 60 * 60 * 24
+LMS_USER_NOT_FOUND_CACHE_TIMEOUT = 60 * 5
+LMS_USER_LOOKUP_BATCH_SIZE = 50
 
 # Studio API Client Constants
 STUDIO_COURSE_RUNS_ENDPOINT = urljoin(settings.CMS_BASE_URL, "api/v1/course_runs/")
@@ -24,10 +35,14 @@ DISCOVERY_COURSE_RUNS_ENDPOINT = urljoin(
 DISCOVERY_COURSES_ENDPOINT = urljoin(settings.DISCOVERY_SERVICE_API_URL, "courses/")
 DISCOVERY_CATALOGS_ENDPOINT = urljoin(settings.DISCOVERY_SERVICE_API_URL, "catalogs/")
 DISCOVERY_OFFSET_SIZE = 200
+DISCOVERY_RUN_TYPE_CACHE_KEY_TPL = "run_type:{key}"
+# The run type of a template course practically never changes
+DISCOVERY_RUN_TYPE_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+DISCOVERY_RUN_TYPE_BATCH_SIZE = 50
 DISCOVERY_CATALOG_QUERY_CACHE_KEY_TPL = "catalog_query:{id}"
 
 # Enterprise API Client Constants
-ENTERPRISE_API_URL = urljoin(settings.LMS_BASE_URL, "/enterprise/api/v1/")
+ENTERPRISE_API_URL = urljoin(settings.LMS_BASE_URL, ENTERPRISE_API_PATH + "v1/")
 ENTERPRISE_CATALOG_ENDPOINT = urljoin(ENTERPRISE_API_URL, "enterprise_catalogs/")
 ENTERPRISE_CUSTOMER_ENDPOINT = urljoin(ENTERPRISE_API_URL, "enterprise-customer/")
 ENTERPRISE_LEARNER_ENDPOINT = urljoin(ENTERPRISE_API_URL, "enterprise-learner/")
@@ -35,3 +50,8 @@ ENTERPRISE_COURSE_ENROLLMENT = urljoin(
     ENTERPRISE_API_URL, "enterprise-course-enrollment/"
 )
 ENTERPRISE_CUSTOMER_CACHE_KEY_TPL = "customer:{uuid}"
+ENTERPRISE_CATALOG_CACHE_KEY_TPL = "enterprise_catalog:{uuid}"
+ENTERPRISE_CATALOG_PAGE_SIZE = 100
+# Catalogs are fresh for 15 minutes and served stale for up to a day
+ENTERPRISE_CATALOG_CACHE_TIMEOUT = 60 * 15
+ENTERPRISE_CATALOG_STALE_CACHE_TIMEOUT = 60 * 60 * 24
@@ -2,14 +2,21 @@
 Discovery service api client code.
 """
 import logging
+from typing import Any, Dict, List, Optional
 
+from edx_django_utils.cache import TieredCache
 from learninghub.apps.api_client.base_oauth import BaseOAuthClient
+from learninghub.apps.api_client.concurrency import fetch_concurrently
 from learninghub.apps.api_client.constants import (
     DISCOVERY_CATALOGS_ENDPOINT,
     DISCOVERY_COURSE_RUNS_ENDPOINT,
+    DISCOVERY_OFFSET_SIZE,
+    DISCOVERY_RUN_TYPE_BATCH_SIZE,
+    DISCOVERY_RUN_TYPE_CACHE_KEY_TPL,
+    DISCOVERY_RUN_TYPE_CACHE_TIMEOUT,
 )
 from opaque_keys.edx.keys import CourseKey
-from requests.exceptions import HTTPError
+from requests.exceptions import HTTPError, RequestException
 
 logger = logging.getLogger(__name__)
 
@@ -39,67 +46,131 @@ class DiscoveryApiClient(BaseOAuthClient):
             )
             raise exc
 
-    def get_course_run_type(self, course_key: CourseKey):
-        """Get Run Type UUID from Course"""
+    def get_course_run(self, course_key: str) -> Optional[Dict[str, Any]]:
+        """Get a course run by key, or None if it does not exist"""
 
-        try:
-            logger.info(f"Get run type UUID from course {course_key}")
+        response = self.client.get(
+            DISCOVERY_COURSE_RUNS_ENDPOINT, params={"keys": course_key}
+        )
+        response.raise_for_status()
 
-            response = self.client.get(
-                DISCOVERY_COURSE_RUNS_ENDPOINT, params={"keys": course_key}
-            )
-            response.raise_for_status()
+        results = response.json().get("results")
 
-            logger.debug(response.json())
-            if not response.json().get("results"):
-                return ""
+        return results[0] if results else None
 
-            run_type = response.json().get("results")[0].get("run_type")
+    def get_course_run_type(self, course_key: CourseKey) -> str:
+        """
+        Get Run Type UUID from Course, or an empty string if the course run does not
+        exist. The run type is cached, see `get_course_run_types`.
+        """
+        course_key = str(course_key)
 
-            return run_type
-        except IndexError as exc:  # noqa F841
+        run_type = self.get_course_run_types([course_key]).get(course_key)
+        if not run_type:
             logger.error(f"No run type was found for {course_key}")
 
-            return None
-        except HTTPError as exc:
-            logger.error(
-                f"Could not get course details for course run with key {course_key}"
+            return ""
+
+        return run_type
+
+    def get_course_run_types(self, course_keys: List[str]) -> Dict[str, str]:
+        """
+        Get the run type UUID of many course runs, usually template courses.
+
+        Run types are cached and the keys that are not cached are looked up in
+        batches of `DISCOVERY_RUN_TYPE_BATCH_SIZE` per request. Returns a mapping of
+        each course run key to its run type, course runs that do not exist are left
+        out. Raises an HTTPError if a batch could not be fetched.
+        """
+        run_types = {}
+        uncached_keys = []
+
+        for course_key in dict.fromkeys(str(course_key) for course_key in course_keys):
+            cached_response = TieredCache.get_cached_response(
+                DISCOVERY_RUN_TYPE_CACHE_KEY_TPL.format(key=course_key)
             )
-            raise exc
+            if cached_response.is_found:
+                run_types[course_key] = cached_response.value
+            else:
+                uncached_keys.append(course_key)
+
+        for start in range(0, len(uncached_keys), DISCOVERY_RUN_TYPE_BATCH_SIZE):
+            chunk = uncached_keys[start : start + DISCOVERY_RUN_TYPE_BATCH_SIZE]
+
+            logger.info(f"Get run type UUID from {len(chunk)} course(s)")
+
+            try:
+                # A page holds all the course runs of the batch
+                response = self.client.get(
+                    DISCOVERY_COURSE_RUNS_ENDPOINT,
+                    params={"keys": ",".join(chunk), "page_size": len(chunk)},
+                )
+                response.raise_for_status()
+            except HTTPError as exc:
+                logger.error(
+                    f"Could not get course details for course runs with keys {chunk}"
+                )
+                raise exc
+
+            course_runs = response.json().get("results") or []
+
+            for course_run in course_runs:
+                if course_run.get("key") in chunk and course_run.get("run_type"):
+                    run_types[course_run["key"]] = course_run["run_type"]
+                    TieredCache.set_all_tiers(
+                        DISCOVERY_RUN_TYPE_CACHE_KEY_TPL.format(key=course_run["key"]),
+                        course_run["run_type"],
+                        DISCOVERY_RUN_TYPE_CACHE_TIMEOUT,
+                    )
+
+        return run_types
 
     # TODO get courses available for school/teacher
     def get_course_list(self):
-        """Return a list of courses to use as templates for course assignments"""
+        """
+        Return a list of courses to use as templates for course assignments
+
+        Catalogs are fetched concurrently and a catalog that cannot be fetched is
+        left out.
+        """
         try:
             catalog_names = ["Starter Pack", "Creator Pack", "Maker Pack"]
             logger.info(f"Get course list for catalogs {str(catalog_names)}")
 
-            response = self.client.get(DISCOVERY_CATALOGS_ENDPOINT).json()
-
-            logger.info(f"Response: {response}")
             catalogs_ids = []
 
-            for catalog in response.get("results"):
+            for catalog in self.iter_results(
+                DISCOVERY_CATALOGS_ENDPOINT, page_size=DISCOVERY_OFFSET_SIZE
+            ):
                 if catalog["name"] in catalog_names and catalog["courses_count"] > 0:
                     catalogs_ids.append(catalog["id"])
 
             course_list = []
 
-            for id in catalogs_ids:
-                response = self.client.get(
-                    DISCOVERY_CATALOGS_ENDPOINT + f"{id}/courses"
-                ).json()
-
-                for course in response.get("results"):
-                    for course_run in course["course_runs"]:
-                        if "TEMPLATE" in course_run["key"]:
-                            course_list.append(course_run)
+            for course_runs in fetch_concurrently(
+                self._get_catalog_template_runs, catalogs_ids
+            ):
+                course_list.extend(course_runs)
 
             logger.debug(f"Found {len(course_list)} courses.")
 
             return course_list
 
-        except HTTPError as exc:
+        except RequestException as exc:
             logger.error(f"Could not retrieve course list because of{exc}")
 
             return []
+
+    def _get_catalog_template_runs(self, catalog_id):
+        """Return the template course runs of a catalog"""
+        course_list = []
+
+        for course in self.iter_results(
+            DISCOVERY_CATALOGS_ENDPOINT + f"{catalog_id}/courses",
+            page_size=DISCOVERY_OFFSET_SIZE,
+        ):
+            for course_run in course["course_runs"]:
+                if "TEMPLATE" in course_run["key"]:
+                    course_list.append(course_run)
+
+        return course_list
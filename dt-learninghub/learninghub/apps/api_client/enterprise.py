@@ -1,15 +1,22 @@
 """  """
 import logging
-from typing import List
+from typing import Any, Dict, Iterator, List
 from urllib.parse import urljoin
 
 from learninghub.apps.api_client.base_oauth import BaseOAuthClient
+from learninghub.apps.api_client.cache import get_stale_while_revalidate
+from learninghub.apps.api_client.concurrency import fetch_concurrently
 from learninghub.apps.api_client.constants import (
+    ENTERPRISE_CATALOG_CACHE_KEY_TPL,
+    ENTERPRISE_CATALOG_CACHE_TIMEOUT,
     ENTERPRISE_CATALOG_ENDPOINT,
+    ENTERPRISE_CATALOG_PAGE_SIZE,
+    ENTERPRISE_CATALOG_STALE_CACHE_TIMEOUT,
+    ENTERPRISE_CUSTOMER_CACHE_KEY_TPL,
     ENTERPRISE_CUSTOMER_ENDPOINT,
     ENTERPRISE_LEARNER_ENDPOINT,
 )
-from requests.exceptions import HTTPError
+from requests.exceptions import HTTPError, RequestException
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +47,7 @@ class EnterpriseApiClient(BaseOAuthClient):
             enterprise_customer = results[0] if results else {}
 
             return enterprise_customer
-        except HTTPError as exc:
+        except RequestException as exc:
             logger.error(
                 f"Could not retrieve details for Enterprise Customer <{customer_uuid}> because of{exc}"
             )
@@ -132,36 +139,92 @@ class EnterpriseApiClient(BaseOAuthClient):
         Returns:
             course_list:
         """
-        course_list = []
+        return list(self.iter_course_list(customer_uuid))
 
-        try:
-            catalog_list = self.get_enterprise_customer(customer_uuid).get(
-                "enterprise_customer_catalogs", []
-            )
+    def iter_course_list(self, customer_uuid) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the template courses accessible to the enterprise user, catalog by
+        catalog.
 
-            for catalog in catalog_list:
-                endpoint = urljoin(ENTERPRISE_CATALOG_ENDPOINT, f"{catalog}/")
-                response = self.client.get(endpoint).json()
-                courses = response.get("results", [])
-
-                for course in courses:
-                    if course.get("key"):
-                        # This is to maintain the compatibilty with the way the discovery
-                        # API client would return a list of courses
-                        course_list.append(
-                            {
-                                "key": course.get("key"),
-                                "uuid": None,  # Not used in frontend
-                                "title": course.get("title"),
-                                "image": {
-                                    "src": course.get("image_url"),
-                                },
-                                "short_description": course.get("short_description"),
-                            }
-                        )
-
-            return course_list
-        except HTTPError as exc:
+        The catalogs of the customer and the courses of each catalog are cached, see
+        `get_customer_catalogs` and `get_catalog_courses`. Catalogs are fetched
+        concurrently and a catalog that cannot be fetched is left out.
+
+        Arguments:
+            customer_uuid: string representation of the enterprise customer's uuid
+        """
+        try:
+            catalog_list = self.get_customer_catalogs(customer_uuid)
+        except RequestException as exc:
             logger.error(f"Could not retrieve course list because of{exc}")
 
-            return []
+            return
+
+        for courses in fetch_concurrently(self.get_catalog_courses, catalog_list):
+            yield from courses
+
+    def get_customer_catalogs(self, customer_uuid) -> List[str]:
+        """
+        Return the uuids of the catalogs of an enterprise customer.
+
+        The list is cached, served stale while it is refreshed in the background and
+        served stale if the LMS cannot be reached.
+        """
+        return get_stale_while_revalidate(
+            ENTERPRISE_CUSTOMER_CACHE_KEY_TPL.format(uuid=customer_uuid),
+            lambda: self._fetch_customer_catalogs(customer_uuid),
+            ENTERPRISE_CATALOG_CACHE_TIMEOUT,
+            ENTERPRISE_CATALOG_STALE_CACHE_TIMEOUT,
+        )
+
+    def get_catalog_courses(self, catalog_uuid) -> List[Dict[str, Any]]:
+        """
+        Return the courses of an enterprise catalog.
+
+        Catalogs are shared by many schools so they are cached by catalog, served
+        stale while they are refreshed in the background and served stale if the LMS
+        cannot be reached.
+        """
+        return get_stale_while_revalidate(
+            ENTERPRISE_CATALOG_CACHE_KEY_TPL.format(uuid=catalog_uuid),
+            lambda: self._fetch_catalog_courses(catalog_uuid),
+            ENTERPRISE_CATALOG_CACHE_TIMEOUT,
+            ENTERPRISE_CATALOG_STALE_CACHE_TIMEOUT,
+        )
+
+    def _fetch_customer_catalogs(self, customer_uuid) -> List[str]:
+        """Fetch the uuids of the catalogs of an enterprise customer"""
+        response = self.client.get(
+            ENTERPRISE_CUSTOMER_ENDPOINT, params={"uuid": customer_uuid}
+        )
+        response.raise_for_status()
+
+        results = response.json().get("results", [])
+        enterprise_customer = results[0] if results else {}
+
+        return enterprise_customer.get("enterprise_customer_catalogs", [])
+
+    def _fetch_catalog_courses(self, catalog_uuid) -> List[Dict[str, Any]]:
+        """Fetch the courses of an enterprise catalog"""
+        endpoint = urljoin(ENTERPRISE_CATALOG_ENDPOINT, f"{catalog_uuid}/")
+
+        course_list = []
+        for course in self.iter_results(
+            endpoint, page_size=ENTERPRISE_CATALOG_PAGE_SIZE
+        ):
+            if course.get("key"):
+                # This is to maintain the compatibilty with the way the discovery
+                # API client would return a list of courses
+                course_list.append(
+                    {
+                        "key": course.get("key"),
+                        "uuid": None,  # Not used in frontend
+                        "title": course.get("title"),
+                        "image": {
+                            "src": course.get("image_url"),
+                        },
+                        "short_description": course.get("short_description"),
+                    }
+                )
+
+        return course_list
@@ -3,14 +3,19 @@ LMS service api client code.
 """
 
 import logging
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
 
+from edx_django_utils.cache import TieredCache
 from learninghub.apps.api_client.base_oauth import BaseOAuthClient
 from learninghub.apps.api_client.constants import (
     LMS_BULK_ENROLLMENT_ENDPOINT,
+    LMS_USER_CACHE_KEY_TPL,
+    LMS_USER_CACHE_TIMEOUT,
     LMS_USER_ENDPOINT,
+    LMS_USER_LOOKUP_BATCH_SIZE,
+    LMS_USER_NOT_FOUND_CACHE_TIMEOUT,
 )
-from requests.exceptions import HTTPError
+from requests.exceptions import RequestException
 
 logger = logging.getLogger(__name__)
 
@@ -51,24 +56,127 @@ class LMSApiClient(BaseOAuthClient):
             response.raise_for_status()
 
             return response
-        except HTTPError as exc:
+        except RequestException as exc:
             logger.error(f"Bulk enroll failed {exc}")
 
             return
 
     def get_usernames(self, emails_list: List[str]) -> List[str]:
-        """Given a list of user emails, return a list of ursernames"""
-        usernames = []
+        """
+        Given a list of user emails, return a list of ursernames.
 
+        Emails that do not match any LMS user are left out.
+        """
+        identities = self.get_user_identities(emails_list)
+
+        usernames = []
         for email in emails_list:
-            response = self.get_user_details(email=email)
-            if not response:
-                return []
+            identity = identities.get(email)
+            if not identity:
+                logger.warning(f"Could not find a username for {email}")
+                continue
 
-            usernames.append(response.get("username"))
+            usernames.append(identity.get("username"))
 
         return usernames
 
+    def get_user_identity(self, email: str) -> Dict[str, Any]:
+        """
+        Get the LMS user ID and username of the user with the given email.
+        """
+        return self.get_user_identities([email]).get(email, {})
+
+    def get_user_identities(self, emails: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the LMS user ID and username of the users with the given emails.
+
+        Results are cached across requests and the emails that are not cached are
+        looked up in batches. Unknown emails are mapped to an empty dictionary and
+        cached for a shorter time so that newly registered users are picked up
+        quickly. Emails whose lookup failed are left out.
+        """
+        identities = {}
+        uncached_emails = []
+
+        for email in emails:
+            cache_key = LMS_USER_CACHE_KEY_TPL.format(email=email.lower())
+            cached_response = TieredCache.get_cached_response(cache_key)
+            if cached_response.is_found:
+                identities[email] = cached_response.value
+            else:
+                uncached_emails.append(email)
+
+        if not uncached_emails:
+            return identities
+
+        for email, details in self.get_users_details(emails=uncached_emails).items():
+            cache_key = LMS_USER_CACHE_KEY_TPL.format(email=email.lower())
+
+            if details:
+                identity = {
+                    "id": details.get("id"),
+                    "username": details.get("username"),
+                }
+                TieredCache.set_all_tiers(cache_key, identity, LMS_USER_CACHE_TIMEOUT)
+            else:
+                identity = {}
+                TieredCache.set_all_tiers(
+                    cache_key, identity, LMS_USER_NOT_FOUND_CACHE_TIMEOUT
+                )
+
+            identities[email] = identity
+
+        return identities
+
+    def get_users_details(
+        self,
+        emails: List[str] = None,
+        user_ids: List[int] = None,
+        usernames: List[str] = None,
+    ) -> Dict[Any, Optional[Dict[str, Any]]]:
+        """
+        Get the details of many users by email, LMS user ID or username.
+
+        The identifiers are sent in chunks of `LMS_USER_LOOKUP_BATCH_SIZE` per
+        request. Returns a mapping of each identifier to the user details, or None if
+        no user matches it. Identifiers whose lookup failed are left out.
+        """
+        if emails:
+            param, field, identifiers = "email", "email", emails
+        elif user_ids:
+            param, field, identifiers = "lms_user_id", "id", user_ids
+        elif usernames:
+            param, field, identifiers = "username", "username", usernames
+        else:
+            return {}
+
+        identifiers = list(dict.fromkeys(identifiers))
+        users_details = {}
+
+        for start in range(0, len(identifiers), LMS_USER_LOOKUP_BATCH_SIZE):
+            chunk = identifiers[start : start + LMS_USER_LOOKUP_BATCH_SIZE]
+
+            try:
+                response = self.client.get(
+                    LMS_USER_ENDPOINT,
+                    params={param: ",".join(str(identifier) for identifier in chunk)},
+                )
+
+                response.raise_for_status()
+            except RequestException as exc:
+                logger.error(f"Could not get details for {len(chunk)} user(s) {exc}")
+
+                continue
+
+            found = {
+                str(details.get(field)).lower(): details for details in response.json()
+            }
+
+            for identifier in chunk:
+                users_details[identifier] = found.get(str(identifier).lower())
+
+        return users_details
+
     def get_user_details(
         self, email=None, user_id=None, username=None
     ) -> Dict[str, str]:
@@ -77,6 +185,24 @@ class LMSApiClient(BaseOAuthClient):
         if not any((email, user_id, username)):
             return
 
+        try:
+            return self._get_user_details(
+                email=email, user_id=user_id, username=username
+            )
+        except RequestException as exc:
+            logger.error(f"Could not get user details {exc}")
+
+            return {}
+
+    def _get_user_details(
+        self, email=None, user_id=None, username=None
+    ) -> Dict[str, str]:
+        """
+        Fetch the details of a single user from the LMS.
+
+        Returns an empty dictionary if the user does not exist and raise an HTTPError
+        if the request failed.
+        """
         query_params = ""
 
         if email:
@@ -86,16 +212,13 @@ class LMSApiClient(BaseOAuthClient):
         elif username:
             query_params = f"username={username}"
 
-        try:
-            response = self.client.get(LMS_USER_ENDPOINT, params=query_params)
+        response = self.client.get(LMS_USER_ENDPOINT, params=query_params)
 
-            response.raise_for_status()
+        response.raise_for_status()
 
-            return response.json()[0]
-        except HTTPError as exc:
-            logger.error(f"Could not get user details {exc}")
+        results = response.json()
 
-            return {}
+        return results[0] if results else {}
 
     def remove_discovery_user(self, course):
         """Remove discovery user from learner list in course"""
@@ -114,7 +237,7 @@ class LMSApiClient(BaseOAuthClient):
             response.raise_for_status()
 
             return response
-        except HTTPError as exc:
+        except RequestException as exc:
             logger.error(f"Failed to remove discovery user {exc}")
 
             return
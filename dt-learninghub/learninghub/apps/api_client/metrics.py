@@ -0,0 +1,208 @@
+"""
+Instrumentation of the requests made by the API clients to the upstream services.
+"""
+import re
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from edx_django_utils.monitoring import accumulate
+from learninghub.apps.api_client.circuit_breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    get_circuit_breakers,
+)
+
+# Upper bounds of the histogram buckets
+DURATION_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+RETRIES_BUCKETS = (0, 1, 2, 3, 5)
+
+# Path segments holding identifiers: numbers, uuids, course keys and emails
+IDENTIFIER_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F-]{32,36}|.*[:@+].*)$")
+
+# The labels of a histogram: upstream, method, endpoint and status
+Labels = Tuple[str, str, str, str]
+LABEL_NAMES = ("upstream", "method", "endpoint", "status")
+
+CIRCUIT_BREAKER_STATES = (STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN)
+
+
+class Histogram:
+    """
+    Count the values observed in cumulative buckets, as a Prometheus histogram.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative_counts(self) -> List[Tuple[str, int]]:
+        """Return the number of values lower or equal to each bucket bound"""
+        bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+        total = 0
+        cumulative = []
+
+        for bound, count in zip(bounds, self.counts):
+            total += count
+            cumulative.append((bound, total))
+
+        return cumulative
+
+
+# Histograms of the process, keyed by metric name then labels
+_HISTOGRAMS: Dict[str, Dict[Labels, Histogram]] = {}
+_HISTOGRAMS_LOCK = threading.Lock()
+
+
+def get_endpoint(url: str) -> str:
+    """
+    Return the path of a URL with the identifiers replaced by `{id}`, so that all
+    the calls to an endpoint are grouped together.
+    """
+    segments = urlsplit(url).path.split("/")
+
+    return "/".join(
+        "{id}" if IDENTIFIER_SEGMENT.match(segment) else segment for segment in segments
+    )
+
+
+def record_call(
+    upstream: str,
+    method: str,
+    url: str,
+    status_code: Optional[int],
+    duration: float,
+    request_size: int,
+    response_size: int,
+    retries: int,
+) -> None:
+    """
+    Record a request made to an upstream service.
+
+    The totals of each upstream and the duration of each endpoint are accumulated
+    as custom monitoring attributes of the current transaction, and the values are
+    added to the histograms of the process, see `export_histograms`.
+
+    `status_code` is None when no response was received.
+    """
+    endpoint = get_endpoint(url)
+    prefix = f"api_client.{upstream}"
+
+    accumulate(f"{prefix}.calls", 1)
+    accumulate(f"{prefix}.duration_ms", round(duration * 1000))
+    accumulate(f"{prefix}.retries", retries)
+    accumulate(f"{prefix}.request_bytes", request_size)
+    accumulate(f"{prefix}.response_bytes", response_size)
+    if status_code is None or status_code >= 500:
+        accumulate(f"{prefix}.errors", 1)
+
+    accumulate(f"{prefix}.{method} {endpoint}.calls", 1)
+    accumulate(f"{prefix}.{method} {endpoint}.duration_ms", round(duration * 1000))
+
+    labels = (upstream, method, endpoint, str(status_code or "error"))
+
+    with _HISTOGRAMS_LOCK:
+        _observe("api_client_request_duration_seconds", labels, duration)
+        _observe("api_client_request_size_bytes", labels, request_size)
+        _observe("api_client_response_size_bytes", labels, response_size)
+        _observe("api_client_request_retries", labels, retries)
+
+
+def _observe(name: str, labels: Labels, value: float) -> None:
+    """Add a value to a histogram, the caller holds the lock"""
+    histograms = _HISTOGRAMS.setdefault(name, {})
+
+    histogram = histograms.get(labels)
+    if histogram is None:
+        histogram = histograms[labels] = Histogram(_get_buckets(name))
+
+    histogram.observe(value)
+
+
+def _get_buckets(name: str) -> Tuple[float, ...]:
+    if name.endswith("_seconds"):
+        return DURATION_BUCKETS
+    if name.endswith("_bytes"):
+        return SIZE_BUCKETS
+    return RETRIES_BUCKETS
+
+
+def export_histograms() -> str:
+    """
+    Return the histograms of the process in the Prometheus text exposition format.
+
+    The transitions and the current state of the circuit breakers of the process
+    are exported along with them, as a counter and a gauge.
+    """
+    lines = []
+
+    with _HISTOGRAMS_LOCK:
+        for name, histograms in sorted(_HISTOGRAMS.items()):
+            lines.append(f"# TYPE {name} histogram")
+
+            for labels, histogram in sorted(histograms.items()):
+                label_values = _format_labels(labels)
+
+                for bound, count in histogram.cumulative_counts():
+                    lines.append(
+                        f'{name}_bucket{{{label_values},le="{bound}"}} {count}'
+                    )
+
+                lines.append(f"{name}_sum{{{label_values}}} {histogram.sum}")
+                lines.append(f"{name}_count{{{label_values}}} {histogram.count}")
+
+    lines.extend(_export_circuit_breakers())
+
+    return "\n".join(lines) + "\n"
+
+
+def _export_circuit_breakers() -> List[str]:
+    """Return the transitions and the state of each circuit breaker"""
+    stats = {
+        upstream: breaker.get_stats()
+        for upstream, breaker in sorted(get_circuit_breakers().items())
+    }
+    if not stats:
+        return []
+
+    transitions_name = "api_client_circuit_breaker_transitions_total"
+    state_name = "api_client_circuit_breaker_state"
+    transitions_lines = [f"# TYPE {transitions_name} counter"]
+    state_lines = [f"# TYPE {state_name} gauge"]
+
+    for upstream, (current_state, transitions) in stats.items():
+        for state in CIRCUIT_BREAKER_STATES:
+            label_values = _format_labels((upstream, state), ("upstream", "state"))
+            transitions_lines.append(
+                f"{transitions_name}{{{label_values}}} {transitions.get(state, 0)}"
+            )
+            state_lines.append(
+                f"{state_name}{{{label_values}}} {int(state == current_state)}"
+            )
+
+    return transitions_lines + state_lines
+
+
+def _format_labels(labels: Tuple[str, ...], names=LABEL_NAMES) -> str:
+    values = (
+        value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        for value in labels
+    )
+
+    return ",".join(f'{name}="{value}"' for name, value in zip(names, values))
+
+
+def reset_histograms() -> None:
+    """Forget the values of all the histograms"""
+    with _HISTOGRAMS_LOCK:
+        _HISTOGRAMS.clear()
@@ -16,6 +16,15 @@ class StudioApiClient(BaseOAuthClient):
     Object build an API client to make calls to the Studio service.
     """
 
+    def get_course_run(self, course_id: str) -> Dict[str, Any]:
+        """Get course run details, including its team"""
+
+        response = self.client.get(STUDIO_COURSE_RUNS_ENDPOINT + course_id + "/")
+
+        response.raise_for_status()
+
+        return response.json()
+
     def update_course_run(
         self, course_id: str, course_run_data: Dict[str, Any]
     ) -> Response:
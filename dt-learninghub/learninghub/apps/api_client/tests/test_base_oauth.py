@@ -0,0 +1,194 @@
+""" Tests for the base OAuth api client """
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from learninghub.apps.api_client.base_oauth import BaseOAuthClient, get_oauth_client
+from learninghub.apps.api_client.circuit_breaker import (
+    STATE_CLOSED,
+    STATE_OPEN,
+    CircuitOpenError,
+    get_circuit_breaker,
+)
+from learninghub.apps.api_client.discovery import DiscoveryApiClient
+from learninghub.apps.api_client.lms import LMSApiClient
+from learninghub.apps.api_client.metrics import export_histograms
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import HTTPError, ReadTimeout
+from test_utils.response import MockResponse
+
+
+class BrokenBodyResponse(MockResponse):
+    """Response whose body cannot be read, like a stalled upstream"""
+
+    @property
+    def content(self):
+        raise RequestsConnectionError("Read timed out.")
+
+
+class TestBaseOAuthClient(TestCase):
+    """BaseOAuthClient tests"""
+
+    @mock.patch("learninghub.apps.api_client.base_oauth.OAuthAPIClient")
+    def test_clients_share_one_session(self, mock_oauth_client):
+        """Test that all the API clients reuse the same OAuth session"""
+
+        clients = [BaseOAuthClient(), LMSApiClient(), DiscoveryApiClient()]
+
+        mock_oauth_client.assert_called_once()
+        for client in clients:
+            self.assertIs(client.client, mock_oauth_client.return_value)
+
+    @override_settings(API_CLIENT_POOL_CONNECTIONS=3, API_CLIENT_POOL_MAXSIZE=7)
+    def test_connection_pool_size(self):
+        """Test that the shared session uses the configured connection pool"""
+
+        client = get_oauth_client("http://lms.local", "client-id", "client-secret")
+
+        adapter = client.get_adapter("https://discovery.local/")
+        self.assertEqual(adapter._pool_connections, 3)
+        self.assertEqual(adapter._pool_maxsize, 7)
+
+        self.assertIs(
+            get_oauth_client("http://lms.local", "client-id", "client-secret"), client
+        )
+        self.assertIsNot(
+            get_oauth_client("http://lms.local", "other-id", "client-secret"), client
+        )
+
+    @override_settings(
+        LMS_BASE_URL="http://lms.local",
+        DISCOVERY_SERVICE_API_URL="http://discovery.local/api/v1/",
+        API_CLIENT_CONNECT_TIMEOUT=1,
+        API_CLIENT_READ_TIMEOUT=2,
+        API_CLIENT_TIMEOUTS={"discovery": (1, 20)},
+        API_CLIENT_CIRCUIT_BREAKER_FAILURE_THRESHOLD=2,
+    )
+    @mock.patch("requests.adapters.HTTPAdapter.send")
+    def test_upstream_timeouts_and_circuit_breakers(self, mock_send):
+        """
+        Test that requests get the timeouts of their upstream and fail fast once the
+        upstream keeps failing
+        """
+        client = get_oauth_client("http://lms.local", "client-id", "client-secret")
+        client.auth = None
+        client._ensure_authentication = mock.Mock()
+
+        mock_send.return_value = MockResponse({}, 200)
+        client.get("http://discovery.local/api/v1/course_runs/")
+        self.assertEqual(mock_send.call_args.kwargs["timeout"], (1, 20))
+
+        client.get("http://lms.local/api/user/v1/accounts")
+        self.assertEqual(mock_send.call_args.kwargs["timeout"], (1, 2))
+
+        mock_send.return_value = MockResponse({}, 503)
+        client.get("http://discovery.local/api/v1/course_runs/")
+        mock_send.side_effect = ReadTimeout()
+        with self.assertRaises(ReadTimeout):
+            client.get("http://discovery.local/api/v1/course_runs/")
+
+        mock_send.reset_mock()
+        with self.assertRaises(CircuitOpenError):
+            client.get("http://discovery.local/api/v1/course_runs/")
+        mock_send.assert_not_called()
+
+        # Other upstreams are still called
+        mock_send.side_effect = None
+        mock_send.return_value = MockResponse({}, 200)
+        client.get("http://lms.local/enterprise/api/v1/enterprise-customer/")
+        mock_send.assert_called_once()
+
+        # Rejected calls are not recorded
+        histograms = export_histograms()
+        self.assertIn(
+            'api_client_request_duration_seconds_count{upstream="discovery",'
+            'method="GET",endpoint="/api/v1/course_runs/",status="error"} 1',
+            histograms,
+        )
+        self.assertIn(
+            'api_client_request_duration_seconds_count{upstream="discovery",'
+            'method="GET",endpoint="/api/v1/course_runs/",status="503"} 1',
+            histograms,
+        )
+
+    @override_settings(
+        LMS_BASE_URL="http://lms.local",
+        API_CLIENT_CIRCUIT_BREAKER_FAILURE_THRESHOLD=1,
+        API_CLIENT_CIRCUIT_BREAKER_RESET_TIMEOUT=30,
+    )
+    @mock.patch("learninghub.apps.api_client.circuit_breaker.time.monotonic")
+    @mock.patch("requests.adapters.HTTPAdapter.send")
+    def test_half_open_trial_fails_reading_body(self, mock_send, mock_monotonic):
+        """
+        Test that a trial call failing while its body is read opens the circuit
+        again and is recorded as an error, and that the next successful trial
+        closes the circuit
+        """
+        client = get_oauth_client("http://lms.local", "client-id", "client-secret")
+        client.auth = None
+        client._ensure_authentication = mock.Mock()
+        url = "http://lms.local/api/user/v1/accounts"
+        breaker = get_circuit_breaker("lms")
+
+        mock_monotonic.return_value = 100
+        mock_send.side_effect = ReadTimeout()
+        with self.assertRaises(ReadTimeout):
+            client.get(url)
+
+        # The trial call fails while its body is read
+        mock_monotonic.return_value = 130
+        mock_send.side_effect = None
+        mock_send.return_value = BrokenBodyResponse({}, 200)
+        with self.assertRaises(RequestsConnectionError):
+            client.get(url)
+        self.assertEqual(breaker.state, STATE_OPEN)
+        self.assertFalse(breaker.trial_in_progress)
+
+        # Both failures are recorded as calls without a response
+        self.assertIn(
+            'api_client_request_duration_seconds_count{upstream="lms",method="GET",'
+            'endpoint="/api/user/v1/accounts",status="error"} 2',
+            export_histograms(),
+        )
+
+        mock_monotonic.return_value = 160
+        mock_send.return_value = MockResponse({}, 200, content=b"{}")
+        client.get(url)
+        self.assertEqual(breaker.state, STATE_CLOSED)
+        client.get(url)
+
+    @mock.patch("learninghub.apps.api_client.base_oauth.OAuthAPIClient")
+    def test_iter_results_follows_next_links(self, mock_oauth_client):
+        """Test that the results of every page are yielded"""
+        mock_oauth_client.return_value.get.side_effect = [
+            MockResponse(
+                {"results": [{"id": 1}, {"id": 2}], "next": "http://api.local/?page=2"},
+                200,
+            ),
+            MockResponse({"results": [{"id": 3}], "next": None}, 200),
+        ]
+
+        results = BaseOAuthClient().iter_results("http://api.local/", page_size=2)
+
+        self.assertEqual([result["id"] for result in results], [1, 2, 3])
+        mock_oauth_client.return_value.get.assert_has_calls(
+            [
+                mock.call("http://api.local/", params={"page_size": 2}),
+                mock.call("http://api.local/?page=2", params=None),
+            ]
+        )
+
+    @mock.patch("learninghub.apps.api_client.base_oauth.OAuthAPIClient")
+    def test_iter_results_error(self, mock_oauth_client):
+        """Test that a page that cannot be fetched raises an HTTPError"""
+        mock_oauth_client.return_value.get.side_effect = [
+            MockResponse(
+                {"results": [{"id": 1}], "next": "http://api.local/?page=2"}, 200
+            ),
+            MockResponse({}, 500),
+        ]
+
+        results = BaseOAuthClient().iter_results("http://api.local/")
+
+        self.assertEqual(next(results), {"id": 1})
+        with self.assertRaises(HTTPError):
+            next(results)
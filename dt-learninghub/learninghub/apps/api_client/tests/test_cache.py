@@ -0,0 +1,60 @@
+""" Tests for the api client caching helpers """
+from unittest import mock
+
+from django.test import TestCase
+from learninghub.apps.api_client.cache import get_stale_while_revalidate
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+
+class ImmediateThread:
+    """Thread stand-in running its target when started"""
+
+    def __init__(self, target, daemon=None):
+        self.target = target
+
+    def start(self):
+        self.target()
+
+
+@mock.patch("learninghub.apps.api_client.cache.threading.Thread", ImmediateThread)
+class TestStaleWhileRevalidate(TestCase):
+    """get_stale_while_revalidate tests"""
+
+    def _get(self, fetch, timeout=60):
+        return get_stale_while_revalidate("catalog:1", fetch, timeout, 3600)
+
+    def test_fresh_value_is_cached(self):
+        """Test that a fresh value is only fetched once"""
+        fetch = mock.Mock(return_value=["course"])
+
+        self.assertEqual(self._get(fetch), ["course"])
+        self.assertEqual(self._get(fetch), ["course"])
+
+        fetch.assert_called_once()
+
+    def test_stale_value_is_served_while_refreshed(self):
+        """Test that a stale value is returned and refreshed in the background"""
+        self._get(mock.Mock(return_value=["old course"]))
+
+        fetch = mock.Mock(return_value=["new course"])
+
+        self.assertEqual(self._get(fetch, timeout=0), ["old course"])
+        fetch.assert_called_once()
+        self.assertEqual(self._get(mock.Mock()), ["new course"])
+
+    def test_stale_value_is_served_on_error(self):
+        """Test that a stale value is still served if the refresh fails"""
+        self._get(mock.Mock(return_value=["old course"]))
+
+        fetch = mock.Mock(side_effect=RequestsConnectionError)
+
+        self.assertEqual(self._get(fetch, timeout=0), ["old course"])
+        self.assertEqual(self._get(fetch, timeout=0), ["old course"])
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_error_without_cached_value(self):
+        """Test that errors are raised when there is nothing to serve"""
+        fetch = mock.Mock(side_effect=RequestsConnectionError)
+
+        with self.assertRaises(RequestsConnectionError):
+            self._get(fetch)
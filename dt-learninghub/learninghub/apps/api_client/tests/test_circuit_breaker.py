@@ -0,0 +1,80 @@
+""" Tests for the circuit breakers of the API clients """
+from unittest import mock
+
+from django.test import TestCase
+from learninghub.apps.api_client.circuit_breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+@mock.patch("learninghub.apps.api_client.circuit_breaker.increment")
+@mock.patch("learninghub.apps.api_client.circuit_breaker.time.monotonic")
+class TestCircuitBreaker(TestCase):
+    """CircuitBreaker tests"""
+
+    def setUp(self):
+        self.breaker = CircuitBreaker("lms", failure_threshold=2, reset_timeout=30)
+
+    def test_open_after_consecutive_failures(self, mock_monotonic, mock_increment):
+        """Test that the circuit opens after the threshold and fails fast"""
+        mock_monotonic.return_value = 100
+
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.state, STATE_CLOSED)
+
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, STATE_OPEN)
+        mock_increment.assert_called_once_with("api_client.circuit_breaker.lms.open")
+
+        mock_monotonic.return_value = 129
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+    def test_half_open(self, mock_monotonic, mock_increment):
+        """Test that a single trial call is made once the reset timeout is over"""
+        mock_monotonic.return_value = 100
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+        mock_monotonic.return_value = 130
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.state, STATE_HALF_OPEN)
+
+        # Other calls fail fast while the trial call is in progress
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+        # A failed trial opens the circuit again
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, STATE_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+        # A successful trial closes it
+        mock_monotonic.return_value = 160
+        self.breaker.before_call()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, STATE_CLOSED)
+        self.breaker.before_call()
+
+        self.assertEqual(
+            [call.args[0] for call in mock_increment.call_args_list],
+            [
+                "api_client.circuit_breaker.lms.open",
+                "api_client.circuit_breaker.lms.half_open",
+                "api_client.circuit_breaker.lms.open",
+                "api_client.circuit_breaker.lms.half_open",
+                "api_client.circuit_breaker.lms.closed",
+            ],
+        )
+        self.assertEqual(
+            self.breaker.get_stats(),
+            (STATE_CLOSED, {STATE_OPEN: 2, STATE_HALF_OPEN: 2, STATE_CLOSED: 1}),
+        )
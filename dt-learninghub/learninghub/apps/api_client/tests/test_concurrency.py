@@ -0,0 +1,67 @@
+""" Tests for the concurrent calls of the API clients """
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from edx_django_utils.cache import RequestCache
+from edx_django_utils.monitoring import accumulate
+from learninghub.apps.api_client.concurrency import (
+    _get_attributes_cache,
+    fetch_concurrently,
+)
+from learninghub.apps.api_client.metrics import record_call
+
+
+@override_settings(API_CLIENT_MAX_CONCURRENT_REQUESTS=2)
+class TestFetchConcurrently(TestCase):
+    """fetch_concurrently tests"""
+
+    def setUp(self):
+        RequestCache.clear_all_namespaces()
+
+    def tearDown(self):
+        RequestCache.clear_all_namespaces()
+
+    def test_results_in_order(self):
+        """Test that the results follow the items and failed items are left out"""
+
+        def fetch(item):
+            if item == 3:
+                raise ValueError(item)
+            return item * 10
+
+        self.assertEqual(fetch_concurrently(fetch, range(5)), [0, 10, 20, 40])
+
+    @mock.patch("learninghub.apps.api_client.concurrency.accumulate", wraps=accumulate)
+    def test_monitoring_attributes(self, mock_accumulate):
+        """Test that the attributes accumulated by the calls reach the caller"""
+        accumulate("api_client.lms.calls", 1)
+
+        def fetch(item):
+            record_call("lms", "GET", "http://lms.local/api/", 200, item, 0, 0, 0)
+            if item == 3:
+                raise ValueError(item)
+            return item
+
+        fetch_concurrently(fetch, range(5))
+
+        reported = {}
+        for call in mock_accumulate.call_args_list:
+            name, value = call.args
+            reported[name] = reported.get(name, 0) + value
+        self.assertEqual(
+            reported,
+            {
+                "api_client.lms.calls": 5,
+                "api_client.lms.duration_ms": 10000,
+                "api_client.lms.retries": 0,
+                "api_client.lms.request_bytes": 0,
+                "api_client.lms.response_bytes": 0,
+                "api_client.lms.GET /api/.calls": 5,
+                "api_client.lms.GET /api/.duration_ms": 10000,
+            },
+        )
+
+        attributes = _get_attributes_cache().data
+        self.assertEqual(attributes["api_client.lms.calls"], 6)
+        self.assertEqual(attributes["api_client.lms.duration_ms"], 10000)
+        self.assertEqual(attributes["api_client.lms.GET /api/.calls"], 5)
@@ -52,11 +52,11 @@ class TestDiscoveryApiClient(TestCase):
     @ddt.data(
         (
             200,
-            "DiceyTech+EXP001+TEMPLATE",
+            "course-v1:DiceyTech+EXP001+TEMPLATE",
             {
                 "count": 1,
-                "next": "null",
-                "previous": "null",
+                "next": None,
+                "previous": None,
                 "results": [
                     {
                         "key": "course-v1:DiceyTech+EXP001+TEMPLATE",
@@ -87,7 +87,101 @@ class TestDiscoveryApiClient(TestCase):
             expeced_result.get("results")[0].get("run_type"), actual_run_type
         )
 
-    # TODO test_get_course_list
+    @mock.patch("learninghub.apps.api_client.base_oauth.OAuthAPIClient")
+    def test_get_course_run_types(self, mock_oauth_client):
+        """Test that run types are fetched in one request and cached"""
+
+        mock_oauth_client.return_value.get.return_value = MockResponse(
+            {
+                "next": None,
+                "results": [
+                    {"key": "course-v1:DiceyTech+EXP001+TEMPLATE", "run_type": "exp"},
+                    {"key": "course-v1:DiceyTech+BOX001+TEMPLATE", "run_type": "box"},
+                ],
+            },
+            200,
+        )
+        course_keys = [
+            "course-v1:DiceyTech+EXP001+TEMPLATE",
+            "course-v1:DiceyTech+BOX001+TEMPLATE",
+            "course-v1:DiceyTech+UNKNOWN+TEMPLATE",
+        ]
+
+        client = DiscoveryApiClient()
+        run_types = client.get_course_run_types(course_keys)
+
+        expected_run_types = {
+            "course-v1:DiceyTech+EXP001+TEMPLATE": "exp",
+            "course-v1:DiceyTech+BOX001+TEMPLATE": "box",
+        }
+        self.assertEqual(run_types, expected_run_types)
+        mock_oauth_client.return_value.get.assert_called_once_with(
+            mock.ANY, params={"keys": ",".join(course_keys), "page_size": 3}
+        )
+
+        # Only the course run that was not found is looked up again
+        mock_oauth_client.return_value.get.reset_mock()
+        self.assertEqual(client.get_course_run_types(course_keys), expected_run_types)
+        self.assertEqual(
+            client.get_course_run_type("course-v1:DiceyTech+BOX001+TEMPLATE"), "box"
+        )
+        mock_oauth_client.return_value.get.assert_called_once_with(
+            mock.ANY,
+            params={"keys": "course-v1:DiceyTech+UNKNOWN+TEMPLATE", "page_size": 1},
+        )
+
+    @mock.patch("learninghub.apps.api_client.base_oauth.OAuthAPIClient")
+    def test_get_course_list(self, mock_oauth_client):
+        """Test that catalogs are merged in order and a failing catalog is skipped"""
+
+        catalogs = {
+            "results": [
+                {"id": 1, "name": "Starter Pack", "courses_count": 1},
+                {"id": 2, "name": "Creator Pack", "courses_count": 1},
+                {"id": 3, "name": "Maker Pack", "courses_count": 1},
+                {"id": 4, "name": "Other Pack", "courses_count": 1},
+            ]
+        }
+
+        def catalog_courses(key):
+            return {
+                "results": [
+                    {
+                        "course_runs": [
+                            {"key": f"course-v1:DiceyTech+{key}+TEMPLATE"},
+                            {"key": f"course-v1:DiceyTech+{key}+2021"},
+                        ]
+                    }
+                ]
+            }
+
+        responses = {
+            "1/courses": MockResponse(catalog_courses("EXP001"), 200),
+            "2/courses": MockResponse({}, 500),
+            "3/courses": MockResponse(catalog_courses("EXP003"), 200),
+        }
+
+        def get(url, **kwargs):
+            for suffix, response in responses.items():
+                if url.endswith(suffix):
+                    return response
+            return MockResponse(catalogs, 200)
+
+        mock_oauth_client.return_value.get.side_effect = get
+
+        client = DiscoveryApiClient()
+
+        course_list = client.get_course_list()
+
+        self.assertEqual(
+            [course["key"] for course in course_list],
+            [
+                "course-v1:DiceyTech+EXP001+TEMPLATE",
+                "course-v1:DiceyTech+EXP003+TEMPLATE",
+            ],
+        )
+        self.assertEqual(mock_oauth_client.return_value.get.call_count, 4)
+
     """
       "course_runs": [
         {
@@ -9,6 +9,8 @@ from learninghub.apps.api_client.constants import (
     ENTERPRISE_LEARNER_ENDPOINT,
 )
 from learninghub.apps.api_client.enterprise import EnterpriseApiClient
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import HTTPError
 
 no_results = {
     "next": None,
@@ -154,3 +156,68 @@ class TestEnterpriseApiClient(TestCase):
         course_list = client.get_course_list(customer_uuid=customer_uuid)
         print(course_list)
         self.assertEquals(len(course_list), 2)
+
+    @mock.patch("learninghub.apps.api_client.base_oauth.OAuthAPIClient")
+    def test_get_course_list_shares_cached_catalogs(self, mock_api_client):
+        """
+        Test that catalogs shared by schools are only fetched once
+        """
+        catalog_uuid = "9d2db69f-ea9a-49c0-8682-817ce4017a8b"
+        customer = {"results": [{"enterprise_customer_catalogs": [catalog_uuid]}]}
+        catalog = {"results": [{"key": "course-v1:DiceyTech+EXP001+TEMPLATE"}]}
+
+        def get(url, **kwargs):
+            response = mock.Mock()
+            response.json.return_value = catalog if catalog_uuid in url else customer
+            return response
+
+        mock_api_client.return_value.get.side_effect = get
+
+        client = EnterpriseApiClient()
+
+        for _ in range(2):
+            self.assertEqual(len(client.get_course_list(uuid4())), 1)
+            self.assertEqual(len(client.get_course_list(uuid4())), 1)
+
+        # One call per customer and a single call for the shared catalog
+        self.assertEqual(mock_api_client.return_value.get.call_count, 5)
+
+    @mock.patch("learninghub.apps.api_client.base_oauth.OAuthAPIClient")
+    def test_get_course_list_error(self, mock_api_client):
+        """
+        Test that an empty list is returned if the LMS cannot be reached
+        """
+        mock_api_client.return_value.get.side_effect = RequestsConnectionError
+
+        client = EnterpriseApiClient()
+
+        self.assertEqual(client.get_course_list(uuid4()), [])
+
+    @mock.patch("learninghub.apps.api_client.base_oauth.OAuthAPIClient")
+    def test_get_course_list_skips_failing_catalog(self, mock_api_client):
+        """
+        Test that one failing catalog does not drop the courses of the others
+        """
+        catalog_uuids = [str(uuid4()) for _ in range(3)]
+        customer = {"results": [{"enterprise_customer_catalogs": catalog_uuids}]}
+
+        def get(url, **kwargs):
+            response = mock.Mock()
+            if catalog_uuids[1] in url:
+                response.raise_for_status.side_effect = HTTPError
+            elif catalog_uuids[0] in url:
+                response.json.return_value = {"results": [{"key": "EXP001"}]}
+            elif catalog_uuids[2] in url:
+                response.json.return_value = {"results": [{"key": "EXP003"}]}
+            else:
+                response.json.return_value = customer
+            return response
+
+        mock_api_client.return_value.get.side_effect = get
+
+        client = EnterpriseApiClient()
+        course_list = client.get_course_list(uuid4())
+
+        self.assertEqual(
+            [course["key"] for course in course_list], ["EXP001", "EXP003"]
+        )
@@ -3,6 +3,7 @@ from unittest import mock
 
 import ddt
 from django.test import TestCase
+from edx_django_utils.cache import TieredCache
 from learninghub.apps.api_client.lms import LMSApiClient
 from test_utils.response import MockResponse
 
@@ -11,6 +12,10 @@ from test_utils.response import MockResponse
 class TestLMSApiClient(TestCase):
     """LMSApiClient Tests"""
 
+    def setUp(self) -> None:
+        super().setUp()
+        TieredCache.dangerous_clear_all_tiers()
+
     @ddt.data(
         (
             ["course-v1:DiceyTech+DT002+Y7Computing_092021"],
@@ -61,3 +66,131 @@ class TestLMSApiClient(TestCase):
         )
 
         mock_oauth_client.return_value.post.assert_called_once()
+
+    @mock.patch("learninghub.apps.api_client.base_oauth.OAuthAPIClient")
+    def test_get_user_identity_is_cached(self, mock_oauth_client):
+        """Test that the user identity is only fetched once from the LMS"""
+
+        mock_oauth_client.return_value.get.return_value = MockResponse(
+            [{"id": 7, "username": "student1", "email": "student1@school1.co.uk"}],
+            200,
+        )
+
+        client = LMSApiClient()
+
+        for _ in range(3):
+            identity = client.get_user_identity("student1@school1.co.uk")
+            self.assertEqual(identity, {"id": 7, "username": "student1"})
+
+        # A new client in another request reuses the cached identity
+        self.assertEqual(
+            LMSApiClient().get_user_identity("Student1@school1.co.uk"),
+            {"id": 7, "username": "student1"},
+        )
+
+        mock_oauth_client.return_value.get.assert_called_once()
+
+    @mock.patch("learninghub.apps.api_client.base_oauth.OAuthAPIClient")
+    def test_get_user_identity_unknown_email(self, mock_oauth_client):
+        """Test that unknown emails are cached but failed lookups are not"""
+
+        mock_oauth_client.return_value.get.return_value = MockResponse([], 200)
+
+        client = LMSApiClient()
+
+        self.assertEqual(client.get_user_identity("unknown@school1.co.uk"), {})
+        self.assertEqual(client.get_user_identity("unknown@school1.co.uk"), {})
+        self.assertEqual(mock_oauth_client.return_value.get.call_count, 1)
+
+        mock_oauth_client.return_value.get.return_value = MockResponse([], 503)
+
+        self.assertEqual(client.get_user_identity("other@school1.co.uk"), {})
+        self.assertEqual(client.get_user_identity("other@school1.co.uk"), {})
+        self.assertEqual(mock_oauth_client.return_value.get.call_count, 3)
+
+    @mock.patch("learninghub.apps.api_client.lms.LMS_USER_LOOKUP_BATCH_SIZE", 2)
+    @mock.patch("learninghub.apps.api_client.base_oauth.OAuthAPIClient")
+    def test_get_users_details_in_batches(self, mock_oauth_client):
+        """Test that users are looked up in chunks and missing users are marked"""
+
+        mock_oauth_client.return_value.get.side_effect = [
+            MockResponse(
+                [
+                    {
+                        "id": 1,
+                        "username": "student1",
+                        "email": "student1@school1.co.uk",
+                    },
+                    {
+                        "id": 2,
+                        "username": "student2",
+                        "email": "student2@school1.co.uk",
+                    },
+                ],
+                200,
+            ),
+            MockResponse([], 200),
+        ]
+
+        client = LMSApiClient()
+
+        details = client.get_users_details(
+            emails=[
+                "student1@school1.co.uk",
+                "Student2@school1.co.uk",
+                "unknown@school1.co.uk",
+                "student1@school1.co.uk",
+            ]
+        )
+
+        self.assertEqual(mock_oauth_client.return_value.get.call_count, 2)
+        mock_oauth_client.return_value.get.assert_any_call(
+            mock.ANY,
+            params={"email": "student1@school1.co.uk,Student2@school1.co.uk"},
+        )
+        self.assertEqual(details["student1@school1.co.uk"]["id"], 1)
+        self.assertEqual(details["Student2@school1.co.uk"]["id"], 2)
+        self.assertIsNone(details["unknown@school1.co.uk"])
+
+    @ddt.data(
+        ("user_ids", "lms_user_id", [1, 2], "id"),
+        ("usernames", "username", ["student1", "student2"], "username"),
+    )
+    @ddt.unpack
+    @mock.patch("learninghub.apps.api_client.base_oauth.OAuthAPIClient")
+    def test_get_users_details_by_identifier(
+        self, argument, param, identifiers, field, mock_oauth_client
+    ):
+        """Test that users can be looked up by LMS user ID or username"""
+
+        users = [
+            {"id": 1, "username": "student1"},
+            {"id": 2, "username": "student2"},
+        ]
+        mock_oauth_client.return_value.get.return_value = MockResponse(users, 200)
+
+        details = LMSApiClient().get_users_details(**{argument: identifiers})
+
+        mock_oauth_client.return_value.get.assert_called_once_with(
+            mock.ANY,
+            params={param: ",".join(str(identifier) for identifier in identifiers)},
+        )
+        self.assertEqual(
+            [details[identifier][field] for identifier in identifiers], identifiers
+        )
+
+    @mock.patch("learninghub.apps.api_client.base_oauth.OAuthAPIClient")
+    def test_get_usernames_skips_unknown_users(self, mock_oauth_client):
+        """Test that one unknown email does not drop the other usernames"""
+
+        mock_oauth_client.return_value.get.return_value = MockResponse(
+            [{"id": 1, "username": "teacher1", "email": "teacher1@school1.co.uk"}],
+            200,
+        )
+
+        usernames = LMSApiClient().get_usernames(
+            ["teacher1@school1.co.uk", "unknown@school1.co.uk"]
+        )
+
+        self.assertEqual(usernames, ["teacher1"])
+        mock_oauth_client.return_value.get.assert_called_once()
@@ -0,0 +1,97 @@
+""" Tests for the instrumentation of the API clients """
+from unittest import mock
+
+import ddt
+from django.test import TestCase
+from learninghub.apps.api_client.circuit_breaker import get_circuit_breaker
+from learninghub.apps.api_client.metrics import (
+    export_histograms,
+    get_endpoint,
+    record_call,
+)
+
+
+@ddt.ddt
+class TestMetrics(TestCase):
+    """API client metrics tests"""
+
+    @ddt.data(
+        ("http://lms.local/api/user/v1/accounts?email=a@b.c", "/api/user/v1/accounts"),
+        (
+            "http://cms.local/api/v1/course_runs/course-v1:DiceyTech+BOX001+1/",
+            "/api/v1/course_runs/{id}/",
+        ),
+        (
+            "http://lms.local/enterprise/api/v1/enterprise_catalogs/"
+            "1cfaba8e-16c2-4342-addd-4937b38c05ce/",
+            "/enterprise/api/v1/enterprise_catalogs/{id}/",
+        ),
+        (
+            "http://discovery.local/api/v1/catalogs/12/courses",
+            "/api/v1/catalogs/{id}/courses",
+        ),
+    )
+    @ddt.unpack
+    def test_get_endpoint(self, url, expected_endpoint):
+        """Test that the identifiers are removed from the endpoints"""
+        self.assertEqual(get_endpoint(url), expected_endpoint)
+
+    @mock.patch("learninghub.apps.api_client.metrics.accumulate")
+    def test_record_call(self, mock_accumulate):
+        """Test that calls are reported to monitoring and added to the histograms"""
+        url = "http://discovery.local/api/v1/course_runs/"
+
+        record_call("discovery", "POST", url, 201, 0.3, 100, 2000, 1)
+        record_call("discovery", "POST", url, None, 3, 100, 0, 0)
+
+        attributes = {}
+        for call in mock_accumulate.call_args_list:
+            name, value = call.args
+            attributes[name] = attributes.get(name, 0) + value
+
+        self.assertEqual(
+            attributes,
+            {
+                "api_client.discovery.calls": 2,
+                "api_client.discovery.duration_ms": 3300,
+                "api_client.discovery.retries": 1,
+                "api_client.discovery.request_bytes": 200,
+                "api_client.discovery.response_bytes": 2000,
+                "api_client.discovery.errors": 1,
+                "api_client.discovery.POST /api/v1/course_runs/.calls": 2,
+                "api_client.discovery.POST /api/v1/course_runs/.duration_ms": 3300,
+            },
+        )
+
+        labels = 'upstream="discovery",method="POST",endpoint="/api/v1/course_runs/"'
+        histograms = export_histograms().splitlines()
+        for line in (
+            "# TYPE api_client_request_duration_seconds histogram",
+            f'api_client_request_duration_seconds_bucket{{{labels},status="201",le="0.25"}} 0',
+            f'api_client_request_duration_seconds_bucket{{{labels},status="201",le="0.5"}} 1',
+            f'api_client_request_duration_seconds_bucket{{{labels},status="201",le="+Inf"}} 1',
+            f'api_client_request_duration_seconds_sum{{{labels},status="201"}} 0.3',
+            f'api_client_response_size_bytes_count{{{labels},status="error"}} 1',
+            f'api_client_request_retries_sum{{{labels},status="201"}} 1.0',
+        ):
+            self.assertIn(line, histograms)
+
+    @mock.patch("learninghub.apps.api_client.circuit_breaker.increment")
+    def test_export_circuit_breakers(self, mock_increment):
+        """Test that the transitions and state of the circuit breakers are exported"""
+        breaker = get_circuit_breaker("lms")
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        get_circuit_breaker("studio")
+
+        metrics = export_histograms().splitlines()
+        for line in (
+            "# TYPE api_client_circuit_breaker_transitions_total counter",
+            'api_client_circuit_breaker_transitions_total{upstream="lms",state="open"} 1',
+            'api_client_circuit_breaker_transitions_total{upstream="lms",state="closed"} 0',
+            "# TYPE api_client_circuit_breaker_state gauge",
+            'api_client_circuit_breaker_state{upstream="lms",state="open"} 1',
+            'api_client_circuit_breaker_state{upstream="lms",state="closed"} 0',
+            'api_client_circuit_breaker_state{upstream="studio",state="closed"} 1',
+        ):
+            self.assertIn(line, metrics)
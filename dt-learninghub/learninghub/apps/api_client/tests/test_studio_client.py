@@ -58,3 +58,18 @@ class TestSutdioApiClient(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.json(), expected_response_body)
+
+    @mock.patch("learninghub.apps.api_client.base_oauth.OAuthAPIClient")
+    def test_get_course_run(self, mock_oauth_client):
+        """Get a course run with its team"""
+        course_run = {
+            "id": "course-v1:DiceyTech+EXP003+Y11Testers_191021",
+            "team": [{"user": "classroom", "role": "instructor"}],
+        }
+        mock_oauth_client.return_value.get.return_value = MockResponse(
+            course_run, status.HTTP_200_OK
+        )
+
+        response = StudioApiClient().get_course_run(course_run["id"])
+
+        self.assertEqual(response, course_run)
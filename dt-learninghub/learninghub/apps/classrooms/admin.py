@@ -8,6 +8,9 @@ from learninghub.apps.classrooms.models import (
     ClassroomFeatureRole,
     ClassroomRoleAssignment,
     CourseAssignment,
+    CourseAssignmentJob,
+    CourseRunProvision,
+    PooledCourseRun,
 )
 
 
@@ -48,6 +51,48 @@ class CourseAssignmentAdmin(admin.ModelAdmin):
     search_fields = ["course_id"]
 
 
+@admin.register(CourseAssignmentJob)
+class CourseAssignmentJobAdmin(admin.ModelAdmin):
+    """Admin configuration for the CourseAssignmentJob model."""
+
+    list_display = [
+        "uuid",
+        "course_id",
+        "classroom_instance",
+        "status",
+        "attempts",
+        "modified",
+    ]
+    list_filter = ["status"]
+    search_fields = ["course_id"]
+
+
+@admin.register(CourseRunProvision)
+class CourseRunProvisionAdmin(admin.ModelAdmin):
+    """Admin configuration for the CourseRunProvision model."""
+
+    list_display = [
+        "template_course_id",
+        "course_id",
+        "classroom_instance",
+        "modified",
+    ]
+    search_fields = ["template_course_id", "course_id"]
+
+
+@admin.register(PooledCourseRun)
+class PooledCourseRunAdmin(admin.ModelAdmin):
+    """Admin configuration for the PooledCourseRun model."""
+
+    list_display = [
+        "course_id",
+        "template_course_id",
+        "classroom_instance",
+        "created",
+    ]
+    search_fields = ["template_course_id", "course_id"]
+
+
 @admin.register(ClassroomFeatureRole)
 class ClassroomFeatureRoleAdmin(admin.ModelAdmin):
     pass
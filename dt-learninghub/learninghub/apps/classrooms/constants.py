@@ -3,6 +3,8 @@
 DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
 DATE_FORMAT = "%d%m%y"
 COURSE_RUN_FORMAT = "%Y%m%d%H%M%S%f"
+# Run of the courses used as templates to create the classroom course runs
+TEMPLATE_COURSE_RUN = "TEMPLATE"
 
 SCHOOL_TERM = {
     1: "SPRING",
@@ -19,3 +21,35 @@ SYSTEM_ENTERPRISE_LEARNER_ROLE = "enterprise_learner"
 SYSTEM_ENTERPRISE_OPERATOR_ROLE = "enterprise_openedx_operator"
 
 CLASSROOM_TEACHER_ACCESS_PERMISSION = "classroom.has_teacher_acces"
+
+# Bulk enrollment outcomes
+ENROLLMENT_STATUS_ENROLLED = "enrolled"
+ENROLLMENT_STATUS_ALREADY_ENROLLED = "already_enrolled"
+ENROLLMENT_STATUS_DUPLICATE = "duplicate"
+ENROLLMENT_STATUS_INVALID = "invalid"
+ENROLLMENT_STATUS_UNKNOWN_CLASSROOM = "unknown_classroom"
+
+# Course assignment provisioning jobs
+JOB_STATUS_PENDING = "pending"
+JOB_STATUS_RUNNING = "running"
+JOB_STATUS_DONE = "done"
+JOB_STATUS_FAILED = "failed"
+JOB_MAX_ATTEMPTS = 3
+# Running jobs not updated for this long are considered abandoned by their worker
+JOB_STALE_AFTER_SECONDS = 60 * 15
+
+# Pooled course runs older than this are not assigned anymore, their dates would be
+# out of date
+COURSE_RUN_POOL_MAX_AGE = 60 * 60 * 24 * 7
+
+# Roster exports
+ROSTER_FORMAT_CSV = "csv"
+ROSTER_FORMAT_NDJSON = "ndjson"
+ROSTER_CONTENT_TYPES = {
+    ROSTER_FORMAT_CSV: "text/csv",
+    ROSTER_FORMAT_NDJSON: "application/x-ndjson",
+}
+# Number of enrollments fetched from the database at a time
+ROSTER_CHUNK_SIZE = 2000
+# Number of roster rows enrolled at a time when importing a file
+ROSTER_IMPORT_CHUNK_SIZE = 500
@@ -0,0 +1,76 @@
+""" Abstraction layer to handle the implementation details for classroom counters """
+import logging
+
+from django.db import transaction
+from django.db.models import Count, Q
+from learninghub.apps.classrooms.models import Classroom
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FIELDS = Classroom.COUNTER_FIELDS
+
+
+def repair_counters(batch_size: int = 500) -> int:
+    """
+    Recompute the enrollment and assignment counters of all the classrooms.
+
+    Classrooms are processed in batches of `batch_size`, each batch is counted with
+    one query and updated in its own transaction.
+
+    Returns the number of classrooms whose counters were wrong.
+    """
+    repaired = 0
+    last_uuid = None
+
+    while True:
+        classrooms = Classroom.objects.order_by("uuid")
+        if last_uuid is not None:
+            classrooms = classrooms.filter(uuid__gt=last_uuid)
+
+        batch = list(classrooms.values_list("uuid", flat=True)[:batch_size])
+        if not batch:
+            break
+
+        repaired += _repair_batch(batch)
+        last_uuid = batch[-1]
+
+        logger.debug(f"Recomputed the counters of {len(batch)} classroom(s)")
+
+    return repaired
+
+
+def _repair_batch(classroom_uuids) -> int:
+    """Recompute the counters of the classrooms provided"""
+    with transaction.atomic():
+        classrooms = list(
+            Classroom.objects.select_for_update()
+            .filter(uuid__in=classroom_uuids)
+            .annotate(
+                actual_learner_count=Count(
+                    "classroomenrollment",
+                    filter=Q(classroomenrollment__staff=False),
+                    distinct=True,
+                ),
+                actual_staff_count=Count(
+                    "classroomenrollment",
+                    filter=Q(classroomenrollment__staff=True),
+                    distinct=True,
+                ),
+                actual_assignment_count=Count("courseassignment", distinct=True),
+            )
+        )
+
+        stale_classrooms = []
+        for classroom in classrooms:
+            counters = {
+                field: getattr(classroom, f"actual_{field}") for field in COUNTER_FIELDS
+            }
+
+            if any(getattr(classroom, field) != counters[field] for field in counters):
+                for field, value in counters.items():
+                    setattr(classroom, field, value)
+                stale_classrooms.append(classroom)
+
+        Classroom.objects.bulk_update(stale_classrooms, COUNTER_FIELDS)
+
+    return len(stale_classrooms)
@@ -1,10 +1,10 @@
 """ Abstraction layer to handle the implementation details for listing available courses """
 import logging
-from typing import List
+from typing import Any, Dict, Iterable, List
 
 from learninghub.apps.api_client.enterprise import EnterpriseApiClient
 from learninghub.apps.classrooms.models import CourseAssignment
-from opaque_keys.edx.keys import CourseKey
+from learninghub.apps.core.utils import parse_course_key
 
 logger = logging.getLogger(__name__)
 
@@ -14,30 +14,40 @@ def get_course_list(classroom_uuid: str, enterprise_uuid: str) -> List:
     """Return a list of template courses"""
     client = EnterpriseApiClient()
 
-    return _filter_course_list(classroom_uuid, client.get_course_list(enterprise_uuid))
-
-
-def _filter_course_list(classroom_uuid: str, course_list: List) -> List:
-    """Filter out the courses that are already assigned"""
-    logger.debug(f"Filter course list with {len(course_list)} courses")
-
-    assignments = CourseAssignment.objects.filter(
-        classroom_instance__uuid=classroom_uuid
+    return _filter_course_list(classroom_uuid, client.iter_course_list(enterprise_uuid))
+
+
+def _filter_course_list(
+    classroom_uuid: str, course_list: Iterable[Dict[str, Any]]
+) -> List:
+    """
+    Filter out the courses that are already assigned.
+
+    Courses are matched on their org and course code, so a course is filtered out
+    whatever the run of the assignment. `course_list` is consumed as a stream, so it
+    can be a generator over the pages of a catalog.
+    """
+    assigned_courses = {
+        (key.org, key.course)
+        for key in map(
+            parse_course_key,
+            CourseAssignment.objects.filter(
+                classroom_instance__uuid=classroom_uuid
+            ).values_list("course_id", flat=True),
+        )
+    }
+
+    logger.debug(
+        f"Filter course list in classroom with {len(assigned_courses)} assigned courses"
     )
 
-    logger.debug(f"In classroom with {len(assignments)} assignments")
-
-    for assignment in assignments:
-        existing_assignment_key = CourseKey.from_string(assignment.course_id)
-
-        for listed_course in course_list:
-            key = CourseKey.from_string(listed_course.get("key"))
+    filtered_course_list = []
 
-            if key.course == existing_assignment_key.course:
-                course_list.remove(listed_course)
+    for listed_course in course_list:
+        key = parse_course_key(listed_course.get("key"))
 
-        if len(course_list) == 0:
-            break
+        if (key.org, key.course) not in assigned_courses:
+            filtered_course_list.append(listed_course)
 
-    logger.debug(f"Filtered list has {len(course_list)} course(s)")
-    return course_list
+    logger.debug(f"Filtered list has {len(filtered_course_list)} course(s)")
+    return filtered_course_list
@@ -0,0 +1,66 @@
+""" Abstraction layer to handle the implementation details for the pool of course runs """
+import logging
+from typing import Dict, Optional
+
+from django.conf import settings
+from learninghub.apps.api_client.discovery import DiscoveryApiClient
+from learninghub.apps.classrooms.course_runs import (
+    create_course_run,
+    is_template_course,
+)
+from learninghub.apps.classrooms.models import PooledCourseRun
+from requests.exceptions import RequestException
+
+logger = logging.getLogger(__name__)
+
+
+def fill_course_run_pool(template_course_id: str, size: int) -> int:
+    """
+    Create course runs from the template until `size` of them are available.
+
+    Returns the number of course runs created.
+    """
+    if not is_template_course(template_course_id):
+        logger.warning(f"Cannot pool course runs of {template_course_id}")
+        return 0
+
+    missing = size - PooledCourseRun.available(template_course_id).count()
+    created = 0
+
+    for _ in range(missing):
+        course_id = create_course_run(template_course_id)
+
+        PooledCourseRun.objects.create(
+            template_course_id=template_course_id, course_id=course_id
+        )
+        created += 1
+
+    if created:
+        logger.info(f"Pooled {created} course run(s) of {template_course_id}")
+
+    return created
+
+
+def fill_course_run_pools(sizes: Optional[Dict[str, int]] = None) -> int:
+    """
+    Fill the pool of each template course, `COURSE_RUN_POOL_SIZES` by default.
+
+    A template whose course runs cannot be created does not stop the others.
+    Returns the number of course runs created.
+    """
+    sizes = settings.COURSE_RUN_POOL_SIZES if sizes is None else sizes
+    created = 0
+
+    # Cache the run types of all the templates with a single request
+    try:
+        DiscoveryApiClient().get_course_run_types(list(sizes))
+    except RequestException as exc:
+        logger.warning(f"Could not get the run types of the templates: {exc}")
+
+    for template_course_id, size in sizes.items():
+        try:
+            created += fill_course_run_pool(template_course_id, size)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception(f"Could not fill the pool of {template_course_id}")
+
+    return created
@@ -1,14 +1,18 @@
 """ Abstraction layer to handle the implementation details for course runs """
 import logging
 from datetime import datetime, timedelta
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from learninghub.apps.api_client.discovery import DiscoveryApiClient
 from learninghub.apps.api_client.lms import LMSApiClient
 from learninghub.apps.api_client.studio import StudioApiClient
-from learninghub.apps.classrooms.constants import COURSE_RUN_FORMAT, DATETIME_FORMAT
+from learninghub.apps.classrooms.constants import (
+    COURSE_RUN_FORMAT,
+    DATETIME_FORMAT,
+    TEMPLATE_COURSE_RUN,
+)
+from learninghub.apps.core.utils import parse_course_key
 from opaque_keys import InvalidKeyError
-from opaque_keys.edx.keys import CourseKey
 
 logger = logging.getLogger(__name__)
 
@@ -19,22 +23,43 @@ def _calculate_course_run_key_run_value(create_at: datetime) -> str:
     return create_at.strftime(COURSE_RUN_FORMAT)
 
 
-# TODO Add tests
-def create_course_run(template_course_id: str) -> str:
-    """Create a course run"""
+def new_course_run_term() -> str:
+    """Generate the term of a new course run, which is the run of its key"""
+    return _calculate_course_run_key_run_value(datetime.today())
+
+
+def is_template_course(course_id: str) -> bool:
+    """Return whether the course is a template used to create course runs"""
+    try:
+        return parse_course_key(course_id).run == TEMPLATE_COURSE_RUN
+    except InvalidKeyError:
+        return False
+
+
+def create_course_run(
+    template_course_id: str, term: Optional[str] = None, reuse_existing: bool = False
+) -> str:
+    """
+    Create a course run from a template course and return its key.
+
+    The run of the key is `term`, generated from the current time if not provided.
+    With `reuse_existing`, a course run already created with the same term, by an
+    attempt that failed before it completed, is reused instead of creating another.
+    """
 
     start = datetime.today()
     end = start + timedelta(days=90)
 
-    run = _calculate_course_run_key_run_value(start)
+    run = term or _calculate_course_run_key_run_value(start)
 
     try:
-        course = CourseKey.from_string(template_course_id)
+        course = parse_course_key(template_course_id)
         # If the course is not a template then link it directly to the classroom
-        if course.run != "TEMPLATE":
+        if course.run != TEMPLATE_COURSE_RUN:
             return template_course_id
     except InvalidKeyError:
         logger.error(f"Course key {template_course_id} is not recognised.")
+        raise
 
     course_data = {
         "start": start.strftime(DATETIME_FORMAT),
@@ -48,14 +73,21 @@ def create_course_run(template_course_id: str) -> str:
 
     client = DiscoveryApiClient()
 
-    # First we need to get the UUID of the run type
-    # associated with the course that we use as template
-    run_type = client.get_course_run_type(template_course_id)
+    response = None
+    if reuse_existing:
+        response = client.get_course_run(str(course.replace(run=run)))
+
+    if response is None:
+        # First we need to get the UUID of the run type
+        # associated with the course that we use as template
+        run_type = client.get_course_run_type(template_course_id)
 
-    course_data["run_type"] = run_type
+        course_data["run_type"] = run_type
 
-    # Create the course a course rerun from the template
-    response = client.create_course_run(course_data)
+        # Create the course a course rerun from the template
+        response = client.create_course_run(course_data)
+    else:
+        logger.info(f"Reuse course run {response.get('key')}")
 
     # When creating a course rerun, the dates are not published
     # A staff member would have to update the Schedule from studio
@@ -0,0 +1,222 @@
+""" Abstraction layer to handle the implementation details for classroom enrollments """
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from learninghub.apps.api_client.lms import LMSApiClient
+from learninghub.apps.classrooms.constants import (
+    ENROLLMENT_STATUS_ALREADY_ENROLLED,
+    ENROLLMENT_STATUS_DUPLICATE,
+    ENROLLMENT_STATUS_ENROLLED,
+    ENROLLMENT_STATUS_INVALID,
+    ENROLLMENT_STATUS_UNKNOWN_CLASSROOM,
+    ROSTER_IMPORT_CHUNK_SIZE,
+)
+from learninghub.apps.classrooms.models import (
+    Classroom,
+    ClassroomEnrollment,
+    CourseAssignment,
+)
+from learninghub.apps.classrooms.utils import get_lms_user_ids
+
+logger = logging.getLogger(__name__)
+
+
+def bulk_enroll_in_classroom(
+    classroom: Classroom, identifiers: List[str], seen: Optional[Set[str]] = None
+) -> List[Dict[str, str]]:
+    """
+    Enroll a list of learners in a classroom and in all the courses assigned to it.
+
+    The identifiers are deduplicated, their LMS user IDs are resolved in one go and
+    the enrollments are created with a single `bulk_create`. Once the transaction is
+    committed, the new learners are enrolled in the classroom's courses with one
+    `bulk_enroll` call. The learner counter of the classroom is updated in the same
+    transaction.
+
+    `seen` holds the lowercased emails already processed, pass the same set to
+    deduplicate identifiers across several calls.
+
+    Returns a list with the outcome for each identifier, in the order provided.
+    """
+    results = []
+    emails = []
+    seen = set() if seen is None else seen
+
+    for identifier in identifiers:
+        status = ENROLLMENT_STATUS_ENROLLED
+        try:
+            validate_email(identifier)
+        except ValidationError:
+            status = ENROLLMENT_STATUS_INVALID
+
+        if status == ENROLLMENT_STATUS_ENROLLED:
+            if identifier.lower() in seen:
+                status = ENROLLMENT_STATUS_DUPLICATE
+            else:
+                seen.add(identifier.lower())
+                emails.append(identifier)
+
+        results.append({"identifier": identifier, "status": status})
+
+    existing_emails = {
+        email.lower()
+        for email in ClassroomEnrollment.objects.filter(
+            classroom_instance=classroom, user_email__in=emails
+        ).values_list("user_email", flat=True)
+    }
+    emails = [email for email in emails if email.lower() not in existing_emails]
+
+    lms_user_ids = get_lms_user_ids(emails) if emails else {}
+
+    existing_lms_user_ids = set(
+        ClassroomEnrollment.objects.filter(
+            classroom_instance=classroom,
+            lms_user_id__in=[
+                user_id for user_id in lms_user_ids.values() if user_id is not None
+            ],
+        ).values_list("lms_user_id", flat=True)
+    )
+
+    new_enrollments = []
+    for email in emails:
+        lms_user_id = lms_user_ids.get(email)
+        if lms_user_id is not None and lms_user_id in existing_lms_user_ids:
+            existing_emails.add(email.lower())
+            continue
+
+        if lms_user_id is not None:
+            existing_lms_user_ids.add(lms_user_id)
+
+        new_enrollments.append(
+            ClassroomEnrollment(
+                classroom_instance=classroom,
+                user_email=email,
+                lms_user_id=lms_user_id,
+            )
+        )
+
+    for result in results:
+        if (
+            result["status"] == ENROLLMENT_STATUS_ENROLLED
+            and result["identifier"].lower() in existing_emails
+        ):
+            result["status"] = ENROLLMENT_STATUS_ALREADY_ENROLLED
+
+    with transaction.atomic():
+        ClassroomEnrollment.objects.bulk_create(new_enrollments)
+        Classroom.update_counters(classroom.pk, learners=len(new_enrollments))
+
+        new_identifiers = [enrollment.user_email for enrollment in new_enrollments]
+        course_ids = list(
+            CourseAssignment.objects.filter(classroom_instance=classroom).values_list(
+                "course_id", flat=True
+            )
+        )
+
+        if new_identifiers and course_ids:
+            transaction.on_commit(
+                lambda: _enroll_in_courses(course_ids, new_identifiers)
+            )
+
+    logger.info(
+        f"Enrolled {len(new_enrollments)} user(s) in classroom with ID {classroom.uuid}"
+    )
+
+    return results
+
+
+def import_roster(
+    rows: Iterable[Dict[str, str]],
+    classroom: Optional[Classroom] = None,
+    school_uuid: Optional[str] = None,
+    chunk_size: int = ROSTER_IMPORT_CHUNK_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Enroll the learners listed in the rows of a roster file.
+
+    Each row has an `email` column. When importing for a school instead of a
+    classroom, rows also have a `classroom` column with the uuid of a classroom of
+    the school.
+
+    Rows are consumed as a stream and enrolled in chunks of `chunk_size`, with one
+    `bulk_enroll_in_classroom` call per classroom in the chunk. The outcome of each
+    row is yielded once its chunk is processed, in the order of the rows.
+    """
+    classrooms = {}
+    seen = {}
+    chunk = []
+
+    for row_number, row in enumerate(rows, start=1):
+        chunk.append((row_number, row))
+
+        if len(chunk) >= chunk_size:
+            yield from _import_roster_chunk(
+                chunk, classroom, school_uuid, classrooms, seen
+            )
+            chunk = []
+
+    if chunk:
+        yield from _import_roster_chunk(chunk, classroom, school_uuid, classrooms, seen)
+
+
+def _import_roster_chunk(chunk, classroom, school_uuid, classrooms, seen):
+    """Enroll the rows of a chunk, grouped by classroom"""
+    outcomes = []
+    identifiers_by_classroom = {}
+
+    for row_number, row in chunk:
+        identifier = (row.get("email") or "").strip()
+        row_classroom = classroom or _get_school_classroom(
+            school_uuid, (row.get("classroom") or "").strip(), classrooms
+        )
+
+        outcome = {
+            "row": row_number,
+            "identifier": identifier,
+            "classroom": str(row_classroom.uuid) if row_classroom else None,
+            "status": ENROLLMENT_STATUS_UNKNOWN_CLASSROOM,
+        }
+        outcomes.append(outcome)
+
+        if row_classroom is not None:
+            identifiers_by_classroom.setdefault(row_classroom, []).append(outcome)
+
+    for row_classroom, classroom_outcomes in identifiers_by_classroom.items():
+        results = bulk_enroll_in_classroom(
+            row_classroom,
+            [outcome["identifier"] for outcome in classroom_outcomes],
+            seen=seen.setdefault(row_classroom.uuid, set()),
+        )
+
+        for outcome, result in zip(classroom_outcomes, results):
+            outcome["status"] = result["status"]
+
+    return outcomes
+
+
+def _get_school_classroom(
+    school_uuid: Optional[str], classroom_uuid: str, classrooms: Dict
+) -> Optional[Classroom]:
+    """Return the classroom of the school with the uuid provided, or None"""
+    if classroom_uuid not in classrooms:
+        try:
+            classrooms[classroom_uuid] = Classroom.objects.filter(
+                uuid=classroom_uuid, school=school_uuid
+            ).first()
+        except ValidationError:
+            classrooms[classroom_uuid] = None
+
+    return classrooms[classroom_uuid]
+
+
+def _enroll_in_courses(course_ids: List[str], identifiers: List[str]) -> None:
+    """Enroll the learners in all the courses with a single call to the LMS"""
+    client = LMSApiClient()
+
+    try:
+        client.bulk_enroll(courses=course_ids, identifiers=identifiers)
+    except Exception as exc:
+        logger.error(f"Learner enrollment failed: {exc}")
@@ -0,0 +1,145 @@
+""" Abstraction layer to handle the implementation details for course assignment jobs """
+import logging
+from datetime import timedelta
+from typing import Optional
+
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from edx_django_utils.cache import RequestCache
+from learninghub.apps.classrooms.constants import (
+    JOB_MAX_ATTEMPTS,
+    JOB_STALE_AFTER_SECONDS,
+    JOB_STATUS_DONE,
+    JOB_STATUS_FAILED,
+    JOB_STATUS_PENDING,
+    JOB_STATUS_RUNNING,
+)
+from learninghub.apps.classrooms.models import (
+    Classroom,
+    CourseAssignment,
+    CourseAssignmentJob,
+    CourseRunProvision,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_course_assignment(
+    classroom: Classroom, course_id: str
+) -> CourseAssignmentJob:
+    """Queue the assignment of a course to a classroom"""
+    job = CourseAssignmentJob.objects.create(
+        classroom_instance=classroom, course_id=course_id
+    )
+
+    logger.info(
+        f"Queued job {job.uuid} to assign {course_id} to classroom with ID {classroom.uuid}"
+    )
+
+    return job
+
+
+def claim_next_job() -> Optional[CourseAssignmentJob]:
+    """
+    Mark the oldest job waiting to be processed as running and return it.
+
+    Running jobs that have not been updated for `JOB_STALE_AFTER_SECONDS` were
+    abandoned by their worker and are claimed again until they reach
+    `JOB_MAX_ATTEMPTS`. Locked rows are skipped so several workers can run at the
+    same time.
+    """
+    stale_before = timezone.now() - timedelta(seconds=JOB_STALE_AFTER_SECONDS)
+
+    with transaction.atomic():
+        job = (
+            CourseAssignmentJob.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=JOB_STATUS_PENDING)
+                | Q(status=JOB_STATUS_RUNNING, modified__lt=stale_before),
+                attempts__lt=JOB_MAX_ATTEMPTS,
+            )
+            .order_by("created")
+            .first()
+        )
+
+        if job is None:
+            return None
+
+        job.status = JOB_STATUS_RUNNING
+        job.attempts = F("attempts") + 1
+        job.save(update_fields=["status", "attempts", "modified"])
+        job.refresh_from_db(fields=["attempts"])
+
+    return job
+
+
+def run_job(job: CourseAssignmentJob) -> CourseAssignmentJob:
+    """
+    Create the course assignment, which creates the course run and enrolls the
+    classroom members, and record the outcome on the job.
+    """
+    logger.info(f"Start job {job.uuid} (attempt {job.attempts})")
+
+    try:
+        course_run_id = CourseRunProvision.provision(
+            job.classroom_instance_id, job.course_id
+        )
+
+        # The course run of a template already assigned is reused with its assignment
+        assignment, _ = CourseAssignment.objects.get_or_create(
+            classroom_instance_id=job.classroom_instance_id,
+            course_id=course_run_id,
+        )
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.exception(f"Job {job.uuid} failed")
+
+        job.status = JOB_STATUS_FAILED
+        job.error = str(exc)
+        job.save(update_fields=["status", "error", "modified"])
+
+        return job
+
+    job.status = JOB_STATUS_DONE
+    job.course_assignment = assignment
+    job.error = ""
+    job.save(update_fields=["status", "course_assignment", "error", "modified"])
+
+    logger.info(f"Job {job.uuid} assigned {assignment.course_id}")
+
+    return job
+
+
+def process_jobs(max_jobs: Optional[int] = None) -> int:
+    """
+    Process the jobs waiting in the queue, up to `max_jobs`.
+
+    The worker is not a request, so the request cache, which holds the first tier of
+    the `TieredCache`, is cleared and the stale database connections are closed
+    around each job, as the request middleware would do.
+
+    Returns the number of jobs processed.
+    """
+    processed = 0
+
+    while max_jobs is None or processed < max_jobs:
+        _reset_worker_state()
+
+        job = claim_next_job()
+        if job is None:
+            break
+
+        try:
+            run_job(job)
+        finally:
+            _reset_worker_state()
+
+        processed += 1
+
+    return processed
+
+
+def _reset_worker_state() -> None:
+    """Clear the request cache and close the unusable database connections"""
+    RequestCache.clear_all_namespaces()
+    close_old_connections()
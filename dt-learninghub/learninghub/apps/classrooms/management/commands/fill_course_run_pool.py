@@ -0,0 +1,48 @@
+"""
+Worker keeping the pools of course runs filled.
+"""
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from learninghub.apps.classrooms.course_run_pool import fill_course_run_pools
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Create course runs in advance for the template courses of `COURSE_RUN_POOL_SIZES`
+    and refill their pools as the course runs get assigned to classrooms.
+
+    A single worker should be run, concurrent workers could overfill the pools.
+
+    Example:
+        ./manage.py fill_course_run_pool --once
+    """
+
+    help = "Keep the pools of course runs of the popular template courses filled."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Fill the pools then exit.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=30,
+            help="Seconds to wait before checking the pools again.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            created = fill_course_run_pools()
+
+            logger.info(f"Created {created} pooled course run(s)")
+
+            if options["once"]:
+                break
+
+            time.sleep(options["sleep"])
@@ -0,0 +1,61 @@
+"""
+Worker processing the queued course assignment jobs.
+"""
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from learninghub.apps.classrooms.jobs import process_jobs
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Provision the course assignments queued by the API.
+
+    The course runs are created with the LMS, Studio and Discovery API clients, so
+    the worker can be run locally against stub services by pointing `LMS_BASE_URL`,
+    `CMS_BASE_URL` and `DISCOVERY_SERVICE_API_URL` at them.
+
+    Example:
+        ./manage.py process_course_assignment_jobs --once
+    """
+
+    help = "Provision the course assignments queued by the API."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process the jobs waiting in the queue then exit.",
+        )
+        parser.add_argument(
+            "--max-jobs",
+            type=int,
+            default=None,
+            help="Maximum number of jobs to process before exiting.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=5,
+            help="Seconds to wait before polling an empty queue again.",
+        )
+
+    def handle(self, *args, **options):
+        max_jobs = options["max_jobs"]
+        processed = 0
+
+        while max_jobs is None or processed < max_jobs:
+            remaining = None if max_jobs is None else max_jobs - processed
+            count = process_jobs(max_jobs=remaining)
+            processed += count
+
+            if options["once"]:
+                break
+
+            if not count:
+                time.sleep(options["sleep"])
+
+        logger.info(f"Processed {processed} course assignment job(s)")
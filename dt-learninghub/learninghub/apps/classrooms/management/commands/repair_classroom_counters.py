@@ -0,0 +1,36 @@
+"""
+Recompute the denormalized counters of the classrooms.
+"""
+import logging
+
+from django.core.management.base import BaseCommand
+from learninghub.apps.classrooms.counters import repair_counters
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Recompute the learner, staff and assignment counters of every classroom.
+
+    The counters are kept up to date by the enrollment and assignment writes, run
+    this command after writes that bypass the models, like queryset deletes.
+
+    Example:
+        ./manage.py repair_classroom_counters --batch-size 1000
+    """
+
+    help = "Recompute the learner, staff and assignment counters of the classrooms."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of classrooms recomputed in each transaction.",
+        )
+
+    def handle(self, *args, **options):
+        repaired = repair_counters(batch_size=options["batch_size"])
+
+        logger.info(f"Repaired the counters of {repaired} classroom(s)")
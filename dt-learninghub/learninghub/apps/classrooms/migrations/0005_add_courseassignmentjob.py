@@ -0,0 +1,92 @@
+# Generated by Django 3.2.12 on 2026-10-17 21:13
+
+import uuid
+
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("classrooms", "0004_update_classroomenrollment_fields"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CourseAssignmentJob",
+            fields=[
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="created",
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="modified",
+                    ),
+                ),
+                (
+                    "uuid",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "course_id",
+                    models.CharField(
+                        help_text="Unique identifier for the course selected",
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        db_index=True,
+                        default="pending",
+                        max_length=16,
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("error", models.TextField(blank=True, default="")),
+                (
+                    "classroom_instance",
+                    models.ForeignKey(
+                        help_text="The classroom to which the course will be assigned",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="classrooms.classroom",
+                    ),
+                ),
+                (
+                    "course_assignment",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="The course assignment created by this job",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="classrooms.courseassignment",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["created"],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.2.12 on 2026-10-17 21:20
+
+from django.db import migrations, models
+from learninghub.apps.core.db import AddIndexOnline
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("classrooms", "0005_add_courseassignmentjob"),
+    ]
+
+    operations = [
+        AddIndexOnline(
+            model_name="classroom",
+            index=models.Index(
+                fields=["school", "active", "created"],
+                name="classroom_school_active_idx",
+            ),
+        ),
+        AddIndexOnline(
+            model_name="classroomenrollment",
+            index=models.Index(
+                fields=["user_email", "classroom_instance"],
+                name="enrollment_email_classroom_idx",
+            ),
+        ),
+        AddIndexOnline(
+            model_name="classroomenrollment",
+            index=models.Index(
+                fields=["classroom_instance", "staff"],
+                name="enrollment_classroom_staff_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 3.2.12 on 2026-10-17 21:23
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_counters(apps, schema_editor):
+    Classroom = apps.get_model("classrooms", "Classroom")
+
+    classrooms = Classroom.objects.annotate(
+        learners=Count(
+            "classroomenrollment",
+            filter=Q(classroomenrollment__staff=False),
+            distinct=True,
+        ),
+        staff=Count(
+            "classroomenrollment",
+            filter=Q(classroomenrollment__staff=True),
+            distinct=True,
+        ),
+        assignments=Count("courseassignment", distinct=True),
+    )
+
+    for classroom in classrooms.iterator():
+        Classroom.objects.filter(pk=classroom.pk).update(
+            learner_count=classroom.learners,
+            staff_count=classroom.staff,
+            assignment_count=classroom.assignments,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("classrooms", "0006_add_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="classroom",
+            name="assignment_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="classroom",
+            name="learner_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="classroom",
+            name="staff_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
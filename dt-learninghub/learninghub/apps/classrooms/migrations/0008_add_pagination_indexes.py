@@ -0,0 +1,28 @@
+# Generated by Django 3.2.12 on 2026-10-17 21:26
+
+from django.db import migrations, models
+from learninghub.apps.core.db import AddIndexOnline
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("classrooms", "0007_add_classroom_counters"),
+    ]
+
+    operations = [
+        AddIndexOnline(
+            model_name="classroomenrollment",
+            index=models.Index(
+                fields=["classroom_instance", "created", "id"],
+                name="enrollment_classroom_page_idx",
+            ),
+        ),
+        AddIndexOnline(
+            model_name="courseassignment",
+            index=models.Index(
+                fields=["classroom_instance", "created", "id"],
+                name="assignment_classroom_page_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 3.2.12 on 2026-10-17 21:38
+
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("classrooms", "0008_add_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CourseRunProvision",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="created",
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="modified",
+                    ),
+                ),
+                (
+                    "template_course_id",
+                    models.CharField(
+                        help_text="Unique identifier for the template course",
+                        max_length=255,
+                    ),
+                ),
+                ("term", models.CharField(max_length=32)),
+                (
+                    "course_id",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        help_text="Unique identifier for the course run created",
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "classroom_instance",
+                    models.ForeignKey(
+                        help_text="The classroom for which the course run is created",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="classrooms.classroom",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["created"],
+                "unique_together": {("classroom_instance", "template_course_id")},
+            },
+        ),
+    ]
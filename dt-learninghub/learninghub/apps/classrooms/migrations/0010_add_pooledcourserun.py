@@ -0,0 +1,81 @@
+# Generated by Django 3.2.12 on 2026-10-17 21:40
+
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("classrooms", "0009_add_courserunprovision"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PooledCourseRun",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="created",
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="modified",
+                    ),
+                ),
+                (
+                    "template_course_id",
+                    models.CharField(
+                        help_text="Unique identifier for the template course",
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "course_id",
+                    models.CharField(
+                        help_text="Unique identifier for the course run created",
+                        max_length=255,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "classroom_instance",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="The classroom to which the course run was assigned",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="classrooms.classroom",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["created"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="pooledcourserun",
+            index=models.Index(
+                fields=["template_course_id", "classroom_instance", "created"],
+                name="pooled_run_available_idx",
+            ),
+        ),
+    ]
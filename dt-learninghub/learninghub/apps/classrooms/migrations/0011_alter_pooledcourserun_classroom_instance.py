@@ -0,0 +1,25 @@
+# Generated by Django 3.2.12 on 2026-10-17 22:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("classrooms", "0010_add_pooledcourserun"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="pooledcourserun",
+            name="classroom_instance",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="The classroom to which the course run was assigned",
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="classrooms.classroom",
+            ),
+        ),
+    ]
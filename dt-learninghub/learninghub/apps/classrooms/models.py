@@ -2,13 +2,28 @@
 Database models for classroom.
 """
 import logging
+from datetime import timedelta
+from typing import Dict, Optional
 from uuid import uuid4
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, QuerySet
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from edx_rbac.models import UserRole, UserRoleAssignment
 from edx_rbac.utils import ALL_ACCESS_CONTEXT
-from learninghub.apps.classrooms.course_runs import create_course_run
+from learninghub.apps.classrooms.constants import (
+    COURSE_RUN_POOL_MAX_AGE,
+    JOB_STATUS_DONE,
+    JOB_STATUS_FAILED,
+    JOB_STATUS_PENDING,
+    JOB_STATUS_RUNNING,
+)
+from learninghub.apps.classrooms.course_runs import (
+    create_course_run,
+    is_template_course,
+    new_course_run_term,
+)
 from learninghub.apps.classrooms.utils import get_lms_user_id
 from model_utils.models import TimeStampedModel
 
@@ -25,6 +40,9 @@ class Classroom(TimeStampedModel):
         school (UUIDField): Enterprise identification code.
         name (CharField): Display name of the Classroom.
         active (BooleanField):
+        learner_count (PositiveIntegerField): Number of learners enrolled.
+        staff_count (PositiveIntegerField): Number of staff members enrolled.
+        assignment_count (PositiveIntegerField): Number of courses assigned.
     """
 
     class Meta:
@@ -32,6 +50,16 @@ class Classroom(TimeStampedModel):
         verbose_name = _("Classroom")
         verbose_name_plural = _("Classrooms")
         ordering = ["created"]
+        indexes = [
+            # Listing the classrooms of a school
+            models.Index(
+                fields=["school", "active", "created"],
+                name="classroom_school_active_idx",
+            ),
+        ]
+
+    # Only written by `update_counters` and `counters.repair_counters`
+    COUNTER_FIELDS = ["learner_count", "staff_count", "assignment_count"]
 
     uuid = models.UUIDField(primary_key=True, default=uuid4, editable=False)
     school = models.UUIDField(null=False, help_text=_("School uuid."))
@@ -44,6 +72,11 @@ class Classroom(TimeStampedModel):
     # TODO Is it worth using StatusModel for auditing?
     active = models.BooleanField(default=True)
 
+    # Denormalized counters, kept up to date by the enrollment and assignment writes
+    learner_count = models.PositiveIntegerField(default=0, editable=False)
+    staff_count = models.PositiveIntegerField(default=0, editable=False)
+    assignment_count = models.PositiveIntegerField(default=0, editable=False)
+
     def __str__(self) -> str:
         """
         Return a human-readable string representation.
@@ -56,6 +89,51 @@ class Classroom(TimeStampedModel):
         """
         return self.__str__()
 
+    def save(self, *args, **kwargs):
+        """
+        Save the classroom, leaving the counters out when it already exists.
+
+        The counters of an instance loaded earlier are out of date as soon as an
+        enrollment or an assignment is written, saving them would overwrite the
+        increments made in the meantime.
+        """
+        if (
+            not self._state.adding
+            and not args
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+        ):
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def update_counters(
+        cls, classroom_id, learners: int = 0, staff: int = 0, assignments: int = 0
+    ) -> None:
+        """
+        Add the differences provided to the counters of a classroom.
+
+        The counters are updated in the database with F expressions so concurrent
+        writes do not overwrite each other. Call it in the transaction of the write
+        that changes the counts.
+        """
+        counters = {
+            "learner_count": learners,
+            "staff_count": staff,
+            "assignment_count": assignments,
+        }
+        updates = {
+            field: F(field) + delta for field, delta in counters.items() if delta
+        }
+
+        if updates:
+            cls.objects.filter(pk=classroom_id).update(**updates)
+
 
 class ClassroomEnrollment(TimeStampedModel):
     """
@@ -71,6 +149,23 @@ class ClassroomEnrollment(TimeStampedModel):
         unique_together = (("classroom_instance", "lms_user_id"),)
         app_label = "classrooms"
         ordering = ["created"]
+        indexes = [
+            # Covers the lookup of the classrooms a user is enrolled in
+            models.Index(
+                fields=["user_email", "classroom_instance"],
+                name="enrollment_email_classroom_idx",
+            ),
+            # Learners and staff of a classroom
+            models.Index(
+                fields=["classroom_instance", "staff"],
+                name="enrollment_classroom_staff_idx",
+            ),
+            # Pages of the enrollments of a classroom
+            models.Index(
+                fields=["classroom_instance", "created", "id"],
+                name="enrollment_classroom_page_idx",
+            ),
+        ]
 
     classroom_instance = models.ForeignKey(
         Classroom,
@@ -111,7 +206,246 @@ class ClassroomEnrollment(TimeStampedModel):
         if not self.lms_user_id:
             self.lms_user_id = get_lms_user_id(email=self.user_email)
 
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            if self._state.adding:
+                previous_staff = None
+            else:
+                previous_staff = (
+                    ClassroomEnrollment.objects.select_for_update()
+                    .filter(pk=self.pk)
+                    .values_list("staff", flat=True)
+                    .first()
+                )
+
+            super().save(*args, **kwargs)
+
+            if previous_staff is None:
+                Classroom.update_counters(
+                    self.classroom_instance_id, **self._counter_deltas(self.staff, 1)
+                )
+            elif previous_staff != self.staff:
+                Classroom.update_counters(
+                    self.classroom_instance_id,
+                    **self._counter_deltas(previous_staff, -1),
+                    **self._counter_deltas(self.staff, 1),
+                )
+
+    def delete(self, *args, **kwargs):
+        """
+        Delete the enrollment and update the counters of the classroom.
+        """
+        with transaction.atomic():
+            deleted = super().delete(*args, **kwargs)
+
+            Classroom.update_counters(
+                self.classroom_instance_id, **self._counter_deltas(self.staff, -1)
+            )
+
+        return deleted
+
+    @staticmethod
+    def _counter_deltas(staff: bool, delta: int) -> Dict[str, int]:
+        """Return the classroom counter to update for a learner or a staff member"""
+        return {"staff": delta} if staff else {"learners": delta}
+
+
+class PooledCourseRun(TimeStampedModel):
+    """
+    PooledCourseRun is a course run created in advance from a popular template
+    course, with its dates published and the discovery user removed, so that
+    assigning the template to a classroom does not wait for the course run creation.
+
+    Fields:
+        template_course_id (CharField): The template course the run was created from.
+        course_id (CharField): The course run created.
+        classroom_instance (ForeignKey): The classroom the course run was assigned
+            to, empty while it is available. The course run is deleted with the
+            classroom so that it is never assigned twice.
+    """
+
+    class Meta:
+        app_label = "classrooms"
+        ordering = ["created"]
+        indexes = [
+            # Available course runs of a template, oldest first
+            models.Index(
+                fields=["template_course_id", "classroom_instance", "created"],
+                name="pooled_run_available_idx",
+            ),
+        ]
+
+    template_course_id = models.CharField(
+        max_length=255,
+        blank=False,
+        help_text=_("Unique identifier for the template course"),
+    )
+
+    course_id = models.CharField(
+        max_length=255,
+        blank=False,
+        unique=True,
+        help_text=_("Unique identifier for the course run created"),
+    )
+
+    classroom_instance = models.ForeignKey(
+        Classroom,
+        blank=True,
+        null=True,
+        on_delete=models.deletion.CASCADE,
+        help_text=_("The classroom to which the course run was assigned"),
+    )
+
+    def __str__(self) -> str:
+        """
+        Return a human-readable string representation.
+        """
+        return f"<PooledCourseRun {self.course_id} from {self.template_course_id}>"
+
+    def __repr__(self):
+        """
+        Return string representation of the pooled course run.
+        """
+        return self.__str__()
+
+    @classmethod
+    def available(cls, template_course_id: str) -> QuerySet:
+        """
+        Return the course runs of a template that can be assigned, oldest first.
+        Course runs older than `COURSE_RUN_POOL_MAX_AGE` are left out.
+        """
+        created_after = timezone.now() - timedelta(seconds=COURSE_RUN_POOL_MAX_AGE)
+
+        return cls.objects.filter(
+            template_course_id=template_course_id,
+            classroom_instance__isnull=True,
+            created__gt=created_after,
+        ).order_by("created")
+
+    @classmethod
+    def claim(cls, template_course_id: str, classroom_id) -> Optional[str]:
+        """
+        Assign an available course run of the template to the classroom and return
+        its key, or None if the pool of the template is empty.
+
+        Locked rows are skipped so concurrent claims get a course run each.
+        """
+        with transaction.atomic():
+            pooled_course_run = (
+                cls.available(template_course_id)
+                .select_for_update(skip_locked=True)
+                .first()
+            )
+
+            if pooled_course_run is None:
+                return None
+
+            pooled_course_run.classroom_instance_id = classroom_id
+            pooled_course_run.save(update_fields=["classroom_instance", "modified"])
+
+        logger.info(
+            f"Assign pooled course run {pooled_course_run.course_id} to classroom with ID {classroom_id}"
+        )
+
+        return pooled_course_run.course_id
+
+
+class CourseRunProvision(TimeStampedModel):
+    """
+    CourseRunProvision records the course run created from a template course for a
+    classroom, so that a single course run is ever created for them.
+
+    Fields:
+        classroom_instance (ForeignKey): The classroom the course run is created for.
+        template_course_id (CharField): The template course the run is created from.
+        term (CharField): The run of the course run key, chosen before creating it.
+        course_id (CharField): The course run created, empty until it exists.
+    """
+
+    class Meta:
+        unique_together = (("classroom_instance", "template_course_id"),)
+        app_label = "classrooms"
+        ordering = ["created"]
+
+    classroom_instance = models.ForeignKey(
+        Classroom,
+        blank=False,
+        null=False,
+        on_delete=models.deletion.CASCADE,
+        help_text=_("The classroom for which the course run is created"),
+    )
+
+    template_course_id = models.CharField(
+        max_length=255,
+        blank=False,
+        help_text=_("Unique identifier for the template course"),
+    )
+
+    term = models.CharField(max_length=32, blank=False)
+
+    course_id = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        help_text=_("Unique identifier for the course run created"),
+    )
+
+    def __str__(self) -> str:
+        """
+        Return a human-readable string representation.
+        """
+        return f"<CourseRunProvision of {self.template_course_id} for classroom with ID {self.classroom_instance_id}>"
+
+    def __repr__(self):
+        """
+        Return string representation of the provision.
+        """
+        return self.__str__()
+
+    @classmethod
+    def provision(cls, classroom_id, template_course_id: str) -> str:
+        """
+        Return the course run of the classroom for a template course, creating it
+        if it does not exist yet. Courses that are not templates are returned as is.
+
+        A course run available in the pool of the template is used when there is
+        one, see `PooledCourseRun`. Otherwise the provision row is locked while the
+        course run is created, so concurrent calls wait for the creation in progress
+        and reuse its course run. When a previous attempt failed, the course run it
+        may have created in Discovery before failing is looked up by its key and
+        reused.
+        """
+        if not is_template_course(template_course_id):
+            return create_course_run(template_course_id)
+
+        provision, created = cls.objects.get_or_create(
+            classroom_instance_id=classroom_id,
+            template_course_id=template_course_id,
+            defaults={"term": new_course_run_term()},
+        )
+
+        with transaction.atomic():
+            provision = cls.objects.select_for_update().get(pk=provision.pk)
+
+            if not provision.course_id:
+                if created:
+                    provision.course_id = (
+                        PooledCourseRun.claim(template_course_id, classroom_id) or ""
+                    )
+
+                if not provision.course_id:
+                    provision.course_id = create_course_run(
+                        template_course_id,
+                        term=provision.term,
+                        reuse_existing=not created,
+                    )
+
+                provision.save(update_fields=["course_id", "modified"])
+            else:
+                logger.info(
+                    f"Reuse course run {provision.course_id} for classroom with ID {classroom_id}"
+                )
+
+        return provision.course_id
 
 
 class CourseAssignment(TimeStampedModel):
@@ -128,6 +462,13 @@ class CourseAssignment(TimeStampedModel):
         unique_together = (("classroom_instance", "course_id"),)
         app_label = "classrooms"
         ordering = ["created"]
+        indexes = [
+            # Pages of the assignments of a classroom
+            models.Index(
+                fields=["classroom_instance", "created", "id"],
+                name="assignment_classroom_page_idx",
+            ),
+        ]
 
     course_id = models.CharField(
         max_length=255,
@@ -158,18 +499,107 @@ class CourseAssignment(TimeStampedModel):
     def save(self, *args, **kwargs):
         """
         Create a new course run from the course ID selected and assign the new course to the
-        classroom.
+        classroom. The course run already created for the classroom from the same
+        template is reused, see `CourseRunProvision.provision`.
         """
-        # TODO Check if course run exist
-
         # If the assignment already exist just update it
         if self.pk is not None:
             super().save(*args, **kwargs)
             return
 
-        self.course_id = create_course_run(self.course_id)
+        self.course_id = CourseRunProvision.provision(
+            self.classroom_instance_id, self.course_id
+        )
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
-        super().save(*args, **kwargs)
+            Classroom.update_counters(self.classroom_instance_id, assignments=1)
+
+    def delete(self, *args, **kwargs):
+        """
+        Delete the assignment and update the counters of the classroom.
+        """
+        with transaction.atomic():
+            deleted = super().delete(*args, **kwargs)
+
+            Classroom.update_counters(self.classroom_instance_id, assignments=-1)
+
+        return deleted
+
+
+class CourseAssignmentJob(TimeStampedModel):
+    """
+    CourseAssignmentJob queues the provisioning of a course assignment so that the
+    course run is created by a worker instead of during the request.
+
+    Fields:
+        uuid (UUIDField, PRIMARY KEY): Job identification code.
+        classroom_instance (ForeignKey): The classroom the course is assigned to.
+        course_id (CharField): The course selected, usually a template course.
+        status (CharField): Pending, running, done or failed.
+        attempts (PositiveSmallIntegerField): Number of times the job was started.
+        course_assignment (ForeignKey): The assignment created by the job.
+        error (TextField): Reason of the last failure.
+    """
+
+    STATUS_CHOICES = (
+        (JOB_STATUS_PENDING, _("Pending")),
+        (JOB_STATUS_RUNNING, _("Running")),
+        (JOB_STATUS_DONE, _("Done")),
+        (JOB_STATUS_FAILED, _("Failed")),
+    )
+
+    class Meta:
+        app_label = "classrooms"
+        ordering = ["created"]
+
+    uuid = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+
+    classroom_instance = models.ForeignKey(
+        Classroom,
+        blank=False,
+        null=False,
+        on_delete=models.deletion.CASCADE,
+        help_text=_("The classroom to which the course will be assigned"),
+    )
+
+    course_id = models.CharField(
+        max_length=255,
+        blank=False,
+        help_text=_("Unique identifier for the course selected"),
+    )
+
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=JOB_STATUS_PENDING,
+        db_index=True,
+    )
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    course_assignment = models.ForeignKey(
+        CourseAssignment,
+        blank=True,
+        null=True,
+        on_delete=models.deletion.SET_NULL,
+        help_text=_("The course assignment created by this job"),
+    )
+
+    error = models.TextField(blank=True, default="")
+
+    def __str__(self) -> str:
+        """
+        Return a human-readable string representation.
+        """
+        return f"<CourseAssignmentJob {self.uuid} for course {self.course_id} is {self.status}>"
+
+    def __repr__(self):
+        """
+        Return string representation of the job.
+        """
+        return self.__str__()
 
 
 class ClassroomFeatureRole(UserRole):
@@ -0,0 +1,121 @@
+""" Abstraction layer to handle the implementation details for roster exports and imports """
+import codecs
+import csv
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from django.db.models import Q
+from learninghub.apps.classrooms.constants import (
+    ROSTER_CHUNK_SIZE,
+    ROSTER_FORMAT_CSV,
+    ROSTER_FORMAT_NDJSON,
+)
+from learninghub.apps.classrooms.models import ClassroomEnrollment
+
+ROSTER_FIELDS = [
+    "classroom_uuid",
+    "classroom_name",
+    "user_email",
+    "lms_user_id",
+    "staff",
+    "created",
+]
+
+
+class _Echo:
+    """A file-like object that returns what is written instead of buffering it"""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_roster(
+    classroom_uuid: Optional[str] = None,
+    school_uuid: Optional[str] = None,
+    chunk_size: int = ROSTER_CHUNK_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the enrollments of a classroom, or of all the classrooms of a school.
+
+    The rows are fetched in batches of `chunk_size` with one query each, ordered by
+    classroom, creation date and primary key and starting after the last row of the
+    previous batch. Only one batch is held in memory at a time, whatever the size
+    of the roster and even on MySQL, where the database driver loads the whole
+    result of a query before the first row is read.
+    """
+    enrollments = ClassroomEnrollment.objects.all()
+
+    if classroom_uuid is not None:
+        enrollments = enrollments.filter(classroom_instance_id=classroom_uuid)
+    if school_uuid is not None:
+        enrollments = enrollments.filter(classroom_instance__school=school_uuid)
+
+    enrollments = enrollments.order_by("classroom_instance_id", "created", "pk")
+    last_row = None
+
+    while True:
+        batch = enrollments
+        if last_row is not None:
+            classroom_id, created, pk = last_row
+            batch = batch.filter(
+                Q(classroom_instance_id__gt=classroom_id)
+                | Q(classroom_instance_id=classroom_id, created__gt=created)
+                | Q(classroom_instance_id=classroom_id, created=created, pk__gt=pk)
+            )
+
+        rows = list(
+            batch.values_list(
+                "classroom_instance_id",
+                "classroom_instance__name",
+                "user_email",
+                "lms_user_id",
+                "staff",
+                "created",
+                "pk",
+            )[:chunk_size]
+        )
+
+        for row in rows:
+            yield dict(zip(ROSTER_FIELDS, row))
+
+        if len(rows) < chunk_size:
+            break
+
+        last_row = (rows[-1][0], rows[-1][5], rows[-1][6])
+
+
+def iter_roster_csv(roster: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Yield the roster as CSV lines, starting with the header"""
+    writer = csv.DictWriter(_Echo(), fieldnames=ROSTER_FIELDS)
+
+    yield writer.writeheader()
+
+    for row in roster:
+        yield writer.writerow(row)
+
+
+def iter_roster_ndjson(roster: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Yield the roster as newline delimited JSON objects"""
+    for row in roster:
+        yield json.dumps(row, default=str) + "\n"
+
+
+ROSTER_WRITERS = {
+    ROSTER_FORMAT_CSV: iter_roster_csv,
+    ROSTER_FORMAT_NDJSON: iter_roster_ndjson,
+}
+
+
+def open_roster_csv(file: Iterable[bytes]) -> csv.DictReader:
+    """
+    Return a reader over the rows of an uploaded roster CSV file.
+
+    The file is decoded and parsed line by line as it is read. The header line is
+    read straight away and column names are stripped and lowercased.
+    """
+    reader = csv.DictReader(codecs.iterdecode(file, "utf-8-sig"))
+
+    if reader.fieldnames:
+        reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+
+    return reader
@@ -1,19 +1,29 @@
 """
 Signal Handlers for users to be enrolled in courses.
+
+Enrollments and assignments saved in a transaction are collected in a buffer and
+enrolled once the transaction is committed, with one LMS bulk enrollment and one
+Studio team update per distinct set of courses.
 """
 import logging
-from typing import List
+import threading
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
 
+from django.db import transaction
+from django.db.models import Q
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from learninghub.apps.api_client.concurrency import fetch_concurrently
 from learninghub.apps.api_client.lms import LMSApiClient
 from learninghub.apps.api_client.studio import StudioApiClient
 from learninghub.apps.classrooms.models import ClassroomEnrollment, CourseAssignment
 
 logger = logging.getLogger(__name__)
 
+_local = threading.local()
+
 
-# TODO Add tests for signals
 # TODO Improve exception handling
 def enroll_learners(course_run_ids: List[str], identifiers: List[str]) -> None:
     """ """
@@ -26,8 +36,16 @@ def enroll_learners(course_run_ids: List[str], identifiers: List[str]) -> None:
         logger.error(f"Learner enrollment failed: {exc}")
 
 
-def enroll_staff(course_ids: List[str], identifiers: List[str]) -> None:
-    """ """
+def enroll_staff(course_ids: List[str], identifiers: List[str]) -> Dict[str, str]:
+    """
+    Add the staff members to the team of the courses as instructors.
+
+    The usernames are resolved once, then the team of each course is fetched and
+    only the missing members are added. Courses are updated concurrently and a
+    course that fails does not stop the others.
+
+    Returns the error of each course that could not be updated.
+    """
     studio_client = StudioApiClient()
     lms_client = LMSApiClient()
 
@@ -36,83 +54,213 @@ def enroll_staff(course_ids: List[str], identifiers: List[str]) -> None:
     )
 
     try:
-        for course in course_ids:
-            course_data = {"team": []}
+        usernames = lms_client.get_usernames(identifiers)
+    except Exception as exc:
+        logger.error(f"Staff enrollment failed: {exc}")
+        return {course: str(exc) for course in course_ids}
+
+    if not usernames:
+        return {}
 
-            usernames = lms_client.get_usernames(identifiers)
+    def update_team(course: str) -> Tuple[str, Optional[str]]:
+        try:
+            team = studio_client.get_course_run(course).get("team") or []
+            members = {(member["user"], member["role"]) for member in team}
 
-            course_data["team"] = [
-                {"user": instructor, "role": "instructor"} for instructor in usernames
+            missing_members = [
+                {"user": username, "role": "instructor"}
+                for username in usernames
+                if (username, "instructor") not in members
             ]
 
-            studio_client.update_course_run(
-                course_id=course, course_run_data=course_data
-            )
-    except Exception as exc:
-        logger.error(f"Staff enrollment failed: {exc}")
+            # A partial update adds the members without removing the others
+            if missing_members:
+                studio_client.update_course_run(
+                    course_id=course, course_run_data={"team": missing_members}
+                )
+        except Exception as exc:  # pylint: disable=broad-except
+            return course, str(exc)
 
+        return course, None
 
-@receiver(post_save, sender=CourseAssignment)
-def enroll_from_course_assignment(sender, instance, created, **kwargs):
+    errors = {
+        course: error
+        for course, error in fetch_concurrently(update_team, course_ids)
+        if error is not None
+    }
+
+    for course, error in errors.items():
+        logger.error(f"Staff enrollment failed in {course}: {error}")
+
+    return errors
+
+
+class EnrollmentBuffer:
     """
-    When a CourseAssignment is created, which includes the classroom specific
-    course run, lookup all existing ClassroomEnrollments. For each student, enroll them
-    in the newly create course run.
+    Collect the enrollments and assignments created by a thread on a database
+    connection until they are flushed.
+
+    For each classroom, the new members are enrolled in all its courses and the
+    existing members in its new courses. The courses and members are looked up
+    when the buffer is flushed, with one query each whatever the number of saves.
+
+    The buffer is not dropped when a transaction is rolled back: its entries stay
+    until the next flush of the thread, which drops the entries whose rows are not
+    in the database.
     """
 
-    if not created:
-        return
+    def __init__(self, alias: str):
+        self.alias = alias
+        # Classroom ID -> emails of the new learners and staff members
+        self.members: Dict[UUID, Dict[bool, List[str]]] = {}
+        # Classroom ID -> new course run IDs
+        self.courses: Dict[UUID, List[str]] = {}
 
-    classroom_enrollments = ClassroomEnrollment.objects.filter(
-        classroom_instance=instance.classroom_instance
-    )
+    def add_member(self, classroom_id, identifier: str, staff: bool) -> None:
+        members = self.members.setdefault(classroom_id, {False: [], True: []})
+        members[staff].append(identifier)
 
-    logger.info(
-        f"Enroll {len(classroom_enrollments)} user(s) in course with ID {instance.course_id}"
-    )
+    def add_course(self, classroom_id, course_id: str) -> None:
+        self.courses.setdefault(classroom_id, []).append(course_id)
 
-    identifiers_list = [
-        enrollment.user_id for enrollment in classroom_enrollments.filter(staff=False)
-    ]
+    def flush(self) -> None:
+        """
+        Enroll the members in the courses, one call per set of courses.
 
-    course_run_id = [instance.course_id]
+        The buffer is emptied and removed from the registry, so the callbacks
+        registered after the first one have nothing left to enroll.
+        """
+        buffers = _get_buffers()
+        if buffers.get(self.alias) is self:
+            del buffers[self.alias]
 
-    if identifiers_list:
-        enroll_learners(course_run_ids=course_run_id, identifiers=identifiers_list)
+        if not self.members and not self.courses:
+            return
 
-    staff_list = [
-        enrollment.user_id for enrollment in classroom_enrollments.filter(staff=True)
-    ]
+        batches = self._get_batches()
+        self.members, self.courses = {}, {}
 
-    enroll_staff(course_ids=course_run_id, identifiers=staff_list)
+        for (course_ids, staff), identifiers in batches.items():
+            logger.info(
+                f"Enroll {len(identifiers)} user(s) in {len(course_ids)} course(s)"
+            )
 
+            if staff:
+                enroll_staff(course_ids=list(course_ids), identifiers=identifiers)
+            else:
+                enroll_learners(
+                    course_run_ids=list(course_ids), identifiers=identifiers
+                )
 
-@receiver(post_save, sender=ClassroomEnrollment)
-def enroll_from_classroom_enrollment(sender, instance, created, **kwargs):
+    def _get_batches(self) -> Dict[Tuple[Tuple[str, ...], bool], List[str]]:
+        """Group the identifiers to enroll by set of courses and role"""
+        batches = {}
+
+        def add_batch(course_ids, staff, identifiers):
+            if course_ids and identifiers:
+                batch = batches.setdefault((tuple(sorted(course_ids)), staff), [])
+                batch.extend(identifiers)
+
+        course_ids_by_classroom = {}
+        for classroom_id, course_id in CourseAssignment.objects.filter(
+            classroom_instance_id__in=set(self.members) | set(self.courses)
+        ).values_list("classroom_instance_id", "course_id"):
+            course_ids_by_classroom.setdefault(classroom_id, set()).add(course_id)
+
+        buffered_members = {
+            classroom_id: set(members[False]) | set(members[True])
+            for classroom_id, members in self.members.items()
+        }
+        buffered_identifiers = set().union(*buffered_members.values())
+
+        # The new members of a classroom with new courses are fetched along with
+        # the existing ones
+        new_members = {}
+        existing_members = {}
+        for classroom_id, identifier, staff in ClassroomEnrollment.objects.filter(
+            Q(classroom_instance_id__in=self.courses)
+            | Q(
+                classroom_instance_id__in=self.members,
+                user_email__in=buffered_identifiers,
+            )
+        ).values_list("classroom_instance_id", "user_email", "staff"):
+            if identifier in buffered_members.get(classroom_id, ()):
+                members = new_members.setdefault(classroom_id, {})
+            else:
+                members = existing_members.setdefault(classroom_id, {})
+            members.setdefault(staff, []).append(identifier)
+
+        for classroom_id, members in new_members.items():
+            for staff, identifiers in members.items():
+                add_batch(course_ids_by_classroom.get(classroom_id), staff, identifiers)
+
+        # The new members are already enrolled in all the courses of the classroom
+        for classroom_id, course_ids in self.courses.items():
+            course_ids = set(course_ids) & course_ids_by_classroom.get(
+                classroom_id, set()
+            )
+            for staff, identifiers in existing_members.get(classroom_id, {}).items():
+                add_batch(course_ids, staff, identifiers)
+
+        return batches
+
+
+def _get_buffers() -> Dict[str, EnrollmentBuffer]:
+    """Return the buffers of the current thread, keyed by database alias"""
+    if not hasattr(_local, "buffers"):
+        _local.buffers = {}
+
+    return _local.buffers
+
+
+def get_enrollment_buffer(using: Optional[str] = None) -> EnrollmentBuffer:
     """
-    When a ClassroomEnrollment is created, lookup all existing CourseAssignments. For each
-    assignment, enroll the students in the course.
+    Return the buffer of the current thread on a database connection.
+
+    The buffer is kept until it is flushed, not per transaction. The caller
+    registers the flush with `transaction.on_commit` after adding to the buffer, so
+    it is flushed right away outside of a transaction and once the transaction is
+    committed otherwise. The entries of a rolled back transaction are carried to
+    the next flush of the thread, which drops them after checking that their rows
+    do not exist.
     """
-    if not created:
-        return
+    alias = transaction.get_connection(using).alias
+    buffers = _get_buffers()
 
-    course_assignments = CourseAssignment.objects.filter(
-        classroom_instance=instance.classroom_instance
-    )
+    buffer = buffers.get(alias)
+    if buffer is None:
+        buffer = buffers[alias] = EnrollmentBuffer(alias)
+
+    return buffer
+
+
+@receiver(post_save, sender=CourseAssignment)
+def enroll_from_course_assignment(sender, instance, created, using, **kwargs):
+    """
+    When a CourseAssignment is created, which includes the classroom specific
+    course run, enroll all the members of the classroom in the new course run once
+    the transaction is committed.
+    """
 
-    if not course_assignments:
+    if not created:
         return
 
-    logger.info(f"Enroll user {instance.user_id} in {len(course_assignments)} courses")
+    buffer = get_enrollment_buffer(using)
+    buffer.add_course(instance.classroom_instance_id, instance.course_id)
+    transaction.on_commit(buffer.flush, using=using)
 
-    course_ids_list = [course.course_id for course in course_assignments]
 
-    is_staff = ClassroomEnrollment.objects.filter(
-        classroom_instance=instance.classroom_instance,
-        user_id=instance.user_id,
-    )[0].staff
+@receiver(post_save, sender=ClassroomEnrollment)
+def enroll_from_classroom_enrollment(sender, instance, created, using, **kwargs):
+    """
+    When a ClassroomEnrollment is created, enroll the user in all the courses
+    assigned to the classroom once the transaction is committed.
+    """
+    if not created:
+        return
 
-    if is_staff:
-        enroll_staff(course_ids=course_ids_list, identifiers=[instance.user_id])
-    else:
-        enroll_learners(course_run_ids=course_ids_list, identifiers=[instance.user_id])
+    buffer = get_enrollment_buffer(using)
+    buffer.add_member(
+        instance.classroom_instance_id, instance.user_email, instance.staff
+    )
+    transaction.on_commit(buffer.flush, using=using)
@@ -0,0 +1,75 @@
+"""
+Tests for the `classroom` counters module.
+"""
+from django.core.management import call_command
+from django.test import TestCase
+from learninghub.apps.classrooms.counters import repair_counters
+from learninghub.apps.classrooms.models import (
+    Classroom,
+    ClassroomEnrollment,
+    CourseAssignment,
+)
+from pytest import mark
+from test_utils.factories import ClassroomEnrollmentFactory, ClassroomFactory
+
+
+@mark.django_db
+class TestRepairCounters(TestCase):
+    """
+    Tests for repair_counters.
+    """
+
+    def setUp(self) -> None:
+        self.classrooms = ClassroomFactory.create_batch(3)
+
+        for index, classroom in enumerate(self.classrooms):
+            ClassroomEnrollmentFactory.create(
+                classroom_instance=classroom, lms_user_id=index + 1, staff=True
+            )
+            ClassroomEnrollment.objects.bulk_create(
+                [
+                    ClassroomEnrollment(
+                        classroom_instance=classroom,
+                        user_email=f"learner{learner}@school.sch",
+                        lms_user_id=100 + learner,
+                    )
+                    for learner in range(index)
+                ]
+            )
+            CourseAssignment.objects.bulk_create(
+                [
+                    CourseAssignment(
+                        classroom_instance=classroom,
+                        course_id="course-v1:DiceyTech+BOX001+1T2021",
+                    )
+                ]
+            )
+
+        super().setUp()
+
+    def test_repair_counters(self):
+        """
+        Test that counters drifted by writes bypassing the models are recomputed
+        """
+        self.assertEqual(repair_counters(batch_size=2), 3)
+
+        for index, classroom in enumerate(self.classrooms):
+            classroom.refresh_from_db()
+            self.assertEqual(classroom.learner_count, index)
+            self.assertEqual(classroom.staff_count, 1)
+            self.assertEqual(classroom.assignment_count, 1)
+
+        # Nothing left to repair
+        self.assertEqual(repair_counters(batch_size=2), 0)
+
+    def test_repair_command(self):
+        """
+        Test that the management command repairs the counters
+        """
+        Classroom.objects.update(staff_count=10)
+
+        call_command("repair_classroom_counters", "--batch-size", "1")
+
+        self.assertEqual(
+            list(Classroom.objects.values_list("staff_count", flat=True)), [1, 1, 1]
+        )
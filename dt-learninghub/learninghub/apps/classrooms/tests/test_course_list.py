@@ -0,0 +1,101 @@
+"""
+Tests for the `classroom` course list module.
+"""
+import logging
+import time
+
+from django.test import TestCase
+from learninghub.apps.classrooms.course_list import _filter_course_list
+from learninghub.apps.classrooms.models import CourseAssignment
+from learninghub.apps.core.utils import course_key_cache_info
+from pytest import mark
+from test_utils.factories import ClassroomFactory
+
+logger = logging.getLogger(__name__)
+
+
+@mark.django_db
+class TestFilterCourseList(TestCase):
+    """
+    Tests for _filter_course_list.
+    """
+
+    def setUp(self) -> None:
+        self.classroom = ClassroomFactory.create()
+        super().setUp()
+
+    def _assign(self, course_ids):
+        """Assign the courses without going through the course run creation"""
+        CourseAssignment.objects.bulk_create(
+            [
+                CourseAssignment(classroom_instance=self.classroom, course_id=course_id)
+                for course_id in course_ids
+            ]
+        )
+
+    def test_filter_assigned_courses(self):
+        """
+        Test that every assigned course is filtered out, including consecutive ones
+        """
+        self._assign(
+            [
+                "course-v1:DiceyTech+BOX001+1T2021",
+                "course-v1:DiceyTech+BOX002+1T2021",
+                "course-v1:OtherOrg+BOX004+1T2021",
+            ]
+        )
+        course_list = [
+            {"key": "course-v1:DiceyTech+BOX001+TEMPLATE"},
+            {"key": "course-v1:DiceyTech+BOX002+TEMPLATE"},
+            {"key": "course-v1:DiceyTech+BOX003+TEMPLATE"},
+            {"key": "course-v1:DiceyTech+BOX004+TEMPLATE"},
+        ]
+
+        filtered_course_list = _filter_course_list(
+            self.classroom.uuid, iter(course_list)
+        )
+
+        self.assertEqual(
+            filtered_course_list,
+            [
+                {"key": "course-v1:DiceyTech+BOX003+TEMPLATE"},
+                {"key": "course-v1:DiceyTech+BOX004+TEMPLATE"},
+            ],
+        )
+
+    def test_filter_without_assignments(self):
+        """
+        Test that the course list is returned as is when nothing is assigned
+        """
+        course_list = [{"key": "course-v1:DiceyTech+BOX001+TEMPLATE"}]
+
+        self.assertEqual(
+            _filter_course_list(self.classroom.uuid, course_list), course_list
+        )
+
+    def test_filter_benchmark(self):
+        """
+        Filter 10k catalog courses against 500 assignments and check that every
+        course key is parsed once.
+        """
+        self._assign(
+            f"course-v1:DiceyTech+C{index:05d}+1T2021" for index in range(0, 1000, 2)
+        )
+        course_list = [
+            {"key": f"course-v1:DiceyTech+C{index:05d}+TEMPLATE"}
+            for index in range(10000)
+        ]
+
+        start = time.perf_counter()
+        filtered_course_list = _filter_course_list(self.classroom.uuid, course_list)
+        duration = time.perf_counter() - start
+
+        logger.info(f"Filtered 10000 courses against 500 assignments in {duration}s")
+
+        self.assertEqual(len(filtered_course_list), 9500)
+        self.assertEqual(course_key_cache_info().misses, 10000 + 500)
+
+        # Listing the courses again does not parse any key
+        _filter_course_list(self.classroom.uuid, course_list)
+
+        self.assertEqual(course_key_cache_info().misses, 10000 + 500)
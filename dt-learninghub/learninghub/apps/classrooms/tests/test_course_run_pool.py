@@ -0,0 +1,133 @@
+"""
+Tests for the `classroom` course run pool module.
+"""
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from learninghub.apps.classrooms.constants import COURSE_RUN_POOL_MAX_AGE
+from learninghub.apps.classrooms.course_run_pool import (
+    fill_course_run_pool,
+    fill_course_run_pools,
+)
+from learninghub.apps.classrooms.models import CourseRunProvision, PooledCourseRun
+from pytest import mark
+from requests.exceptions import HTTPError
+from test_utils.factories import ClassroomFactory
+
+POOL = "learninghub.apps.classrooms.course_run_pool"
+
+
+@mark.django_db
+@mock.patch(f"{POOL}.DiscoveryApiClient")
+class TestCourseRunPool(TestCase):
+    """
+    Tests for the pool of course runs.
+    """
+
+    def setUp(self) -> None:
+        self.classroom = ClassroomFactory.create()
+        self.template_course_id = "course-v1:DiceyTech+BOX001+TEMPLATE"
+        self.course_run_ids = iter(
+            f"course-v1:DiceyTech+BOX001+2022040800000{index}" for index in range(10)
+        )
+        super().setUp()
+
+    def _create_course_run(self, template_course_id):
+        return next(self.course_run_ids)
+
+    @mock.patch(f"{POOL}.create_course_run")
+    def test_fill_course_run_pool(self, mock_create_course_run, mock_discovery_client):
+        """Test that only the missing course runs are created"""
+        mock_create_course_run.side_effect = self._create_course_run
+
+        self.assertEqual(fill_course_run_pool(self.template_course_id, 3), 3)
+        self.assertEqual(fill_course_run_pool(self.template_course_id, 3), 0)
+
+        # Assigned and outdated course runs are replaced
+        PooledCourseRun.claim(self.template_course_id, self.classroom.uuid)
+        PooledCourseRun.objects.filter(classroom_instance__isnull=True).update(
+            created=timezone.now() - timedelta(seconds=COURSE_RUN_POOL_MAX_AGE + 1)
+        )
+        self.assertEqual(fill_course_run_pool(self.template_course_id, 3), 3)
+
+        self.assertEqual(mock_create_course_run.call_count, 6)
+        mock_create_course_run.assert_called_with(self.template_course_id)
+        self.assertEqual(fill_course_run_pool("course-v1:DiceyTech+BOX001+2021", 3), 0)
+
+    @mock.patch(f"{POOL}.create_course_run")
+    def test_failing_template_does_not_stop_others(
+        self, mock_create_course_run, mock_discovery_client
+    ):
+        """Test that the pools of the other templates are filled"""
+        other_template_course_id = "course-v1:DiceyTech+EXP001+TEMPLATE"
+
+        def create_course_run(template_course_id):
+            if template_course_id != other_template_course_id:
+                raise HTTPError()
+            return self._create_course_run(template_course_id)
+
+        mock_create_course_run.side_effect = create_course_run
+
+        created = fill_course_run_pools(
+            {self.template_course_id: 2, other_template_course_id: 2}
+        )
+
+        self.assertEqual(created, 2)
+        mock_discovery_client.return_value.get_course_run_types.assert_called_once_with(
+            [self.template_course_id, other_template_course_id]
+        )
+        self.assertEqual(PooledCourseRun.available(other_template_course_id).count(), 2)
+
+    @override_settings(COURSE_RUN_POOL_SIZES={"course-v1:DiceyTech+BOX001+TEMPLATE": 2})
+    @mock.patch("learninghub.apps.classrooms.models.create_course_run")
+    @mock.patch(f"{POOL}.create_course_run")
+    def test_assignment_claims_pooled_course_run(
+        self,
+        mock_create_course_run,
+        mock_models_create_course_run,
+        mock_discovery_client,
+    ):
+        """Test that a course assignment uses a pooled course run right away"""
+        mock_create_course_run.side_effect = self._create_course_run
+        call_command("fill_course_run_pool", "--once")
+
+        course_run_ids = [
+            CourseRunProvision.provision(classroom.uuid, self.template_course_id)
+            for classroom in (self.classroom, ClassroomFactory.create())
+        ]
+
+        mock_models_create_course_run.assert_not_called()
+        self.assertEqual(
+            course_run_ids,
+            list(
+                PooledCourseRun.objects.filter(
+                    classroom_instance__isnull=False
+                ).values_list("course_id", flat=True)
+            ),
+        )
+        self.assertEqual(len(set(course_run_ids)), 2)
+
+        # Once the pool is empty the course run is created
+        mock_models_create_course_run.return_value = "course-v1:DiceyTech+BOX001+1"
+        CourseRunProvision.provision(
+            ClassroomFactory.create().uuid, self.template_course_id
+        )
+        mock_models_create_course_run.assert_called_once()
+
+    @override_settings(COURSE_RUN_POOL_SIZES={"course-v1:DiceyTech+BOX001+TEMPLATE": 1})
+    @mock.patch(f"{POOL}.create_course_run")
+    def test_claimed_course_run_not_returned_to_pool(
+        self, mock_create_course_run, mock_discovery_client
+    ):
+        """Test that deleting a classroom does not make its course run available"""
+        mock_create_course_run.side_effect = self._create_course_run
+        call_command("fill_course_run_pool", "--once")
+
+        CourseRunProvision.provision(self.classroom.uuid, self.template_course_id)
+        self.classroom.delete()
+
+        self.assertFalse(PooledCourseRun.objects.exists())
+        self.assertFalse(PooledCourseRun.available(self.template_course_id).exists())
@@ -0,0 +1,230 @@
+"""
+Tests for the `classroom` enrollments module.
+"""
+from unittest import mock
+
+from django.test import TestCase
+from learninghub.apps.classrooms.constants import (
+    ENROLLMENT_STATUS_ALREADY_ENROLLED,
+    ENROLLMENT_STATUS_DUPLICATE,
+    ENROLLMENT_STATUS_ENROLLED,
+    ENROLLMENT_STATUS_INVALID,
+    ENROLLMENT_STATUS_UNKNOWN_CLASSROOM,
+)
+from learninghub.apps.classrooms.enrollments import (
+    bulk_enroll_in_classroom,
+    import_roster,
+)
+from learninghub.apps.classrooms.models import ClassroomEnrollment, CourseAssignment
+from pytest import mark
+from test_utils.factories import ClassroomEnrollmentFactory, ClassroomFactory
+
+
+@mark.django_db
+class TestBulkEnrollInClassroom(TestCase):
+    """
+    Tests for bulk_enroll_in_classroom.
+    """
+
+    def setUp(self) -> None:
+        self.classroom = ClassroomFactory.create()
+        self.existing_enrollment = ClassroomEnrollmentFactory.create(
+            classroom_instance=self.classroom,
+            user_email="existing@school.sch",
+            lms_user_id=1,
+        )
+        super().setUp()
+
+    @mock.patch("learninghub.apps.classrooms.enrollments.LMSApiClient")
+    @mock.patch("learninghub.apps.classrooms.enrollments.get_lms_user_ids")
+    def test_bulk_enroll(self, mock_get_lms_user_ids, mock_lms_client):
+        """
+        Test that enrollments are created in bulk and reported per identifier
+        """
+        mock_get_lms_user_ids.return_value = {
+            "student1@school.sch": 2,
+            "student2@school.sch": None,
+        }
+
+        identifiers = [
+            "student1@school.sch",
+            "not-an-email",
+            "existing@school.sch",
+            "Student1@school.sch",
+            "student2@school.sch",
+        ]
+
+        results = bulk_enroll_in_classroom(self.classroom, identifiers)
+
+        self.assertEqual(
+            results,
+            [
+                {
+                    "identifier": "student1@school.sch",
+                    "status": ENROLLMENT_STATUS_ENROLLED,
+                },
+                {"identifier": "not-an-email", "status": ENROLLMENT_STATUS_INVALID},
+                {
+                    "identifier": "existing@school.sch",
+                    "status": ENROLLMENT_STATUS_ALREADY_ENROLLED,
+                },
+                {
+                    "identifier": "Student1@school.sch",
+                    "status": ENROLLMENT_STATUS_DUPLICATE,
+                },
+                {
+                    "identifier": "student2@school.sch",
+                    "status": ENROLLMENT_STATUS_ENROLLED,
+                },
+            ],
+        )
+        mock_get_lms_user_ids.assert_called_once_with(
+            ["student1@school.sch", "student2@school.sch"]
+        )
+        self.assertEqual(
+            ClassroomEnrollment.objects.filter(
+                classroom_instance=self.classroom
+            ).count(),
+            3,
+        )
+        self.classroom.refresh_from_db()
+        self.assertEqual(self.classroom.learner_count, 3)
+        # No course assigned so no need to call the LMS
+        mock_lms_client.return_value.bulk_enroll.assert_not_called()
+
+    @mock.patch("learninghub.apps.classrooms.enrollments.LMSApiClient")
+    @mock.patch("learninghub.apps.classrooms.enrollments.get_lms_user_ids")
+    def test_bulk_enroll_in_assigned_courses(
+        self, mock_get_lms_user_ids, mock_lms_client
+    ):
+        """
+        Test that new learners are enrolled in all the courses with a single call
+        """
+        course_ids = [
+            "course-v1:DiceyTech+BOX001+PRTHRN_July_2021",
+            "course-v1:DiceyTech+EXP001+PRTHRN_July_2021",
+        ]
+        # Bypass the course run creation
+        CourseAssignment.objects.bulk_create(
+            [
+                CourseAssignment(course_id=course_id, classroom_instance=self.classroom)
+                for course_id in course_ids
+            ]
+        )
+
+        identifiers = [f"student{i}@school.sch" for i in range(10)]
+        mock_get_lms_user_ids.return_value = {
+            identifier: i + 10 for i, identifier in enumerate(identifiers)
+        }
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_enroll_in_classroom(self.classroom, identifiers + identifiers[:2])
+
+        mock_lms_client.return_value.bulk_enroll.assert_called_once_with(
+            courses=course_ids, identifiers=identifiers
+        )
+
+    @mock.patch("learninghub.apps.classrooms.enrollments.get_lms_user_ids")
+    def test_bulk_enroll_same_lms_user(self, mock_get_lms_user_ids):
+        """
+        Test that a different email for an enrolled LMS user is not enrolled twice
+        """
+        mock_get_lms_user_ids.return_value = {"alias@school.sch": 1}
+
+        results = bulk_enroll_in_classroom(self.classroom, ["alias@school.sch"])
+
+        self.assertEqual(results[0]["status"], ENROLLMENT_STATUS_ALREADY_ENROLLED)
+        self.assertEqual(
+            ClassroomEnrollment.objects.filter(
+                classroom_instance=self.classroom
+            ).count(),
+            1,
+        )
+
+
+@mark.django_db
+class TestImportRoster(TestCase):
+    """
+    Tests for import_roster.
+    """
+
+    def setUp(self) -> None:
+        self.classroom = ClassroomFactory.create()
+        self.other_classroom = ClassroomFactory.create(school=self.classroom.school)
+        CourseAssignment.objects.bulk_create(
+            [
+                CourseAssignment(
+                    course_id="course-v1:DiceyTech+BOX001+PRTHRN_July_2021",
+                    classroom_instance=self.classroom,
+                )
+            ]
+        )
+        super().setUp()
+
+    @mock.patch("learninghub.apps.classrooms.enrollments.LMSApiClient")
+    @mock.patch("learninghub.apps.classrooms.enrollments.get_lms_user_ids")
+    def test_import_in_chunks(self, mock_get_lms_user_ids, mock_lms_client):
+        """
+        Test that rows are enrolled chunk by chunk and deduplicated across chunks
+        """
+        mock_get_lms_user_ids.side_effect = lambda emails: {
+            email: None for email in emails
+        }
+        rows = [{"email": f"student{i}@school.sch"} for i in range(5)]
+        rows.append({"email": "Student0@school.sch"})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            outcomes = list(import_roster(iter(rows), self.classroom, chunk_size=2))
+
+        self.assertEqual([outcome["row"] for outcome in outcomes], [1, 2, 3, 4, 5, 6])
+        self.assertEqual(
+            [outcome["status"] for outcome in outcomes],
+            [ENROLLMENT_STATUS_ENROLLED] * 5 + [ENROLLMENT_STATUS_DUPLICATE],
+        )
+        # One bulk enrollment per chunk with new learners
+        self.assertEqual(mock_lms_client.return_value.bulk_enroll.call_count, 3)
+        self.classroom.refresh_from_db()
+        self.assertEqual(self.classroom.learner_count, 5)
+
+    @mock.patch("learninghub.apps.classrooms.enrollments.get_lms_user_ids")
+    def test_import_for_school(self, mock_get_lms_user_ids):
+        """
+        Test that each row is enrolled in the classroom of its classroom column
+        """
+        mock_get_lms_user_ids.side_effect = lambda emails: {
+            email: None for email in emails
+        }
+        other_school_classroom = ClassroomFactory.create()
+        rows = [
+            {"email": "student1@school.sch", "classroom": str(self.classroom.uuid)},
+            {
+                "email": "student1@school.sch",
+                "classroom": str(self.other_classroom.uuid),
+            },
+            {
+                "email": "student2@school.sch",
+                "classroom": str(other_school_classroom.uuid),
+            },
+            {"email": "student3@school.sch", "classroom": "not-a-uuid"},
+            {"email": "not-an-email", "classroom": str(self.classroom.uuid)},
+        ]
+
+        outcomes = list(import_roster(rows, school_uuid=self.classroom.school))
+
+        self.assertEqual(
+            [outcome["status"] for outcome in outcomes],
+            [
+                ENROLLMENT_STATUS_ENROLLED,
+                ENROLLMENT_STATUS_ENROLLED,
+                ENROLLMENT_STATUS_UNKNOWN_CLASSROOM,
+                ENROLLMENT_STATUS_UNKNOWN_CLASSROOM,
+                ENROLLMENT_STATUS_INVALID,
+            ],
+        )
+        self.assertEqual(outcomes[1]["classroom"], str(self.other_classroom.uuid))
+        self.assertIsNone(outcomes[2]["classroom"])
+        self.assertFalse(
+            ClassroomEnrollment.objects.filter(
+                classroom_instance=other_school_classroom
+            ).exists()
+        )
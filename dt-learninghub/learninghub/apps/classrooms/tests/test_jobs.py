@@ -0,0 +1,157 @@
+"""
+Tests for the `classroom` jobs module.
+"""
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from edx_django_utils.cache import RequestCache
+from learninghub.apps.classrooms.constants import (
+    JOB_MAX_ATTEMPTS,
+    JOB_STATUS_DONE,
+    JOB_STATUS_FAILED,
+    JOB_STATUS_PENDING,
+    JOB_STATUS_RUNNING,
+)
+from learninghub.apps.classrooms.jobs import (
+    claim_next_job,
+    enqueue_course_assignment,
+    process_jobs,
+)
+from learninghub.apps.classrooms.models import CourseAssignment, CourseAssignmentJob
+from pytest import mark
+from rest_framework import status
+from test_utils.factories import ClassroomFactory
+from test_utils.response import MockResponse
+
+
+@mark.django_db
+class TestCourseAssignmentJobs(TestCase):
+    """
+    Tests for the course assignment jobs.
+    """
+
+    def setUp(self) -> None:
+        self.classroom = ClassroomFactory.create()
+        self.template_course_id = "course-v1:DiceyTech+BOX001+TEMPLATE"
+        self.course_run_id = "course-v1:DiceyTech+BOX001+20220408"
+        super().setUp()
+
+    def _mock_upstreams(self, mock_oauth_client):
+        """Stub the Discovery, Studio and LMS responses"""
+        mock_oauth_client.return_value.get.return_value = MockResponse(
+            {"results": [{"run_type": "1cfaba8e-16c2-4342-addd-4937b38c05ce"}]},
+            status.HTTP_200_OK,
+        )
+        mock_oauth_client.return_value.post.return_value = MockResponse(
+            {
+                "key": self.course_run_id,
+                "start": "2022-04-08T00:00:00Z",
+                "end": "2022-07-07T00:00:00Z",
+            },
+            status_code=status.HTTP_201_CREATED,
+        )
+
+    @mock.patch("learninghub.apps.api_client.base_oauth.OAuthAPIClient")
+    def test_worker_provisions_course_assignment(self, mock_oauth_client):
+        """Test the worker command creates the course assignment"""
+        self._mock_upstreams(mock_oauth_client)
+
+        job = enqueue_course_assignment(self.classroom, self.template_course_id)
+
+        call_command("process_course_assignment_jobs", "--once")
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, JOB_STATUS_DONE)
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(job.course_assignment.course_id, self.course_run_id)
+        self.assertEqual(
+            CourseAssignment.objects.filter(classroom_instance=self.classroom).count(),
+            1,
+        )
+
+    @mock.patch("learninghub.apps.api_client.base_oauth.OAuthAPIClient")
+    def test_duplicate_jobs_share_course_run(self, mock_oauth_client):
+        """Test that jobs assigning the same template create a single course run"""
+        self._mock_upstreams(mock_oauth_client)
+
+        jobs = [
+            enqueue_course_assignment(self.classroom, self.template_course_id)
+            for _ in range(2)
+        ]
+
+        self.assertEqual(process_jobs(), 2)
+
+        for job in jobs:
+            job.refresh_from_db()
+            self.assertEqual(job.status, JOB_STATUS_DONE)
+
+        self.assertEqual(jobs[0].course_assignment, jobs[1].course_assignment)
+        # One course run created in Discovery and one discovery user removed
+        self.assertEqual(mock_oauth_client.return_value.post.call_count, 2)
+
+    @mock.patch("learninghub.apps.api_client.base_oauth.OAuthAPIClient")
+    def test_failed_job(self, mock_oauth_client):
+        """Test a job is marked as failed when the course run cannot be created"""
+        self._mock_upstreams(mock_oauth_client)
+        mock_oauth_client.return_value.post.return_value = MockResponse(
+            {}, status.HTTP_400_BAD_REQUEST
+        )
+
+        job = enqueue_course_assignment(self.classroom, self.template_course_id)
+
+        self.assertEqual(process_jobs(), 1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, JOB_STATUS_FAILED)
+        self.assertNotEqual(job.error, "")
+        self.assertFalse(
+            CourseAssignment.objects.filter(classroom_instance=self.classroom).exists()
+        )
+
+    @mock.patch("learninghub.apps.classrooms.jobs.close_old_connections")
+    @mock.patch("learninghub.apps.classrooms.jobs.run_job")
+    def test_worker_state_reset_around_jobs(self, mock_run_job, mock_close):
+        """Test the request cache is cleared and connections checked for each job"""
+        request_cache = RequestCache("worker-test")
+        cached_values = []
+
+        def run_job(job):
+            cached_values.append(request_cache.get_cached_response("key").is_found)
+            request_cache.set("key", job.uuid)
+
+        mock_run_job.side_effect = run_job
+        request_cache.set("key", "stale")
+
+        enqueue_course_assignment(self.classroom, self.template_course_id)
+        enqueue_course_assignment(self.classroom, self.template_course_id)
+
+        self.assertEqual(process_jobs(), 2)
+
+        self.assertEqual(cached_values, [False, False])
+        self.assertFalse(request_cache.get_cached_response("key").is_found)
+        self.assertGreaterEqual(mock_close.call_count, 4)
+
+    def test_claim_next_job(self):
+        """Test jobs are claimed in order and abandoned jobs are claimed again"""
+        first = enqueue_course_assignment(self.classroom, self.template_course_id)
+        second = enqueue_course_assignment(self.classroom, self.template_course_id)
+
+        self.assertEqual(claim_next_job(), first)
+        claimed = claim_next_job()
+        self.assertEqual(claimed, second)
+        self.assertEqual(claimed.status, JOB_STATUS_RUNNING)
+        self.assertIsNone(claim_next_job())
+
+        # The first job was abandoned by its worker
+        CourseAssignmentJob.objects.filter(pk=first.pk).update(
+            modified=timezone.now() - timedelta(days=1)
+        )
+        self.assertEqual(claim_next_job(), first)
+
+        CourseAssignmentJob.objects.filter(pk=first.pk).update(
+            status=JOB_STATUS_PENDING, attempts=JOB_MAX_ATTEMPTS
+        )
+        self.assertIsNone(claim_next_job())
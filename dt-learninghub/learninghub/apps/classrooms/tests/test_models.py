@@ -9,7 +9,9 @@ from uuid import uuid4
 import ddt
 from django.test import TestCase
 from learninghub.apps.classrooms.constants import DATE_FORMAT
+from learninghub.apps.classrooms.models import Classroom, CourseRunProvision
 from pytest import mark
+from requests.exceptions import HTTPError
 from rest_framework import status
 from test_utils.factories import (
     ClassroomEnrollmentFactory,
@@ -47,6 +49,20 @@ class TestClassroomInstance(TestCase):
         )
         self.assertEqual(expected_str, method(self.classroom_instance))
 
+    def test_save_keeps_counters(self):
+        """
+        Test that saving an instance loaded earlier does not overwrite the counters
+        """
+        Classroom.update_counters(self.classroom_instance.uuid, learners=1, staff=2)
+
+        self.classroom_instance.name = "Renamed"
+        self.classroom_instance.save()
+
+        self.classroom_instance.refresh_from_db()
+        self.assertEqual(self.classroom_instance.name, "Renamed")
+        self.assertEqual(self.classroom_instance.learner_count, 1)
+        self.assertEqual(self.classroom_instance.staff_count, 2)
+
 
 @mark.django_db
 @ddt.ddt
@@ -78,6 +94,29 @@ class TestClassroomEnrollment(TestCase):
 
         self.assertEqual(expected_str, method(self.classroom_enrollment))
 
+    def test_counters(self):
+        """
+        Test that the classroom counters follow the enrollments
+        """
+        self.classroom_instance.refresh_from_db()
+        self.assertEqual(self.classroom_instance.learner_count, 1)
+        self.assertEqual(self.classroom_instance.staff_count, 0)
+
+        staff_enrollment = ClassroomEnrollmentFactory.create(
+            classroom_instance=self.classroom_instance, lms_user_id=2, staff=True
+        )
+        self.classroom_enrollment.staff = True
+        self.classroom_enrollment.save()
+
+        self.classroom_instance.refresh_from_db()
+        self.assertEqual(self.classroom_instance.learner_count, 0)
+        self.assertEqual(self.classroom_instance.staff_count, 2)
+
+        staff_enrollment.delete()
+
+        self.classroom_instance.refresh_from_db()
+        self.assertEqual(self.classroom_instance.staff_count, 1)
+
 
 @mark.django_db
 @ddt.ddt
@@ -137,3 +176,112 @@ class TestCourseAssignment(TestCase):
             self.course_assignment.course_id,
             self.expected_course_id,
         )
+
+    def test_assignment_counter(self):
+        """
+        Test that the classroom counter follows the assignments
+        """
+        self.classroom_instance.refresh_from_db()
+        self.assertEqual(self.classroom_instance.assignment_count, 1)
+
+        self.course_assignment.delete()
+
+        self.classroom_instance.refresh_from_db()
+        self.assertEqual(self.classroom_instance.assignment_count, 0)
+
+
+@mark.django_db
+class TestCourseRunProvision(TestCase):
+    """
+    Tests for the CourseRunProvision
+    """
+
+    def setUp(self) -> None:
+        self.classroom_instance = ClassroomFactory.create()
+        self.template_course_id = "course-v1:DiceyTech+BOX001+TEMPLATE"
+        self.course_run_id = "course-v1:DiceyTech+BOX001+20220408"
+        super().setUp()
+
+    @mock.patch("learninghub.apps.classrooms.models.create_course_run")
+    def test_course_run_created_once(self, mock_create_course_run):
+        """
+        Test that the course run of a template is created once per classroom
+        """
+        mock_create_course_run.return_value = self.course_run_id
+
+        course_run_ids = [
+            CourseRunProvision.provision(
+                self.classroom_instance.uuid, self.template_course_id
+            )
+            for _ in range(2)
+        ]
+
+        self.assertEqual(course_run_ids, [self.course_run_id] * 2)
+        mock_create_course_run.assert_called_once_with(
+            self.template_course_id, term=mock.ANY, reuse_existing=False
+        )
+
+        # Another classroom gets its own course run
+        CourseRunProvision.provision(
+            ClassroomFactory.create().uuid, self.template_course_id
+        )
+        self.assertEqual(mock_create_course_run.call_count, 2)
+
+    @mock.patch("learninghub.apps.classrooms.models.create_course_run")
+    def test_retry_reuses_term(self, mock_create_course_run):
+        """
+        Test that a failed creation is retried with the same course run key
+        """
+        mock_create_course_run.side_effect = [HTTPError(), self.course_run_id]
+
+        with self.assertRaises(HTTPError):
+            CourseRunProvision.provision(
+                self.classroom_instance.uuid, self.template_course_id
+            )
+
+        course_run_id = CourseRunProvision.provision(
+            self.classroom_instance.uuid, self.template_course_id
+        )
+
+        self.assertEqual(course_run_id, self.course_run_id)
+        first_call, retry_call = mock_create_course_run.call_args_list
+        self.assertEqual(first_call.kwargs["term"], retry_call.kwargs["term"])
+        self.assertTrue(retry_call.kwargs["reuse_existing"])
+
+    @mock.patch("learninghub.apps.api_client.base_oauth.OAuthAPIClient")
+    def test_existing_course_run_reused(self, mock_oauth_client):
+        """
+        Test that a course run created by a failed attempt is not created again
+        """
+        CourseRunProvision.objects.create(
+            classroom_instance=self.classroom_instance,
+            template_course_id=self.template_course_id,
+            term="20220408",
+        )
+        mock_oauth_client.return_value.get.return_value = MockResponse(
+            {
+                "results": [
+                    {
+                        "key": self.course_run_id,
+                        "start": "2022-04-08T00:00:00Z",
+                        "end": "2022-07-07T00:00:00Z",
+                    }
+                ]
+            },
+            status.HTTP_200_OK,
+        )
+
+        course_run_id = CourseRunProvision.provision(
+            self.classroom_instance.uuid, self.template_course_id
+        )
+
+        self.assertEqual(course_run_id, self.course_run_id)
+        mock_oauth_client.return_value.get.assert_called_once_with(
+            mock.ANY, params={"keys": self.course_run_id}
+        )
+        # Only the discovery user is removed, no course run is created
+        mock_oauth_client.return_value.post.assert_called_once()
+        self.assertEqual(
+            mock_oauth_client.return_value.post.call_args.kwargs["json"]["action"],
+            "unenroll",
+        )
@@ -0,0 +1,102 @@
+"""
+Tests for the `classroom` roster module.
+"""
+import json
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from learninghub.apps.classrooms.roster import (
+    iter_roster,
+    iter_roster_csv,
+    iter_roster_ndjson,
+)
+from pytest import mark
+from test_utils.factories import ClassroomEnrollmentFactory, ClassroomFactory
+
+
+@mark.django_db
+class TestRoster(TestCase):
+    """
+    Tests for the roster exports.
+    """
+
+    def setUp(self) -> None:
+        self.classroom = ClassroomFactory.create(name="Maths")
+        self.other_classroom = ClassroomFactory.create(school=self.classroom.school)
+
+        ClassroomEnrollmentFactory.create(
+            classroom_instance=self.classroom,
+            user_email="teacher@school.sch",
+            lms_user_id=1,
+            staff=True,
+        )
+        ClassroomEnrollmentFactory.create(
+            classroom_instance=self.classroom,
+            user_email="student@school.sch",
+            lms_user_id=2,
+        )
+        ClassroomEnrollmentFactory.create(
+            classroom_instance=self.other_classroom,
+            user_email="student@school.sch",
+            lms_user_id=2,
+        )
+        super().setUp()
+
+    def test_csv_header_is_sent_before_the_query(self):
+        """
+        Test that the CSV header is produced before the enrollments are queried
+        """
+        lines = iter_roster_csv(iter_roster(classroom_uuid=self.classroom.uuid))
+
+        with CaptureQueriesContext(connection) as queries:
+            header = next(lines)
+
+        self.assertEqual(
+            header,
+            "classroom_uuid,classroom_name,user_email,lms_user_id,staff,created\r\n",
+        )
+        self.assertEqual(len(queries), 0)
+
+        rows = list(lines)
+        self.assertEqual(len(rows), 2)
+        self.assertTrue(rows[0].startswith(f"{self.classroom.uuid},Maths,teacher@"))
+
+    def test_school_roster_ndjson(self):
+        """
+        Test that the roster of a school includes all its classrooms
+        """
+        lines = iter_roster_ndjson(iter_roster(school_uuid=self.classroom.school))
+
+        rows = [json.loads(line) for line in lines]
+
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(
+            {row["classroom_uuid"] for row in rows},
+            {str(self.classroom.uuid), str(self.other_classroom.uuid)},
+        )
+
+    def test_roster_fetched_in_batches(self):
+        """
+        Test that the rows are fetched in batches that continue after the last row
+        """
+        for index in range(3):
+            ClassroomEnrollmentFactory.create(
+                classroom_instance=self.other_classroom,
+                user_email=f"student{index}@school.sch",
+                lms_user_id=index + 3,
+            )
+
+        with CaptureQueriesContext(connection) as queries:
+            rows = list(iter_roster(school_uuid=self.classroom.school, chunk_size=2))
+
+        # 6 rows in batches of 2, the last batch is empty
+        self.assertEqual(len(queries), 4)
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(
+            len({(row["classroom_uuid"], row["user_email"]) for row in rows}), 6
+        )
+        self.assertEqual(
+            [row["classroom_uuid"] for row in rows],
+            sorted(row["classroom_uuid"] for row in rows),
+        )
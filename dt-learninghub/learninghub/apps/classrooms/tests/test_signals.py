@@ -0,0 +1,195 @@
+"""
+Tests for the `classroom` signal handlers.
+"""
+from unittest import mock
+
+from django.db import transaction
+from django.test import TestCase
+from learninghub.apps.classrooms.models import CourseAssignment
+from learninghub.apps.classrooms.signals.handlers import _get_buffers, enroll_staff
+from pytest import mark
+from requests.exceptions import HTTPError
+from test_utils.factories import ClassroomEnrollmentFactory, ClassroomFactory
+
+HANDLERS = "learninghub.apps.classrooms.signals.handlers"
+
+
+@mark.django_db
+@mock.patch(f"{HANDLERS}.enroll_staff")
+@mock.patch(f"{HANDLERS}.enroll_learners")
+class TestEnrollmentSignals(TestCase):
+    """
+    Tests for the enrollments triggered by saving enrollments and assignments.
+    """
+
+    def setUp(self) -> None:
+        self.classroom = ClassroomFactory.create()
+        self.other_classroom = ClassroomFactory.create()
+        self.course_ids = [
+            "course-v1:DiceyTech+BOX001+1T2021",
+            "course-v1:DiceyTech+EXP001+1T2021",
+        ]
+        # Bypass the course run creation and the signals
+        CourseAssignment.objects.bulk_create(
+            [
+                CourseAssignment(classroom_instance=classroom, course_id=course_id)
+                for classroom in (self.classroom, self.other_classroom)
+                for course_id in self.course_ids
+            ]
+        )
+        super().setUp()
+
+    def _enroll(self, classroom, count, staff=False, offset=0):
+        return [
+            ClassroomEnrollmentFactory.create(
+                classroom_instance=classroom,
+                user_email=f"user{offset + index}@school.sch",
+                lms_user_id=offset + index + 1,
+                staff=staff,
+            ).user_email
+            for index in range(count)
+        ]
+
+    def test_enrollments_are_coalesced(self, mock_enroll_learners, mock_enroll_staff):
+        """
+        Test that the enrollments of a transaction are enrolled with one call per
+        set of courses and role
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                learners = self._enroll(self.classroom, 20)
+                learners += self._enroll(self.other_classroom, 5, offset=20)
+                staff = self._enroll(self.classroom, 2, staff=True, offset=50)
+
+                mock_enroll_learners.assert_not_called()
+
+        mock_enroll_learners.assert_called_once_with(
+            course_run_ids=self.course_ids, identifiers=learners
+        )
+        mock_enroll_staff.assert_called_once_with(
+            course_ids=self.course_ids, identifiers=staff
+        )
+
+    def test_new_assignment(self, mock_enroll_learners, mock_enroll_staff):
+        """
+        Test that existing members are enrolled in the new course only, and new
+        members in all the courses
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            existing_learners = self._enroll(self.classroom, 3)
+        new_course_id = "course-v1:DiceyTech+NEW001+1T2021"
+        mock_enroll_learners.reset_mock()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                new_learners = self._enroll(self.classroom, 2, offset=10)
+                with mock.patch(
+                    "learninghub.apps.classrooms.models.create_course_run",
+                    side_effect=lambda course_id: course_id,
+                ):
+                    CourseAssignment.objects.create(
+                        classroom_instance=self.classroom, course_id=new_course_id
+                    )
+
+        mock_enroll_learners.assert_has_calls(
+            [
+                mock.call(
+                    course_run_ids=sorted(self.course_ids + [new_course_id]),
+                    identifiers=new_learners,
+                ),
+                mock.call(
+                    course_run_ids=[new_course_id], identifiers=existing_learners
+                ),
+            ],
+            any_order=True,
+        )
+        self.assertEqual(mock_enroll_learners.call_count, 2)
+        mock_enroll_staff.assert_not_called()
+
+    def test_rolled_back_enrollments(self, mock_enroll_learners, mock_enroll_staff):
+        """
+        Test that the enrollments of a rolled back transaction are not enrolled
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self._enroll(self.classroom, 2)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+            with transaction.atomic():
+                learners = self._enroll(self.classroom, 1, offset=10)
+
+        mock_enroll_learners.assert_called_once_with(
+            course_run_ids=self.course_ids, identifiers=learners
+        )
+
+    def test_rolled_back_savepoint(self, mock_enroll_learners, mock_enroll_staff):
+        """
+        Test that the enrollments of a rolled back savepoint are not enrolled with
+        the rest of the transaction, and that the buffer is dropped once flushed
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                learners = self._enroll(self.classroom, 1)
+                try:
+                    with transaction.atomic():
+                        self._enroll(self.classroom, 2, offset=10)
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+                learners += self._enroll(self.classroom, 1, offset=20)
+
+        mock_enroll_learners.assert_called_once_with(
+            course_run_ids=self.course_ids, identifiers=learners
+        )
+        self.assertEqual(_get_buffers(), {})
+
+
+@mock.patch(f"{HANDLERS}.StudioApiClient")
+@mock.patch(f"{HANDLERS}.LMSApiClient")
+class TestEnrollStaff(TestCase):
+    """
+    Tests for enroll_staff.
+    """
+
+    def test_enroll_staff(self, mock_lms_client, mock_studio_client):
+        """
+        Test that usernames are resolved once and only the missing members are added
+        """
+        mock_lms_client.return_value.get_usernames.return_value = [
+            "teacher1",
+            "teacher2",
+        ]
+        teams = {
+            "course-v1:DiceyTech+BOX001+1T2021": [
+                {"user": "teacher1", "role": "instructor"}
+            ],
+            "course-v1:DiceyTech+EXP001+1T2021": [
+                {"user": "teacher1", "role": "instructor"},
+                {"user": "teacher2", "role": "instructor"},
+            ],
+            "course-v1:DiceyTech+FAIL01+1T2021": None,
+        }
+
+        def get_course_run(course_id):
+            if teams[course_id] is None:
+                raise HTTPError("Not found")
+            return {"team": teams[course_id]}
+
+        mock_studio_client.return_value.get_course_run.side_effect = get_course_run
+
+        errors = enroll_staff(
+            list(teams), ["teacher1@school.sch", "teacher2@school.sch"]
+        )
+
+        self.assertEqual(list(errors), ["course-v1:DiceyTech+FAIL01+1T2021"])
+        mock_lms_client.return_value.get_usernames.assert_called_once_with(
+            ["teacher1@school.sch", "teacher2@school.sch"]
+        )
+        # The team of the second course is already complete
+        mock_studio_client.return_value.update_course_run.assert_called_once_with(
+            course_id="course-v1:DiceyTech+BOX001+1T2021",
+            course_run_data={"team": [{"user": "teacher2", "role": "instructor"}]},
+        )
@@ -1,4 +1,5 @@
 """ Utility functions for classrooms app. """
+from typing import Dict, List, Optional
 
 from learninghub.apps.api_client.lms import LMSApiClient
 
@@ -6,6 +7,19 @@ from learninghub.apps.api_client.lms import LMSApiClient
 def get_lms_user_id(email: str) -> int:
     lms_client = LMSApiClient()
 
-    details = lms_client.get_user_details(email=email)
+    details = lms_client.get_user_identity(email=email)
 
     return details.get("id")
+
+
+def get_lms_user_ids(emails: List[str]) -> Dict[str, Optional[int]]:
+    """
+    Return a mapping of email to LMS user ID for all the emails provided.
+
+    Emails that are not known by the LMS are mapped to None.
+    """
+    lms_client = LMSApiClient()
+
+    identities = lms_client.get_user_identities(emails)
+
+    return {email: identities.get(email, {}).get("id") for email in emails}
@@ -6,3 +6,7 @@ class Status:
 
     OK = u"OK"
     UNAVAILABLE = u"UNAVAILABLE"
+
+
+# Number of parsed course keys kept in memory by `parse_course_key`
+COURSE_KEY_CACHE_SIZE = 16384
@@ -0,0 +1,21 @@
+""" Database helpers shared by the learninghub apps. """
+from django.db import migrations
+
+
+class AddIndexOnline(migrations.AddIndex):
+    """
+    Add an index without locking the table for writes on MySQL.
+
+    InnoDB builds secondary indexes in place, requesting it explicitly makes the
+    migration fail instead of silently copying the table if it cannot.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "mysql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+            return
+
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            sql = self.index.create_sql(model, schema_editor)
+            schema_editor.execute(f"{sql} ALGORITHM=INPLACE LOCK=NONE")
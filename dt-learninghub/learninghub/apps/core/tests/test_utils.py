@@ -0,0 +1,26 @@
+""" Tests for the core utility functions. """
+
+from django.test import TestCase
+from learninghub.apps.core.utils import course_key_cache_info, parse_course_key
+from opaque_keys import InvalidKeyError
+
+
+class ParseCourseKeyTests(TestCase):
+    """Tests for core.utils.parse_course_key"""
+
+    def test_parse_course_key(self):
+        key = parse_course_key("course-v1:DiceyTech+BOX001+TEMPLATE")
+
+        self.assertEqual(
+            (key.org, key.course, key.run), ("DiceyTech", "BOX001", "TEMPLATE")
+        )
+        self.assertIs(parse_course_key("course-v1:DiceyTech+BOX001+TEMPLATE"), key)
+
+        cache_info = course_key_cache_info()
+        self.assertEqual((cache_info.hits, cache_info.misses), (1, 1))
+
+    def test_parse_invalid_course_key(self):
+        with self.assertRaises(InvalidKeyError):
+            parse_course_key("not-a-course-key")
+
+        self.assertEqual(course_key_cache_info().currsize, 0)
@@ -7,6 +7,7 @@ from django.db import DatabaseError
 from django.test import TestCase
 from django.test.utils import override_settings
 from django.urls import reverse
+from learninghub.apps.api_client.metrics import record_call
 from learninghub.apps.core.constants import Status
 
 User = get_user_model()
@@ -74,3 +75,35 @@ class AutoAuthTests(TestCase):
 
         # Verify that the user has superuser permissions
         self.assertTrue(user.is_superuser)
+
+
+class ApiClientMetricsTests(TestCase):
+    """Tests of the API client metrics endpoint."""
+
+    def test_staff_only(self):
+        """Test that only staff users can read the metrics."""
+        response = self.client.get(reverse("api_client_metrics"))
+        self.assertEqual(response.status_code, 302)
+
+        user = User.objects.create_user("learner", password="password")
+        self.client.force_login(user)
+        response = self.client.get(reverse("api_client_metrics"))
+        self.assertEqual(response.status_code, 302)
+
+    def test_export(self):
+        """Test that the histograms are exported as text."""
+        record_call(
+            "lms", "GET", "http://lms.local/api/user/v1/accounts", 200, 0.2, 0, 10, 0
+        )
+        user = User.objects.create_user("staff", password="password", is_staff=True)
+        self.client.force_login(user)
+
+        response = self.client.get(reverse("api_client_metrics"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["content-type"].startswith("text/plain"))
+        self.assertIn(
+            'api_client_request_duration_seconds_count{upstream="lms",method="GET",'
+            'endpoint="/api/user/v1/accounts",status="200"} 1',
+            response.content.decode(),
+        )
@@ -0,0 +1,27 @@
+""" Utility functions shared by the learninghub apps. """
+from functools import lru_cache
+
+from learninghub.apps.core.constants import COURSE_KEY_CACHE_SIZE
+from opaque_keys.edx.keys import CourseKey
+
+
+@lru_cache(maxsize=COURSE_KEY_CACHE_SIZE)
+def parse_course_key(course_id: str) -> CourseKey:
+    """
+    Return the CourseKey of a course id.
+
+    Course keys are immutable, so the most recently parsed ones are kept in memory
+    and shared. Raises InvalidKeyError if the course id is not valid; invalid ids
+    are not cached.
+    """
+    return CourseKey.from_string(course_id)
+
+
+def course_key_cache_info():
+    """Return the hits, misses, maxsize and currsize of the course key cache"""
+    return parse_course_key.cache_info()
+
+
+def clear_course_key_cache() -> None:
+    """Empty the course key cache"""
+    parse_course_key.cache_clear()
@@ -3,12 +3,14 @@ import logging
 import uuid
 
 from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth import authenticate, get_user_model, login
 from django.db import DatabaseError, connection, transaction
-from django.http import Http404, JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import redirect
 from django.views.generic import View
 from edx_django_utils.monitoring import ignore_transaction
+from learninghub.apps.api_client.metrics import export_histograms
 from learninghub.apps.core.constants import Status
 
 logger = logging.getLogger(__name__)
@@ -60,6 +62,20 @@ def health(_):
         return JsonResponse(data, status=503)
 
 
+@staff_member_required
+def api_client_metrics(_):
+    """Exports the histograms of the requests made by the API clients of this process.
+
+    Returns:
+        HttpResponse: 200 with the histograms in the Prometheus text exposition format
+    """
+    ignore_transaction()
+
+    return HttpResponse(
+        export_histograms(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 class AutoAuth(View):
     """Creates and authenticates a new User with superuser permissions.
 
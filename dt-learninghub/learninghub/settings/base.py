@@ -277,4 +277,32 @@ SYSTEM_TO_FEATURE_ROLE_MAPPING = {
 # Default URLS for Discovery
 DISCOVERY_SERVICE_API_URL = os.environ.get("DISCOVERY_SERVICE_API_URL", "")
 
+# Connection pool sizes of the HTTP session shared by the API clients
+API_CLIENT_POOL_CONNECTIONS = int(os.environ.get("API_CLIENT_POOL_CONNECTIONS", 10))
+API_CLIENT_POOL_MAXSIZE = int(os.environ.get("API_CLIENT_POOL_MAXSIZE", 20))
+# Maximum number of concurrent requests made by an API client for a single call
+API_CLIENT_MAX_CONCURRENT_REQUESTS = int(
+    os.environ.get("API_CLIENT_MAX_CONCURRENT_REQUESTS", 4)
+)
+# Default (connect, read) timeouts of the requests made by the API clients, in seconds
+API_CLIENT_CONNECT_TIMEOUT = float(os.environ.get("API_CLIENT_CONNECT_TIMEOUT", 3.05))
+API_CLIENT_READ_TIMEOUT = float(os.environ.get("API_CLIENT_READ_TIMEOUT", 10))
+# Timeouts per upstream ("lms", "studio", "discovery" or "enterprise"), overriding
+# the defaults. Creating a course run in Discovery reruns the whole course.
+API_CLIENT_TIMEOUTS = {
+    "discovery": (API_CLIENT_CONNECT_TIMEOUT, 30),
+}
+# Consecutive failures after which an upstream is not called anymore, and the number
+# of seconds after which a trial call is made to check if it has recovered
+API_CLIENT_CIRCUIT_BREAKER_FAILURE_THRESHOLD = int(
+    os.environ.get("API_CLIENT_CIRCUIT_BREAKER_FAILURE_THRESHOLD", 5)
+)
+API_CLIENT_CIRCUIT_BREAKER_RESET_TIMEOUT = int(
+    os.environ.get("API_CLIENT_CIRCUIT_BREAKER_RESET_TIMEOUT", 30)
+)
+
+# Number of course runs created in advance for each popular template course, keyed
+# by template course ID, see the `fill_course_run_pool` command
+COURSE_RUN_POOL_SIZES = {}
+
 DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
@@ -38,6 +38,11 @@ urlpatterns = oauth2_urlpatterns + [
     path("auto_auth/", core_views.AutoAuth.as_view(), name="auto_auth"),
     path("", include("csrf.urls")),  # Include csrf urls from edx-drf-extensions
     path("health/", core_views.health, name="health"),
+    path(
+        "metrics/api_client/",
+        core_views.api_client_metrics,
+        name="api_client_metrics",
+    ),
 ]
 
 urlpatterns += make_docs_urls(api_info)